@@ -1,26 +1,49 @@
 # ai_app/app.py
 import os
 import sys
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))  # ✅ Add project root to Python path
 
 from typing import List
-from flask import Flask, render_template, request, session, jsonify
-from dotenv import load_dotenv
+from flask import Flask, Response, render_template, request, session
 import json
-from ai_app.response_logic.response_hub import generate_response
 
+if __name__ == "__main__" and not __package__:
+    # `python ai_app/app.py` puts ai_app/ itself on sys.path; the ai_app imports
+    # below need the project root (importing the module leaves sys.path alone)
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-print("🧠 Running:", __file__)
+from ai_app.conversation_log import ConversationLog
+from ai_app.session_store import configure_sessions
 
-load_dotenv()
+# Importing this module only builds the Flask app: no prints, no sys.path or
+# .env changes, and the response stack is loaded on the first chat request so
+# /health answers as soon as the server is up. `python ai_app/app.py` does the
+# script-only setup in the __main__ block below.
 
 app = Flask(__name__)
 app.secret_key = os.getenv("FLASK_SECRET_KEY", "your_secret_key")
 app.config["TEMPLATES_AUTO_RELOAD"] = True
+# Sessions live on the server (SESSION_BACKEND, see session_store.py); the
+# cookie only carries their id.
+configure_sessions(app)
+
+# Chat messages kept per session (each turn adds two: the prompt and the
+# reply); older ones are dropped.
+MAX_HISTORY_MESSAGES = int(os.getenv("SESSION_MAX_MESSAGES", "20"))
 
 # ✅ Path for test_page.html
 TEST_PAGES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src", "static_site"))
-print(f"TEST_PAGES_DIR is set to: {TEST_PAGES_DIR}")
+
+
+def generate_response(prompt, session=None, **kwargs):
+    """Forward to the response hub, importing it on first use."""
+    from ai_app.response_logic.response_hub import generate_response as _generate_response
+    return _generate_response(prompt, session, **kwargs)
+
+
+def generate_responses(prompts, sessions=None, **kwargs):
+    """Forward a batch to the response hub, importing it on first use."""
+    from ai_app.response_logic.response_hub import generate_responses as _generate_responses
+    return _generate_responses(prompts, sessions, **kwargs)
 
 
 # ---------- Helpers ----------
@@ -29,55 +52,251 @@ def _csv(items: List[str]) -> str:
 
 
 def _suggest_dish_from_state(equip: List[str], restrict: List[str], ingred: List[str]) -> str:
-    equip_l = [e.lower() for e in equip]
-    ingred_l = [i.lower() for i in ingred]
-    restrict_l = [r.lower() for r in restrict]
-
-    if any("instant pot" in e for e in equip_l):
-        method = "Instant Pot"
-    elif any(k in equip_l for k in ["slow cooker", "crockpot", "crock pot"]):
-        method = "Slow Cooker"
-    else:
-        method = "Stovetop"
-
-    protein = next(
-        (p for p in ["chicken", "beef", "pork", "lamb", "salmon", "turkey"] if any(p in i for i in ingred_l)),
-        None,
-    )
-    dish = "stew" if (
-        protein
-        and any(v in ingred_l for v in ["potato", "potatoes"])
-        and any(v in ingred_l for v in ["carrot", "carrots"])
-    ) else "soup"
+    # Method, protein, dish style and note come from data/dish_rules.json
+    from ai_app.response_logic.vocabulary import get_vocabulary
+    rules = get_vocabulary().rules
+    features = rules.features(equipment=equip, ingredients=ingred, restrictions=restrict)
 
-    restrictions_note = " (keeps your restrictions in mind)" if (
-        "flour" in restrict_l or "sugar" in restrict_l or any("avoid" in r for r in restrict_l)
-    ) else ""
+    method = rules.decide("cooking_method", features)
+    protein = rules.decide("main_protein", features)
+    dish = rules.decide("dish_style", features)
+    restrictions_note = rules.decide("restriction_note", features)
 
     name_bits = [method] + ([protein.capitalize()] if protein else []) + ["and Veggie", dish.capitalize()]
     recipe_name = " ".join(name_bits)
 
     blurb = (
         f"{recipe_name}{restrictions_note}. "
-        f"Base: aromatics + broth; add {', '.join(sorted(set(ingred_l)) or ['your ingredients'])}; "
+        f"Base: aromatics + broth; add {', '.join(sorted({i.lower() for i in ingred}) or ['your ingredients'])}; "
         f"finish with herbs/acid. Serves 2–4."
     )
     return blurb
 
 
-def _compose_contextual_response(basic_response: str) -> str:
-    equipment = session.get("equipment", [])
-    restrictions = session.get("restrictions", [])
-    ingredients = session.get("ingredients", [])
+def _record_turn(sess, user_input: str, basic_response: str, reply: str = ""):
+    """
+    Add the user message and the reply to the session's conversation log,
+    keeping the last MAX_HISTORY_MESSAGES. What the reply adds to the basic
+    response (plan summary and suggestion) is stored once while it repeats.
+    """
+    log = ConversationLog.load(sess.get("messages"), MAX_HISTORY_MESSAGES)
+    log.append("user", user_input)
+    log.append("assistant", basic_response, reply[len(basic_response):])
+    sess["messages"] = log.to_bytes()
 
-    summary = (
+
+def _plan_summary(equipment: List[str], restrictions: List[str], ingredients: List[str]) -> str:
+    return (
         "Plan so far:\n"
         f"- Equipment: {_csv(equipment)}\n"
         f"- Restrictions: {_csv(restrictions)}\n"
         f"- Ingredients: {_csv(ingredients)}\n"
     )
-    suggestion = _suggest_dish_from_state(equipment, restrictions, ingredients)
-    return f"{basic_response}\n\n{summary}\nSuggested dish: {suggestion}"
+
+
+def _context_parts(equipment: List[str], restrictions: List[str], ingredients: List[str]) -> List[str]:
+    """The plan summary and suggested dish appended to every reply, for one session state."""
+    return [
+        f"\n\n{_plan_summary(equipment, restrictions, ingredients)}",
+        f"\nSuggested dish: {_suggest_dish_from_state(equipment, restrictions, ingredients)}",
+    ]
+
+
+def _session_state(sess):
+    from ai_app.response_logic.session_state import SessionState
+    return SessionState(sess)
+
+
+def _session_context(sess) -> List[str]:
+    """_context_parts for the session's state, rendered only when the state changed."""
+    return _session_state(sess).rendered(_context_parts)
+
+
+def _contextual_chunks(basic_response: str, get_context):
+    """
+    Yield (part, text) pieces of the full reply; joined they equal the
+    _chat_turn reply. `get_context()` returns the _context_parts
+    and is only called once the basic response has been yielded.
+    """
+    yield "reply", basic_response
+    plan, suggestion = get_context()
+    yield "plan", plan
+    yield "suggestion", suggestion
+
+
+def _sse(event: str, payload: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+# ---------- JSON ----------
+# orjson is optional; without it the stdlib writes the same bytes as jsonify
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_dumps(payload) -> bytes:
+    """Compact, key-sorted JSON ending in a newline, like Flask's jsonify outside debug mode."""
+    if orjson is not None:
+        # Same JSON values; non-ASCII text is written as UTF-8 instead of \u escapes
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(payload, ensure_ascii=True, sort_keys=True, separators=(",", ":")) + "\n").encode()
+
+
+def _json_loads(body: bytes):
+    return orjson.loads(body) if orjson is not None else json.loads(body)
+
+
+def _json_response(payload: dict, status: int = 200) -> Response:
+    return app.response_class(_json_dumps(payload), status=status, mimetype="application/json")
+
+
+# ---------- Chat pipeline ----------
+# Every chat endpoint (Flask routes here, and ai_app/asgi.py) is a thin adapter
+# over the same steps: _chat_input reads the prompt from the request body and
+# _chat_turn answers it against the session. Sessions are only written to when
+# a turn changes them.
+class ChatRoute:
+    """How one JSON chat endpoint reads its prompt and names its reply."""
+
+    __slots__ = ("field", "reply_key", "missing", "force_json", "strip")
+
+    def __init__(self, field: str, reply_key: str, missing: str = "No input provided",
+                 force_json: bool = False, strip: bool = True):
+        self.field = field
+        self.reply_key = reply_key
+        self.missing = missing
+        # Parse the body as JSON whatever its Content-Type (like get_json(force=True))
+        self.force_json = force_json
+        self.strip = strip
+
+
+CHAT_ROUTES = {
+    "/api/response": ChatRoute("input", "response"),
+    "/api/response/stream": ChatRoute("input", "response"),
+    "/api/message": ChatRoute("text", "reply", force_json=True),
+    # The bridge forwards the message unstripped
+    "/generate": ChatRoute("message", "response", "No message provided", strip=False),
+}
+
+
+def _is_json(mimetype: str) -> bool:
+    return mimetype == "application/json" or (mimetype.startswith("application/") and mimetype.endswith("+json"))
+
+
+def _chat_input(route: ChatRoute, body: bytes, mimetype: str):
+    """
+    The prompt in a chat request body, as (user_input, None), or (None, error
+    payload) for a 400. A body that is not JSON (or has no JSON Content-Type,
+    unless the route forces JSON) has no prompt.
+    """
+    data = None
+    if body and (route.force_json or _is_json(mimetype)):
+        try:
+            data = _json_loads(body)
+        except ValueError:
+            if route.force_json:
+                return None, {"error": "Invalid JSON"}
+    user_input = data.get(route.field) if isinstance(data, dict) else None
+    if not isinstance(user_input, str):
+        return None, {"error": route.missing}
+    if route.strip:
+        user_input = user_input.strip()
+    if not user_input:
+        return None, {"error": route.missing}
+    return user_input, None
+
+
+def _basic_response(sess, user_input: str) -> str:
+    result = generate_response(user_input, sess)
+    return result[0] if isinstance(result, tuple) else result
+
+
+def _chat_turn(sess, user_input: str) -> str:
+    """Answer one message against `sess`: route it, add the plan and suggestion, record the turn."""
+    basic_response = _basic_response(sess, user_input)
+    reply = basic_response + "".join(_session_context(sess))
+    _record_turn(sess, user_input, basic_response, reply)
+    return reply
+
+
+def _json_chat(path: str) -> Response:
+    route = CHAT_ROUTES[path]
+    user_input, error = _chat_input(route, request.get_data(cache=False), request.mimetype)
+    if error is not None:
+        return _json_response(error, 400)
+    return _json_response({route.reply_key: _chat_turn(session, user_input)})
+
+
+# ---------- Batch ----------
+# /api/batch answers many prompts in one request. It is stateless: the cookie
+# session is neither read nor written, and each item may bring its own context
+# instead. Limits are configurable; larger requests get a 413.
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "1000"))
+BATCH_MAX_BYTES = int(os.getenv("BATCH_MAX_BYTES", str(1024 * 1024)))
+# Items answered per generate_responses call when streaming NDJSON
+BATCH_STREAM_CHUNK = int(os.getenv("BATCH_STREAM_CHUNK", "100"))
+_CONTEXT_FIELDS = ("equipment", "restrictions", "ingredients")
+
+
+def _batch_item(item):
+    """(prompt, session dict) for one batch item, or (None, error message)."""
+    context = {}
+    if isinstance(item, dict):
+        context = item.get("context")
+        context = {} if context is None else context
+        item = item.get("input")
+        if not isinstance(context, dict):
+            return None, "context must be an object"
+    if not isinstance(item, str) or not item.strip():
+        return None, "No input provided"
+    sess = {}
+    for field in _CONTEXT_FIELDS:
+        values = context.get(field) or []
+        if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+            return None, f"context.{field} must be a list of strings"
+        if values:
+            sess[field] = list(dict.fromkeys(values))
+    return item.strip(), sess
+
+
+def _batch_request(body: bytes):
+    """(prompts, sessions) from a batch body, or (None, (status, error payload))."""
+    if len(body) > BATCH_MAX_BYTES:
+        return None, (413, {"error": f"Batch body larger than {BATCH_MAX_BYTES} bytes"})
+    try:
+        data = _json_loads(body) if body else None
+    except ValueError:
+        return None, (400, {"error": "Invalid JSON"})
+    items = data.get("prompts") if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return None, (400, {"error": 'Expected {"prompts": [...]} with at least one prompt'})
+    if len(items) > BATCH_MAX_ITEMS:
+        return None, (413, {"error": f"Batch has more than {BATCH_MAX_ITEMS} prompts"})
+    prompts, sessions = [], []
+    for i, item in enumerate(items):
+        prompt, sess = _batch_item(item)
+        if prompt is None:
+            return None, (400, {"error": f"Item {i}: {sess}"})
+        prompts.append(prompt)
+        sessions.append(sess)
+    return (prompts, sessions), None
+
+
+def _batch_replies(prompts: List[str], sessions: List[dict]) -> List[str]:
+    """Full replies, as /api/response gives them, from one generate_responses call."""
+    contexts = {}
+    replies = []
+    for result, sess in zip(generate_responses(prompts, sessions), sessions):
+        basic_response = result[0] if isinstance(result, tuple) else result
+        # Items usually share a handful of states; render each one once per call
+        state = tuple(tuple(sess.get(field, ())) for field in _CONTEXT_FIELDS)
+        parts = contexts.get(state)
+        if parts is None:
+            parts = contexts[state] = _context_parts(*state)
+        replies.append(basic_response + "".join(parts))
+    return replies
 
 
 # ---------- Routes ----------
@@ -89,23 +308,10 @@ def clear_session():
 
 @app.route("/", methods=["GET", "POST"])
 def index():
-    session.setdefault("restrictions", [])
-    session.setdefault("equipment", [])
-    session.setdefault("ingredients", [])
-    session.setdefault("messages", [])
-
     response = ""
     if request.method == "POST":
         user_input = (request.form.get("user_input", "") or "").strip()
-        session["messages"].append({"role": "user", "content": user_input})
-
-        result = generate_response(user_input, session)
-        basic_response = result[0] if isinstance(result, tuple) else result
-
-        session.modified = True
-        response = _compose_contextual_response(basic_response)
-        session["messages"].append({"role": "assistant", "content": response})
-
+        response = _chat_turn(session, user_input)
     return render_template("index.html", response=response)
 
 
@@ -138,79 +344,95 @@ def health():
 
 @app.route("/api/message", methods=["POST"])
 def api_message():
-    session.setdefault("restrictions", [])
-    session.setdefault("equipment", [])
-    session.setdefault("ingredients", [])
-    session.setdefault("messages", [])
-
-    data = request.get_json(force=True) or {}
-    user_input = (data.get("text") or "").strip()
-    if not user_input:
-        return jsonify({"error": "No input provided"}), 400
-
-    session["messages"].append({"role": "user", "content": user_input})
-
-    result = generate_response(user_input, session)
-    basic_response = result[0] if isinstance(result, tuple) else result
-
-    session.modified = True
-    reply = _compose_contextual_response(basic_response)
-    session["messages"].append({"role": "assistant", "content": reply})
-    return jsonify({"reply": reply})
+    return _json_chat("/api/message")
 
 
 @app.route("/api/response", methods=["POST"])
 def api_response():
-    session.setdefault("restrictions", [])
-    session.setdefault("equipment", [])
-    session.setdefault("ingredients", [])
-    session.setdefault("messages", [])
+    return _json_chat("/api/response")
+
+
+@app.route("/api/response/stream", methods=["POST"])
+def api_response_stream():
+    """
+    Streaming variant of /api/response (Server-Sent Events).
+
+    Sends the basic response as soon as it is ready, then the plan summary and
+    the suggested dish as separate `chunk` events; concatenating their `text`
+    gives the /api/response reply. A final `done` event closes the stream.
+    """
+    user_input, error = _chat_input(CHAT_ROUTES["/api/response/stream"], request.get_data(cache=False),
+                                    request.mimetype)
+    if error is not None:
+        return _json_response(error, 400)
+
+    basic_response = _basic_response(session, user_input)
+
+    # The session is saved with the headers, before the body streams, so the
+    # full reply is resolved and the turn recorded here (rendering the plan
+    # and suggestion takes microseconds); the generator only sends it.
+    context = _session_context(session)
+    _record_turn(session, user_input, basic_response, basic_response + "".join(context))
+
+    def events():
+        for part, text in _contextual_chunks(basic_response, lambda: context):
+            yield _sse("chunk", {"part": part, "text": text})
+        yield _sse("done", {})
+
+    return Response(
+        events(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-    data = request.get_json(silent=True) or {}
-    user_input = (data.get("input") or "").strip()
-    if not user_input:
-        return jsonify({"error": "No input provided"}), 400
 
-    session["messages"].append({"role": "user", "content": user_input})
+@app.route("/api/batch", methods=["POST"])
+def api_batch():
+    """
+    Answer {"prompts": [...]} in one request. Each item is a prompt string or
+    {"input": prompt, "context": {"equipment": [...], "restrictions": [...],
+    "ingredients": [...]}}; replies match /api/response for a session holding
+    that context. Returns {"responses": [...]} in item order, or one NDJSON line
+    {"index": i, "response": reply} per item when the client sends
+    Accept: application/x-ndjson.
+    """
+    if request.content_length is not None and request.content_length > BATCH_MAX_BYTES:
+        return _json_response({"error": f"Batch body larger than {BATCH_MAX_BYTES} bytes"}, 413)
+    batch, error = _batch_request(request.stream.read(BATCH_MAX_BYTES + 1))
+    if error is not None:
+        return _json_response(error[1], error[0])
+    prompts, sessions = batch
 
-    result = generate_response(user_input, session)
-    basic_response = result[0] if isinstance(result, tuple) else result
+    if "application/x-ndjson" not in request.headers.get("Accept", ""):
+        return _json_response({"responses": _batch_replies(prompts, sessions)})
 
-    session.modified = True
-    reply = _compose_contextual_response(basic_response)
-    session["messages"].append({"role": "assistant", "content": reply})
+    def lines():
+        for start in range(0, len(prompts), BATCH_STREAM_CHUNK):
+            end = start + BATCH_STREAM_CHUNK
+            replies = _batch_replies(prompts[start:end], sessions[start:end])
+            yield b"".join(_json_dumps({"index": start + i, "response": r}) for i, r in enumerate(replies))
+
+    return Response(lines(), mimetype="application/x-ndjson", headers={"X-Accel-Buffering": "no"})
 
-    return jsonify({"response": reply})
 
 # --- 🧩 Bridge route for compatibility with legacy clients ---
 @app.route("/generate", methods=["POST"])
 def generate_bridge():
     """Bridge route: forwards /generate requests to /api/response logic with proper session management."""
-    session.setdefault("restrictions", [])
-    session.setdefault("equipment", [])
-    session.setdefault("ingredients", [])
-    session.setdefault("messages", [])
-
-    data = request.get_json(silent=True) or {}
-    message = data.get("message", "")
-    if not message:
-        return jsonify({"error": "No message provided"}), 400
+    return _json_chat("/generate")
 
-    session["messages"].append({"role": "user", "content": message})
 
-    result = generate_response(message, session)
-    basic_response = result[0] if isinstance(result, tuple) else result
-
-    session.modified = True
-    reply = _compose_contextual_response(basic_response)
-    session["messages"].append({"role": "assistant", "content": reply})
+if __name__ == "__main__":
+    import argparse
 
-    return jsonify({"response": reply})
+    from dotenv import load_dotenv
 
+    load_dotenv()
+    app.secret_key = os.getenv("FLASK_SECRET_KEY", "your_secret_key")
+    configure_sessions(app)
 
-if __name__ == "__main__":
-    import argparse
-    import os
+    print("🧠 Running:", __file__)
+    print(f"TEST_PAGES_DIR is set to: {TEST_PAGES_DIR}")
 
     parser = argparse.ArgumentParser(description="Run AI Cooking Assistant Flask app.")
     parser.add_argument("--mode", choices=["dev", "test"], default="dev",
@@ -0,0 +1,264 @@
+# ai_app/asgi.py
+"""
+Async (ASGI) serving mode for the chat API.
+
+Serves /api/response, /api/message, /generate and /api/batch with the same
+JSON bodies, status codes and session cookie as the Flask app in
+ai_app/app.py, plus /health. Sessions go through the Flask app's session interface (the same
+server-side store, or its signed cookie with SESSION_BACKEND=cookie), so a
+client can move between the two servers without losing its session.
+
+Request bodies are read asynchronously, so slow clients do not hold a worker.
+The CPU-bound part of a turn (generate_response and the plan suggestion) or of
+a batch runs in a bounded thread pool. When ASYNC_WORKERS + ASYNC_MAX_PENDING turns are already
+in flight, new ones get a 503 instead of queueing without limit.
+
+A session is only written back (and its cookie only sent) when the turn
+changed it, as in the Flask app.
+
+Run with any ASGI server, e.g.:
+    uvicorn ai_app.asgi:app --port 5002
+    python -m ai_app.asgi --port 5002        # same, needs uvicorn installed
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http.cookies import SimpleCookie
+
+from flask.sessions import SecureCookieSession
+from itsdangerous import BadSignature
+from werkzeug.http import dump_cookie
+
+from ai_app import app as flask_module
+from ai_app.session_store import ServerSessionInterface, cookie_options
+
+MAX_BODY_BYTES = int(os.getenv("ASYNC_MAX_BODY", str(1024 * 1024)))
+
+
+class ExecutorBusy(Exception):
+    """Raised when the executor already has its maximum number of jobs."""
+
+
+class BoundedExecutor:
+    """Thread pool that refuses work beyond `max_workers + max_queue` jobs."""
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 64):
+        self.max_workers = max_workers
+        self.max_pending = max_workers + max_queue
+        self.pending = 0
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="generate")
+
+    async def run(self, fn, *args):
+        # Only touched from the event loop thread, so a plain counter is enough
+        if self.pending >= self.max_pending:
+            raise ExecutorBusy()
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool, partial(fn, *args))
+        finally:
+            self.pending -= 1
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+EXECUTOR = BoundedExecutor(
+    max_workers=int(os.getenv("ASYNC_WORKERS", "4")),
+    max_queue=int(os.getenv("ASYNC_MAX_PENDING", "64")),
+)
+
+
+# ---------- Sessions (same interface and cookie as the Flask app) ----------
+def _session_serializer():
+    return flask_module.app.session_interface.get_signing_serializer(flask_module.app)
+
+
+def _server_sessions():
+    interface = flask_module.app.session_interface
+    return interface if isinstance(interface, ServerSessionInterface) else None
+
+
+def _load_session(headers: dict) -> SecureCookieSession:
+    name = flask_module.app.session_interface.get_cookie_name(flask_module.app)
+    server = _server_sessions()
+    cookie = SimpleCookie()
+    try:
+        cookie.load(headers.get("cookie", ""))
+    except Exception:
+        cookie = SimpleCookie()
+    value = cookie[name].value if name in cookie else None
+    if server is not None:
+        return server.load(flask_module.app, value)
+    if value is None:
+        return SecureCookieSession()
+    max_age = int(flask_module.app.permanent_session_lifetime.total_seconds())
+    try:
+        data = _session_serializer().loads(value, max_age=max_age)
+    except BadSignature:
+        return SecureCookieSession()
+    return SecureCookieSession(data if isinstance(data, dict) else None)
+
+
+def _session_cookie(sess: SecureCookieSession):
+    """Set-Cookie value for `sess` after a request, or None when the request did not change it."""
+    flask_app = flask_module.app
+    interface = flask_app.session_interface
+    server = _server_sessions()
+    if server is not None:
+        value = server.persist(flask_app, sess)
+    elif sess.modified:
+        # As Flask's cookie sessions: an emptied session deletes the cookie
+        value = _session_serializer().dumps(dict(sess)) if sess else ""
+    else:
+        value = None
+    if value is None:
+        return None
+    # The same attributes Flask's response.set_cookie / delete_cookie would send
+    name = interface.get_cookie_name(flask_app)
+    options = cookie_options(interface, flask_app)
+    if value == "":
+        return dump_cookie(name, expires=0, max_age=0, **options)
+    return dump_cookie(name, value, expires=interface.get_expiration_time(flask_app, sess), **options)
+
+
+# ---------- Chat turn ----------
+# The JSON chat routes of the Flask app; their parsing and the turn itself are
+# the app's pipeline (flask_module._chat_input / _chat_turn). Streaming stays Flask-only.
+CHAT_PATHS = frozenset(("/api/response", "/api/message", "/generate"))
+
+
+async def _handle_chat(path: str, body: bytes, headers: dict):
+    route = flask_module.CHAT_ROUTES[path]
+    sess = _load_session(headers)
+    mimetype = headers.get("content-type", "").split(";")[0].strip().lower()
+    user_input, error = flask_module._chat_input(route, body, mimetype)
+    if error is not None:
+        return 400, error, sess
+    try:
+        reply = await EXECUTOR.run(flask_module._chat_turn, sess, user_input)
+    except ExecutorBusy:
+        return 503, {"error": "Server busy, try again shortly"}, None
+    return 200, {route.reply_key: reply}, sess
+
+
+# ---------- Batch ----------
+# Stateless like the Flask route: no session is read or written. A batch asked
+# for as NDJSON gets the same lines, sent as one body (streaming stays Flask-only).
+BATCH_PATH = "/api/batch"
+
+
+async def _handle_batch(body: bytes, headers: dict):
+    """(status, body, content type) for one /api/batch request."""
+    batch, error = flask_module._batch_request(body)
+    if error is not None:
+        return error[0], flask_module._json_dumps(error[1]), "application/json"
+    prompts, sessions = batch
+    try:
+        replies = await EXECUTOR.run(flask_module._batch_replies, prompts, sessions)
+    except ExecutorBusy:
+        return 503, flask_module._json_dumps({"error": "Server busy, try again shortly"}), "application/json"
+    if "application/x-ndjson" in headers.get("accept", ""):
+        lines = (flask_module._json_dumps({"index": i, "response": r}) for i, r in enumerate(replies))
+        return 200, b"".join(lines), "application/x-ndjson"
+    return 200, flask_module._json_dumps({"responses": replies}), "application/json"
+
+
+# ---------- ASGI plumbing ----------
+async def _read_body(receive, limit: int):
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return None
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > limit:
+            return False
+        chunks.append(chunk)
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+async def _send(send, status: int, body: bytes, content_type: str, extra_headers=(), head: bool = False):
+    headers = [
+        (b"content-type", content_type.encode()),
+        (b"content-length", str(len(body)).encode()),
+        *extra_headers,
+    ]
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    # A HEAD response has the GET headers and no body
+    await send({"type": "http.response.body", "body": b"" if head else body})
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            EXECUTOR.shutdown()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    path, method = scope["path"], scope["method"]
+    if path == "/health" and method in ("GET", "HEAD"):
+        await _send(send, 200, b"ok", "text/html; charset=utf-8", head=method == "HEAD")
+        return
+    if path not in CHAT_PATHS and path != BATCH_PATH:
+        await _send(send, 404, flask_module._json_dumps({"error": "Not found"}), "application/json")
+        return
+    if method != "POST":
+        await _send(send, 405, flask_module._json_dumps({"error": "Method not allowed"}), "application/json",
+                    [(b"allow", b"POST")])
+        return
+
+    headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope.get("headers", [])}
+    if path == BATCH_PATH:
+        body = await _read_body(receive, flask_module.BATCH_MAX_BYTES)
+        if body is None:
+            return
+        if body is False:
+            error = {"error": f"Batch body larger than {flask_module.BATCH_MAX_BYTES} bytes"}
+            await _send(send, 413, flask_module._json_dumps(error), "application/json")
+            return
+        status, payload, content_type = await _handle_batch(body, headers)
+        await _send(send, status, payload, content_type, [(b"retry-after", b"1")] if status == 503 else ())
+        return
+
+    body = await _read_body(receive, MAX_BODY_BYTES)
+    if body is None:
+        return
+    if body is False:
+        await _send(send, 413, flask_module._json_dumps({"error": "Request body too large"}), "application/json")
+        return
+
+    status, payload, sess = await _handle_chat(path, body, headers)
+    extra = [(b"vary", b"Cookie")]
+    cookie = _session_cookie(sess) if sess is not None else None
+    if cookie:
+        extra.append((b"set-cookie", cookie.encode("latin-1")))
+    if status == 503:
+        extra.append((b"retry-after", b"1"))
+    await _send(send, status, flask_module._json_dumps(payload), "application/json", extra)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import uvicorn  # optional dependency: pip install uvicorn
+
+    parser = argparse.ArgumentParser(description="Run the AI Cooking Assistant chat API in async (ASGI) mode.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5002)
+    args = parser.parse_args()
+    uvicorn.run("ai_app.asgi:app", host=args.host, port=args.port, log_level="warning")
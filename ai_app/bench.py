@@ -0,0 +1,321 @@
+# ai_app/bench.py
+"""
+Performance harness for the AI Cooking Assistant.
+
+    python -m ai_app.bench                          # all scenarios, JSON to stdout
+    python -m ai_app.bench --scenarios warm_single batch --iterations 5000
+    python -m ai_app.bench --output new.json --compare old.json --threshold 0.10
+
+Every scenario runs against the same generated corpus of realistic prompts
+(fixed seed) and reports min/median/p95/p99/mean latency, ops/sec and peak RSS.
+By default each scenario runs in a fresh interpreter so peak RSS and caches
+belong to that scenario alone. --compare exits non-zero when a scenario's
+median or p99 got slower than the baseline by more than --threshold.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows: peak RSS is reported as null
+    resource = None
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+TEMPLATES = [
+    "I have {ing} and {ing2}",
+    "I have {ing}, {ing2} and {ing3}. What can I make?",
+    "Can I cook {ing} in the {eq}?",
+    "{Eq} recipe with {ing}, no {res}",
+    "No {res} please, something with {ing}",
+    "I'm allergic to {res}, suggest a dinner with {ing}",
+    "Make something with {ing} and {ing2} in my {eq}",
+    "Avoid {res} but I want something creamy",
+    "Suggest a dinner using the {eq}",
+    "What can I cook tonight?",
+    "Help me plan a meal",
+    "Make something traditional for the holidays",
+    "I want a low carb dessert without sugar",
+    "Something quick and easy with {ing}",
+    "Is a {eq} good for {ing}?",
+]
+INGREDIENTS = [
+    "chicken", "rice", "beans", "potatoes", "carrots", "salmon", "beef", "eggs", "spinach",
+    "pasta", "broccoli", "lentils", "mushrooms", "garlic", "onions", "cheese", "tofu", "quinoa",
+]
+EQUIPMENT = ["instant pot", "slow cooker", "oven", "wok", "air fryer", "microwave", "grill", "stovetop"]
+RESTRICTIONS = ["dairy", "gluten", "pork", "nuts", "peanuts", "shellfish", "sugar", "honey", "eggs"]
+
+
+def build_corpus(size: int = 2000, seed: int = 7):
+    """Deterministic list of chat-style prompts with casing and whitespace noise."""
+    rng = random.Random(seed)
+    prompts = []
+    for _ in range(size):
+        eq = rng.choice(EQUIPMENT)
+        ing, ing2, ing3 = rng.sample(INGREDIENTS, 3)
+        prompt = rng.choice(TEMPLATES).format(
+            ing=ing, ing2=ing2, ing3=ing3, eq=eq, Eq=eq.title(), res=rng.choice(RESTRICTIONS),
+        )
+        roll = rng.random()
+        if roll < 0.2:
+            prompt = prompt.lower()
+        elif roll < 0.25:
+            prompt = f"  {prompt.upper()}  "
+        prompts.append(prompt)
+    return prompts
+
+
+# ---------- Stats ----------
+def _percentile(sorted_ns, pct):
+    return sorted_ns[min(len(sorted_ns) - 1, int(pct / 100.0 * len(sorted_ns)))]
+
+
+def _peak_rss_kb(who: str = "self"):
+    """Peak RSS of this process ("self") or of its finished children ("children")."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if who == "children" else resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def summarize(samples_ns, ops_per_sample: int = 1, unit: str = "op", rss_of: str = "self") -> dict:
+    """Latency percentiles (microseconds) and throughput for a list of sample durations."""
+    ordered = sorted(samples_ns)
+    total = sum(ordered)
+    return {
+        "unit": unit,
+        "samples": len(ordered),
+        "ops_per_sample": ops_per_sample,
+        "min_us": ordered[0] / 1e3,
+        "median_us": _percentile(ordered, 50) / 1e3,
+        "p95_us": _percentile(ordered, 95) / 1e3,
+        "p99_us": _percentile(ordered, 99) / 1e3,
+        "mean_us": total / len(ordered) / 1e3,
+        "ops_per_sec": len(ordered) * ops_per_sample / (total / 1e9) if total else 0.0,
+        "peak_rss_kb": _peak_rss_kb(rss_of),
+    }
+
+
+def _time_each(fn, items, warmup: int = 50):
+    for item in items[:warmup]:
+        fn(item)
+    clock = time.perf_counter_ns
+    samples = []
+    gc.disable()
+    try:
+        for item in items:
+            start = clock()
+            fn(item)
+            samples.append(clock() - start)
+    finally:
+        gc.enable()
+    return samples
+
+
+# ---------- Scenarios ----------
+def scenario_cold_import(corpus, iterations):
+    """Fresh interpreter: import the Flask app and the response stack, then answer one prompt."""
+    code = (
+        "import time; t = time.perf_counter_ns(); "
+        "import ai_app.app; from ai_app.response_logic import generate_response; "
+        f"generate_response({corpus[0]!r}); "
+        "print(time.perf_counter_ns() - t)"
+    )
+    runs = max(3, min(iterations // 200, 20))
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+        ).stdout
+        samples.append(int(out.strip().splitlines()[-1]))
+    # Peak RSS of the measured interpreters, not of this one
+    return summarize(samples, unit="process", rss_of="children")
+
+
+@contextmanager
+def _uncached_hub():
+    """Measure the engine itself: disable the response cache for the block."""
+    from ai_app.response_logic import response_hub
+    cache = response_hub.RESPONSE_CACHE
+    maxsize, cache.maxsize = cache.maxsize, 0
+    response_hub.invalidate_response_cache()
+    try:
+        yield response_hub
+    finally:
+        cache.maxsize = maxsize
+
+
+def scenario_warm_single(corpus, iterations):
+    """One generate_response call per prompt, response cache disabled."""
+    prompts = (corpus * (iterations // len(corpus) + 1))[:iterations]
+    with _uncached_hub() as hub:
+        return summarize(_time_each(hub.generate_response, prompts))
+
+
+def scenario_warm_cached(corpus, iterations):
+    """One generate_response call per prompt with the default response cache."""
+    from ai_app.response_logic import response_hub
+    response_hub.invalidate_response_cache()
+    prompts = (corpus * (iterations // len(corpus) + 1))[:iterations]
+    return summarize(_time_each(response_hub.generate_response, prompts))
+
+
+def scenario_batch(corpus, iterations, batch_size: int = 500):
+    """generate_responses over corpus slices, response cache disabled."""
+    batches = [corpus[i:i + batch_size] for i in range(0, len(corpus), batch_size)]
+    rounds = max(1, iterations // len(corpus))
+    with _uncached_hub() as hub:
+        return summarize(_time_each(hub.generate_responses, batches * rounds, warmup=1),
+                         ops_per_sample=batch_size, unit="batch")
+
+
+def scenario_bias_filter(corpus, iterations):
+    """bias_filter alone on normalized prompts."""
+    from ai_app.response_logic.bias_logic import bias_filter
+    prompts = [p.strip() for p in (corpus * (iterations // len(corpus) + 1))[:iterations]]
+    return summarize(_time_each(bias_filter, prompts))
+
+
+def scenario_detectors(corpus, iterations):
+    """Single-pass detection (scanner) alone on lowercased prompts."""
+    from ai_app.response_logic import scanner
+    prompts = [p.strip().lower() for p in (corpus * (iterations // len(corpus) + 1))[:iterations]]
+    return summarize(_time_each(scanner.scan_prompt, prompts))
+
+
+def scenario_flask_roundtrip(corpus, iterations):
+    """POST /api/response through the Flask test client, including session handling."""
+    from ai_app.app import app
+    prompts = (corpus * (iterations // len(corpus) + 1))[:iterations]
+    # One long conversation: its history stays at the app's message cap
+    client = app.test_client()
+
+    def post(prompt):
+        resp = client.post("/api/response", json={"input": prompt})
+        if resp.status_code != 200:
+            raise RuntimeError(f"/api/response returned {resp.status_code}")
+
+    with _uncached_hub():
+        return summarize(_time_each(post, prompts, warmup=20), unit="request")
+
+
+SCENARIOS = {
+    "cold_import": scenario_cold_import,
+    "warm_single": scenario_warm_single,
+    "warm_cached": scenario_warm_cached,
+    "batch": scenario_batch,
+    "bias_filter": scenario_bias_filter,
+    "detectors": scenario_detectors,
+    "flask_roundtrip": scenario_flask_roundtrip,
+}
+
+
+# ---------- Runner ----------
+def run_scenario(name: str, corpus_size: int, iterations: int, seed: int) -> dict:
+    result = SCENARIOS[name](build_corpus(corpus_size, seed), iterations)
+    result["description"] = SCENARIOS[name].__doc__
+    return result
+
+
+def _run_isolated(name, args):
+    cmd = [
+        sys.executable, "-m", "ai_app.bench", "--child", "--scenarios", name,
+        "--corpus-size", str(args.corpus_size), "--iterations", str(args.iterations), "--seed", str(args.seed),
+    ]
+    out = subprocess.run(cmd, cwd=PROJECT_ROOT, capture_output=True, text=True, check=True).stdout
+    return json.loads(out)["scenarios"][name]
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    """Return (scenario, metric, old, new, ratio) rows slower than baseline by more than `threshold`."""
+    regressions = []
+    for name, new in current["scenarios"].items():
+        old = baseline.get("scenarios", {}).get(name)
+        if not old:
+            continue
+        for metric in ("median_us", "p99_us"):
+            if old[metric] > 0:
+                ratio = new[metric] / old[metric]
+                if ratio > 1 + threshold:
+                    regressions.append((name, metric, old[metric], new[metric], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ai_app.bench", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--iterations", type=int, default=2000, help="Operations per scenario")
+    parser.add_argument("--corpus-size", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--in-process", action="store_true", help="Run every scenario in this interpreter")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--compare", help="Baseline JSON report to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown ratio for --compare")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        # Checked before the run, which can take minutes
+        try:
+            baseline = json.loads(Path(args.compare).read_text())
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot read baseline report {args.compare}: {e}")
+
+    scenarios = {}
+    for name in args.scenarios:
+        if args.child or args.in_process:
+            scenarios[name] = run_scenario(name, args.corpus_size, args.iterations, args.seed)
+        else:
+            scenarios[name] = _run_isolated(name, args)
+
+    report = {
+        "meta": {
+            "commit": None if args.child else _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "iterations": args.iterations,
+            "corpus_size": args.corpus_size,
+            "seed": args.seed,
+        },
+        "scenarios": scenarios,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    else:
+        print(text)
+
+    if baseline is not None:
+        regressions = compare(baseline, report, args.threshold)
+        for name, metric, old, new, ratio in regressions:
+            print(f"REGRESSION {name} {metric}: {old:.2f}us -> {new:.2f}us ({ratio:.2f}x)", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+# ai_app/conversation_log.py
+"""
+Compact per-session chat history.
+
+A ConversationLog keeps at most `capacity` messages in a ring buffer; appending
+to a full log drops the oldest one. Each Message is a __slots__ record whose
+role is one of a few interned strings.
+
+An assistant reply is stored as its basic response (`content`) plus the
+context block the app appends to it (the "Plan so far" summary and the
+suggested dish). The context only changes when the plan does, so consecutive
+replies share one context string in memory, and the binary form stores it
+only when it changes:
+
+    header   version (B), message count (H)
+    message  flags (B), content length (I), content (UTF-8)
+             [role length (B), role]        if the role code is CUSTOM_ROLE
+             [context length (I), context]  if flags & NEW_CONTEXT
+
+Sessions keep the log in this binary form (session["messages"]), which every
+session backend stores as-is.
+"""
+
+import struct
+
+FORMAT_VERSION = 1
+
+ROLES = ("user", "assistant", "system")
+CUSTOM_ROLE = 3
+_ROLE_CODES = {role: code for code, role in enumerate(ROLES)}
+
+# Flag bits above the 2-bit role code
+NEW_CONTEXT = 4       # a context string follows the content
+REPEAT_CONTEXT = 8    # same context as the last message that had one
+
+_HEADER = struct.Struct("<BH")
+_ENTRY = struct.Struct("<BI")
+_LENGTH = struct.Struct("<I")
+
+
+def _role(role: str) -> str:
+    code = _ROLE_CODES.get(role)
+    return ROLES[code] if code is not None else role
+
+
+class Message:
+    """One chat message; the full text is `content + context`."""
+
+    __slots__ = ("role", "content", "context")
+
+    def __init__(self, role: str, content: str, context: str = ""):
+        self.role = _role(role)
+        self.content = content
+        self.context = context
+
+    @property
+    def text(self) -> str:
+        return self.content + self.context
+
+    def as_dict(self) -> dict:
+        return {"role": self.role, "content": self.text}
+
+    def __eq__(self, other):
+        if not isinstance(other, Message):
+            return NotImplemented
+        return (self.role, self.content, self.context) == (other.role, other.content, other.context)
+
+    def __repr__(self):
+        return f"Message({self.role!r}, {self.content!r}, {self.context!r})"
+
+
+class ConversationLog:
+    """The last `capacity` messages of a conversation, oldest first."""
+
+    __slots__ = ("capacity", "_items", "_start", "_context")
+
+    def __init__(self, capacity: int = 20):
+        if capacity < 1:
+            raise ValueError("ConversationLog capacity must be at least 1")
+        self.capacity = capacity
+        self._items = []    # grows to `capacity`, then wraps around at _start
+        self._start = 0
+        self._context = ""  # last non-empty context, shared by repeats
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        items, start = self._items, self._start
+        yield from items[start:]
+        yield from items[:start]
+
+    def __getitem__(self, i: int) -> Message:
+        n = len(self._items)
+        if not -n <= i < n:
+            raise IndexError("ConversationLog index out of range")
+        return self._items[(self._start + i % n) % n]
+
+    def append(self, role: str, content: str, context: str = ""):
+        if context:
+            if context == self._context:
+                context = self._context
+            else:
+                self._context = context
+        message = Message(role, content, context)
+        if len(self._items) < self.capacity:
+            self._items.append(message)
+        else:
+            self._items[self._start] = message
+            self._start = (self._start + 1) % self.capacity
+
+    def messages(self) -> list:
+        """The log as [{"role": ..., "content": full text}, ...]."""
+        return [m.as_dict() for m in self]
+
+    def to_bytes(self) -> bytes:
+        parts = [_HEADER.pack(FORMAT_VERSION, len(self._items))]
+        last = None
+        for m in self:
+            code = _ROLE_CODES.get(m.role, CUSTOM_ROLE)
+            content = m.content.encode()
+            if not m.context:
+                flags = code
+            elif m.context == last:
+                flags = code | REPEAT_CONTEXT
+            else:
+                flags = code | NEW_CONTEXT
+                last = m.context
+            parts.append(_ENTRY.pack(flags, len(content)))
+            parts.append(content)
+            if code == CUSTOM_ROLE:
+                role = m.role.encode()
+                parts.append(bytes((len(role),)))
+                parts.append(role)
+            if flags & NEW_CONTEXT:
+                context = m.context.encode()
+                parts.append(_LENGTH.pack(len(context)))
+                parts.append(context)
+        return b"".join(parts)
+
+    @classmethod
+    def load(cls, history, capacity: int = 20) -> "ConversationLog":
+        """The log stored in a session: its binary form, or a list of message dicts from older sessions."""
+        if isinstance(history, (bytes, bytearray)):
+            return cls.from_bytes(history, capacity)
+        log = cls(capacity)
+        for m in history or ():
+            log.append(m["role"], m["content"])
+        return log
+
+    @classmethod
+    def from_bytes(cls, data: bytes, capacity: int = 20) -> "ConversationLog":
+        """Decode to_bytes() output; an empty `data` gives an empty log."""
+        log = cls(capacity)
+        if not data:
+            return log
+        version, count = _HEADER.unpack_from(data, 0)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported conversation log version: {version}")
+        view = memoryview(data)
+        pos = _HEADER.size
+        context = ""
+        for _ in range(count):
+            flags, size = _ENTRY.unpack_from(data, pos)
+            pos += _ENTRY.size
+            content = str(view[pos:pos + size], "utf-8")
+            pos += size
+            code = flags & 3
+            if code == CUSTOM_ROLE:
+                size = data[pos]
+                role = str(view[pos + 1:pos + 1 + size], "utf-8")
+                pos += 1 + size
+            else:
+                role = ROLES[code]
+            if flags & NEW_CONTEXT:
+                (size,) = _LENGTH.unpack_from(data, pos)
+                pos += _LENGTH.size
+                context = str(view[pos:pos + size], "utf-8")
+                pos += size
+                log.append(role, content, context)
+            elif flags & REPEAT_CONTEXT:
+                log.append(role, content, context)
+            else:
+                log.append(role, content)
+        return log
@@ -1,11 +1,32 @@
-from .bias_logic import bias_filter
-from .ingredient_logic import detect_ingredients
-from .equipment_logic import detect_equipment
-from .response_hub import generate_response
+# Public names are resolved on first access so importing one submodule (or
+# just the package) does not pull in the whole response stack.
+import importlib
+
+_EXPORTS = {
+    "bias_filter": ".bias_logic",
+    "detect_ingredients": ".ingredient_logic",
+    "detect_equipment": ".equipment_logic",
+    "generate_response": ".response_hub",
+    "generate_responses": ".response_hub",
+}
 
 __all__ = [
     "bias_filter",
     "detect_ingredients",
     "detect_equipment",
     "generate_response",
+    "generate_responses",
 ]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
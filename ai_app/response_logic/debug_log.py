@@ -0,0 +1,137 @@
+"""
+debug_log.py
+------------
+Structured debug logging for ai_app.response_logic.
+
+Each subsystem ("extraction", "routing", ...) gets a SubsystemLog with its own
+level and sample rate. Events are a name plus keyword fields and go to the
+standard logger "ai_app.response_logic.<subsystem>"; the fields are attached to
+the record as `event` / `fields` and rendered as key=value only if a handler
+formats the record.
+
+Callers guard with `enabled()` so nothing is built for a disabled subsystem:
+
+    log = get_log("extraction")
+    if log.enabled():
+        log.event("tokens", tokens=list(tokens))
+
+enabled() is one integer comparison when the level is off. When the level is
+on but the sample rate is below 1, it also draws a random number, so a guarded
+block is either logged whole or skipped whole.
+
+Configure with configure_log() or from the environment, e.g.
+    RESPONSE_LOG_LEVELS="extraction=DEBUG,*=INFO"
+    RESPONSE_LOG_SAMPLE="extraction=0.01"
+Subsystems default to WARNING and a sample rate of 1.
+"""
+
+import logging
+import os
+import random
+import threading
+
+_PREFIX = "ai_app.response_logic."
+DEFAULT_LEVEL = logging.WARNING
+
+
+class _Fields:
+    """Renders event fields as key=value only when a handler formats the record."""
+
+    __slots__ = ("fields",)
+
+    def __init__(self, fields: dict):
+        self.fields = fields
+
+    def __str__(self):
+        return " ".join(f"{key}={value!r}" for key, value in self.fields.items())
+
+
+class SubsystemLog:
+    """Level, sample rate and logger for one subsystem."""
+
+    __slots__ = ("name", "level", "sample_rate", "logger")
+
+    def __init__(self, name: str, level: int = DEFAULT_LEVEL, sample_rate: float = 1.0):
+        self.name = name
+        self.level = level
+        self.sample_rate = sample_rate
+        self.logger = logging.getLogger(_PREFIX + name)
+
+    def enabled(self, level: int = logging.DEBUG) -> bool:
+        """Whether an event at `level` should be built and logged (applies sampling)."""
+        if level < self.level:
+            return False
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return False
+        return self.logger.isEnabledFor(level)
+
+    def event(self, event: str, level: int = logging.DEBUG, **fields):
+        """Log `event` with structured `fields`; call only after enabled() returned True."""
+        self.logger.log(
+            level, "%s %s", event, _Fields(fields),
+            extra={"subsystem": self.name, "event": event, "fields": fields},
+        )
+
+
+_LOGS = {}
+_DEFAULTS = {"level": DEFAULT_LEVEL, "sample_rate": 1.0}
+_lock = threading.Lock()
+
+
+def get_log(subsystem: str) -> SubsystemLog:
+    """The SubsystemLog for `subsystem`, created with the configured defaults."""
+    log = _LOGS.get(subsystem)
+    if log is None:
+        with _lock:
+            log = _LOGS.get(subsystem)
+            if log is None:
+                log = _LOGS[subsystem] = SubsystemLog(subsystem, **_DEFAULTS)
+    return log
+
+
+def configure_log(subsystem: str = "*", level=None, sample_rate: float = None):
+    """
+    Set the level (int or name like "DEBUG") and/or sample rate of one
+    subsystem, or of every subsystem (current and future) with "*".
+    """
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            raise ValueError(f"Unknown log level: {level}")
+    if sample_rate is not None and not 0.0 <= sample_rate <= 1.0:
+        raise ValueError("sample_rate must be between 0 and 1")
+
+    with _lock:
+        if subsystem == "*":
+            targets = list(_LOGS.values())
+            if level is not None:
+                _DEFAULTS["level"] = level
+            if sample_rate is not None:
+                _DEFAULTS["sample_rate"] = sample_rate
+        else:
+            log = _LOGS.get(subsystem)
+            if log is None:
+                log = _LOGS[subsystem] = SubsystemLog(subsystem, **_DEFAULTS)
+            targets = [log]
+    for log in targets:
+        if level is not None:
+            log.level = level
+        if sample_rate is not None:
+            log.sample_rate = sample_rate
+
+
+def _parse_env(value: str):
+    """'extraction=DEBUG,*=INFO' -> [("extraction", "DEBUG"), ("*", "INFO")]"""
+    pairs = []
+    for item in value.split(","):
+        name, sep, setting = item.partition("=")
+        if sep and name.strip() and setting.strip():
+            pairs.append((name.strip(), setting.strip()))
+    return pairs
+
+
+# "*" first so per-subsystem settings override it
+for _name, _level in sorted(_parse_env(os.getenv("RESPONSE_LOG_LEVELS", "")), key=lambda p: p[0] != "*"):
+    configure_log(_name, level=_level)
+for _name, _rate in sorted(_parse_env(os.getenv("RESPONSE_LOG_SAMPLE", "")), key=lambda p: p[0] != "*"):
+    configure_log(_name, sample_rate=float(_rate))
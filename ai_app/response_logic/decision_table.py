@@ -0,0 +1,212 @@
+"""
+decision_table.py
+-----------------
+Declarative first-match rule tables (dish choice, cooking method, ...).
+
+Rules are written as data (see data/dish_rules.json) in terms of atoms:
+
+    "equipment:oven"         an equipment item equal to "oven"
+    "ingredients~chicken"    an ingredient item containing "chicken"
+
+A rule has an optional "all" list of atoms, an optional "any" list of atom
+groups (at least one atom of each group must hold) and a "value". Rules are
+tried in order and the first that holds wins; a table with no matching rule
+gives None. Matching is case-insensitive, and with a lemma table ({form:
+lemma}, see lemmas.py) atoms and items are compared word by word as lemmas, so
+"ingredients:potato" holds for "potatoes".
+
+Every atom used by any table gets one bit, so a request becomes a single integer
+of feature bits and a rule check is a couple of AND operations. Each rule is
+indexed under one "anchor" atom it cannot hold without, so evaluation only
+visits rules whose anchor is present, and results are memoized per feature
+mask.
+"""
+
+import heapq
+import re
+
+_ATOM_RE = re.compile(r"^(\w+)([:~])(.+)$")
+
+
+def _parse_atom(atom: str):
+    match = _ATOM_RE.match(atom)
+    if not match:
+        raise ValueError(f"Bad rule atom {atom!r}; expected 'slot:term' or 'slot~term'")
+    slot, kind, term = match.groups()
+    return slot, kind == "~", term.lower()
+
+
+def atom_terms(tables: dict):
+    """Every term the atoms of `tables` name, for building a lemma table."""
+    for rules in tables.values():
+        for rule in rules:
+            atoms = list(rule.get("all", ()))
+            for group in rule.get("any", ()):
+                atoms.extend(group)
+            for atom in atoms:
+                yield _parse_atom(atom)[2]
+
+
+class _Table:
+    __slots__ = ("name", "rules", "by_anchor", "fallback", "memo")
+
+    def __init__(self, name):
+        self.name = name
+        self.rules = []
+        self.by_anchor = {}
+        self.fallback = None
+        self.memo = {}
+
+
+class RuleBook:
+    """
+    Named rule tables compiled over one shared atom space.
+
+    `tables` maps a table name to its list of rules ({"all": [...], "any":
+    [[...], ...], "value": ...}); terms and items are normalized with
+    `lemmas`. At most `memo_size` feature masks are remembered per table.
+    """
+
+    def __init__(self, tables: dict, lemmas: dict = None, memo_size: int = 4096):
+        self._lemmas = lemmas or {}
+        self.memo_size = memo_size
+        self._bits = {}            # (slot, contains, term) -> bit
+        self._exact = {}           # slot -> {term: bit mask}
+        self._contains = {}        # slot -> [(term, bit)]
+        self._item_masks = {}      # slot -> {item: feature bits of that item}
+        self._tables = {}
+
+        parsed = {
+            name: [self._compile_rule(name, rule) for rule in rules]
+            for name, rules in tables.items()
+        }
+
+        # Anchor each rule on its least shared required atom
+        frequency = {}
+        for rules in parsed.values():
+            for all_mask, _, _ in rules:
+                for bit in _bits_of(all_mask):
+                    frequency[bit] = frequency.get(bit, 0) + 1
+
+        for name, rules in parsed.items():
+            table = self._tables[name] = _Table(name)
+            table.rules = rules
+            for index, (all_mask, any_masks, _) in enumerate(rules):
+                if all_mask:
+                    anchors = [min(_bits_of(all_mask), key=lambda bit: (frequency[bit], bit))]
+                elif any_masks:
+                    anchors = list(_bits_of(any_masks[0]))
+                else:
+                    table.fallback = index
+                    break  # rules after an unconditional one can never fire
+                for bit in anchors:
+                    table.by_anchor.setdefault(bit, []).append(index)
+
+    def _normalize(self, text: str) -> str:
+        text = text.lower()
+        lemmas = self._lemmas
+        if not lemmas:
+            return text
+        return " ".join(lemmas.get(word, word) for word in text.split())
+
+    def _intern(self, atom: str) -> int:
+        slot, contains, term = _parse_atom(atom)
+        key = (slot, contains, self._normalize(term))
+        bit = self._bits.get(key)
+        if bit is None:
+            bit = self._bits[key] = 1 << len(self._bits)
+            slot, contains, term = key
+            if contains:
+                self._contains.setdefault(slot, []).append((term, bit))
+            else:
+                exact = self._exact.setdefault(slot, {})
+                exact[term] = exact.get(term, 0) | bit
+        return bit
+
+    def _compile_rule(self, table: str, rule: dict):
+        if "value" not in rule:
+            raise ValueError(f"Rule in table {table!r} has no value: {rule!r}")
+        all_mask = 0
+        for atom in rule.get("all", ()):
+            all_mask |= self._intern(atom)
+        any_masks = []
+        for group in rule.get("any", ()):
+            mask = 0
+            for atom in group:
+                mask |= self._intern(atom)
+            any_masks.append(mask)
+        return all_mask, tuple(any_masks), rule["value"]
+
+    def __contains__(self, table: str):
+        return table in self._tables
+
+    def features(self, **slots) -> int:
+        """Feature bits for the given slot items, e.g. features(equipment=[...], ingredients=[...])."""
+        return self._features(slots)
+
+    def _features(self, slots: dict) -> int:
+        mask = 0
+        for slot, items in slots.items():
+            if not items:
+                continue
+            cache = self._item_masks.get(slot)
+            if cache is None:
+                cache = self._item_masks.setdefault(slot, {})
+            cached = cache.get
+            for item in items:
+                bits = cached(item)
+                if bits is None:
+                    bits = self._item_bits(slot, item)
+                    if len(cache) < self.memo_size:
+                        cache[item] = bits
+                mask |= bits
+        return mask
+
+    def _item_bits(self, slot: str, item) -> int:
+        text = self._normalize(str(item))
+        bits = self._exact.get(slot, {}).get(text, 0)
+        for term, bit in self._contains.get(slot, ()):
+            if term in text:
+                bits |= bit
+        return bits
+
+    def decide(self, table: str, features: int):
+        """Value of the first rule of `table` that holds for `features`, or None."""
+        t = self._tables[table]
+        memo = t.memo
+        if features in memo:
+            return memo[features]
+
+        candidates = []
+        remaining = features
+        while remaining:
+            low = remaining & -remaining
+            remaining ^= low
+            indexes = t.by_anchor.get(low)
+            if indexes:
+                candidates.append(indexes)
+        if t.fallback is not None:
+            candidates.append((t.fallback,))
+
+        value = None
+        rules = t.rules
+        for index in heapq.merge(*candidates):
+            all_mask, any_masks, rule_value = rules[index]
+            if features & all_mask == all_mask and all(features & mask for mask in any_masks):
+                value = rule_value
+                break
+
+        if len(memo) < self.memo_size:
+            memo[features] = value
+        return value
+
+    def evaluate(self, table: str, **slots):
+        """decide(table, features(**slots))."""
+        return self.decide(table, self._features(slots))
+
+
+def _bits_of(mask: int):
+    while mask:
+        low = mask & -mask
+        yield low
+        mask ^= low
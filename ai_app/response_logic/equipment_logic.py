@@ -1,7 +1,9 @@
 # Equipment detection logic
+from .vocabulary import get_vocabulary
 
-EQUIPMENT_KEYWORDS = ["instant pot", "wok", "cast iron", "air fryer", "oven"]
+# Snapshot of data/equipment.json "equipment_keywords" for direct importers
+EQUIPMENT_KEYWORDS = list(get_vocabulary().lists["equipment_keywords"])
 
 def detect_equipment(text_low: str):
     """Return a list of matched equipment terms (lowercase)."""
-    return [item for item in EQUIPMENT_KEYWORDS if item in text_low]
+    return get_vocabulary().automaton("equipment_keywords").find_all(text_low)
@@ -0,0 +1,185 @@
+"""
+fuzzy_matcher.py
+----------------
+Typo-tolerant term lookup (SymSpell-style symmetric delete index).
+
+Every term is indexed under all the strings obtained by deleting up to
+`max_distance` characters from its first `prefix_length` characters. A lookup
+generates the same deletes for the query word, collects the terms that share
+one, and verifies each candidate with a bounded edit distance. The work per
+lookup depends on the word length, not on the vocabulary size.
+"""
+
+from . import tokenizer
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent
+    transpositions) between `a` and `b`, or limit + 1 once it exceeds `limit`.
+    """
+    # Common prefix and suffix never change the distance
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if len(a) > len(b):
+        a, b = b, a
+    if not a:
+        return len(b) if len(b) <= limit else limit + 1
+    if len(b) - len(a) > limit:
+        return limit + 1
+
+    prev_prev = None
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        row = [i] + [0] * len(b)
+        best = i
+        for j, cb in enumerate(b, 1):
+            cost = 0 if ca == cb else 1
+            value = min(prev[j] + 1, row[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                value = min(value, prev_prev[j - 2] + 1)
+            row[j] = value
+            if value < best:
+                best = value
+        if best > limit:
+            return limit + 1
+        prev_prev, prev = prev, row
+    return prev[-1] if prev[-1] <= limit else limit + 1
+
+
+def _deletes(word: str, max_distance: int) -> set:
+    """`word` and every string made by deleting up to `max_distance` characters from it."""
+    found = {word}
+    frontier = [word]
+    for _ in range(max_distance):
+        next_frontier = []
+        for item in frontier:
+            for i in range(len(item)):
+                shorter = item[:i] + item[i + 1:]
+                if shorter not in found:
+                    found.add(shorter)
+                    next_frontier.append(shorter)
+        frontier = next_frontier
+    return found
+
+
+def typo_budget(word: str) -> int:
+    """
+    Edit distance the detectors allow when correcting `word`: none for short
+    words (too many real words sit one edit from "rice" or "fish"), one for
+    medium words and two for long ones.
+    """
+    if len(word) < 6:
+        return 0
+    return 1 if len(word) < 9 else 2
+
+
+class FuzzyMatcher:
+    """
+    Bounded edit-distance lookup over a fixed vocabulary.
+
+    `terms` is either an iterable of strings or a mapping of term -> value, like
+    KeywordAutomaton. lookup() returns the value of the closest term within the
+    allowed distance; ties go to the term registered first.
+    """
+
+    def __init__(self, terms, max_distance: int = 2, prefix_length: int = 7):
+        if hasattr(terms, "items"):
+            pairs = list(terms.items())
+        else:
+            pairs = [(term, term) for term in terms]
+
+        self.max_distance = max_distance
+        self.prefix_length = max(prefix_length, max_distance + 1)
+        self._terms = []
+        self._values = []
+        self._ids = {}
+        # delete -> term id, or list of term ids once several terms share it
+        self._deletes = {}
+
+        for term, value in pairs:
+            if not term or term in self._ids:
+                continue
+            term_id = self._ids[term] = len(self._terms)
+            self._terms.append(term)
+            self._values.append(value)
+            for key in _deletes(term[:self.prefix_length], max_distance):
+                known = self._deletes.get(key)
+                if known is None:
+                    self._deletes[key] = term_id
+                elif known.__class__ is int:
+                    self._deletes[key] = [known, term_id]
+                else:
+                    known.append(term_id)
+
+    def __len__(self):
+        return len(self._terms)
+
+    def lookup_term(self, word: str, max_distance: int = None):
+        """(term, distance) of the closest term to `word`, or None."""
+        limit = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        term_id = self._ids.get(word)
+        if term_id is not None:
+            return self._terms[term_id], 0
+        if limit <= 0:
+            return None
+
+        best_id, best = None, limit + 1
+        seen = set()
+        terms = self._terms
+        prefix_length = self.prefix_length
+        for key in _deletes(word[:prefix_length], limit):
+            ids = self._deletes.get(key)
+            if ids is None:
+                continue
+            # Terms that needed more than `limit` deletes to reach this key are too far
+            longest = len(key) + limit
+            for term_id in ((ids,) if ids.__class__ is int else ids):
+                if term_id in seen:
+                    continue
+                term = terms[term_id]
+                if min(len(term), prefix_length) > longest:
+                    continue
+                seen.add(term_id)
+                # Beat the best so far, or tie it from an earlier-registered term
+                bound = limit if best_id is None else (best if term_id < best_id else best - 1)
+                if abs(len(term) - len(word)) > bound:
+                    continue
+                distance = edit_distance(word, term, bound)
+                if distance <= bound:
+                    best_id, best = term_id, distance
+        if best_id is None or best > limit:
+            return None
+        return terms[best_id], best
+
+    def lookup(self, word: str, max_distance: int = None):
+        """Value of the closest term to `word` within `max_distance` edits, or None."""
+        hit = self.lookup_term(word, max_distance)
+        return None if hit is None else self._values[self._ids[hit[0]]]
+
+
+def correct_words(text_low: str, matcher: FuzzyMatcher, skip=()) -> list:
+    """
+    (start, end, value) for each word of `text_low` that `matcher` resolves
+    within typo_budget(word). Words overlapping a hit of any automaton in
+    `skip` (the exact matchers) are left alone.
+    """
+    hits, covered = [], None
+    for start, end, word in tokenizer.token_spans(text_low):
+        budget = typo_budget(word)
+        if not budget:
+            continue
+        if covered is None:
+            covered = [(s, e) for automaton in skip for s, e, _ in automaton.iter_matches(text_low)]
+        if any(s < end and start < e for s, e in covered):
+            continue
+        value = matcher.lookup(word, budget)
+        if value is not None:
+            hits.append((start, end, value))
+    return hits
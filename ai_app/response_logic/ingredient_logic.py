@@ -1,14 +1,20 @@
 # Ingredient detection logic
+from .fuzzy_matcher import correct_words
+from .vocabulary import get_vocabulary
 
-COMMON_INGREDIENTS = [
-    "chicken", "potatoes", "onions", "carrots", "beef",
-    "rice", "lentils", "eggs", "broccoli", "pork",
-    "fish", "salmon", "lemon", "parsley", "garlic",
-    "beans", "bread", "pasta", "cheese", "spinach",
-    "mushrooms", "soy sauce", "turkey", "cranberries",
-    "dill", "tomato sauce"
-]
+# Snapshot of data/ingredients.json "common_ingredients" for direct importers
+COMMON_INGREDIENTS = list(get_vocabulary().lists["common_ingredients"])
 
-def detect_ingredients(text_low: str):
-    """Return a list of matched known ingredients (lowercase)."""
-    return [item for item in COMMON_INGREDIENTS if item in text_low]
+def detect_ingredients(text_low: str, fuzzy: bool = False):
+    """
+    Return a list of matched known ingredients (lowercase). With fuzzy=True,
+    misspelled ingredient words ("brocoli") are matched too.
+    """
+    vocab = get_vocabulary()
+    automaton = vocab.automaton("common_ingredients")
+    found = automaton.find_all(text_low)
+    if fuzzy:
+        for _, _, name in correct_words(text_low, vocab.fuzzy_matcher("common_ingredients"), (automaton,)):
+            if name not in found:
+                found.append(name)
+    return found
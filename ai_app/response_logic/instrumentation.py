@@ -0,0 +1,162 @@
+"""
+instrumentation.py
+------------------
+Optional per-stage timing for generate_response.
+
+When enabled, each request carries a StageTimer that marks stage boundaries with
+perf_counter_ns. Finished requests are folded into per-stage log2 histograms and
+requests slower than a threshold are logged with their stage breakdown. When
+disabled, the hub only pays for a `RECORDER is None` check.
+
+Enable with enable_instrumentation() or RESPONSE_TIMING=1 in the environment
+(RESPONSE_SLOW_MS sets the slow-request threshold).
+"""
+
+import logging
+import os
+import threading
+from time import perf_counter_ns
+
+logger = logging.getLogger(__name__)
+
+# Histogram buckets are powers of two in nanoseconds: bucket i holds [2**(i-1), 2**i)
+_BUCKETS = 40
+
+
+class StageTimer:
+    """Collects (stage, duration_ns) pairs for one request."""
+
+    __slots__ = ("stages", "_start", "_last")
+
+    def __init__(self):
+        self.stages = []
+        self._start = self._last = perf_counter_ns()
+
+    def mark(self, stage: str):
+        now = perf_counter_ns()
+        self.stages.append((stage, now - self._last))
+        self._last = now
+
+    @property
+    def total_ns(self) -> int:
+        return self._last - self._start
+
+
+class StageHistogram:
+    """Count, sum, extremes and log2 buckets of durations for one stage."""
+
+    __slots__ = ("count", "total_ns", "min_ns", "max_ns", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+        self.buckets = [0] * _BUCKETS
+
+    def add(self, ns: int):
+        self.count += 1
+        self.total_ns += ns
+        if self.min_ns is None or ns < self.min_ns:
+            self.min_ns = ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        self.buckets[min(ns.bit_length(), _BUCKETS - 1)] += 1
+
+    def percentile_ns(self, pct: float) -> int:
+        """Upper bound of the bucket holding the pct-th percentile."""
+        if not self.count:
+            return 0
+        rank = pct / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min(1 << i, self.max_ns)
+        return self.max_ns
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": self.total_ns / 1e6,
+            "mean_us": self.total_ns / self.count / 1e3 if self.count else 0.0,
+            "min_us": (self.min_ns or 0) / 1e3,
+            "max_us": self.max_ns / 1e3,
+            "p50_us": self.percentile_ns(50) / 1e3,
+            "p95_us": self.percentile_ns(95) / 1e3,
+            "p99_us": self.percentile_ns(99) / 1e3,
+            "buckets_ns": {f"<{1 << i}": n for i, n in enumerate(self.buckets) if n},
+        }
+
+
+class StageRecorder:
+    """Aggregates finished StageTimers into per-stage histograms."""
+
+    def __init__(self, slow_ms: float = 50.0):
+        self.slow_ms = slow_ms
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.slow_requests = 0
+            self._stages = {}
+            self._total = StageHistogram()
+
+    def observe(self, timer: StageTimer, label: str = ""):
+        total_ns = timer.total_ns
+        with self._lock:
+            self.requests += 1
+            self._total.add(total_ns)
+            for stage, ns in timer.stages:
+                hist = self._stages.get(stage)
+                if hist is None:
+                    hist = self._stages[stage] = StageHistogram()
+                hist.add(ns)
+            slow = self.slow_ms is not None and total_ns >= self.slow_ms * 1e6
+            if slow:
+                self.slow_requests += 1
+        if slow:
+            logger.warning(
+                "slow generate_response %.2fms %s prompt=%r",
+                total_ns / 1e6,
+                " ".join(f"{stage}={ns / 1e3:.1f}us" for stage, ns in timer.stages),
+                label[:80],
+            )
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "slow_requests": self.slow_requests,
+                "slow_ms": self.slow_ms,
+                "total": self._total.to_dict(),
+                "stages": {stage: hist.to_dict() for stage, hist in self._stages.items()},
+            }
+
+
+# The hub reads this on every request; None means instrumentation is off
+RECORDER = None
+
+
+def enable_instrumentation(slow_ms: float = 50.0) -> StageRecorder:
+    """Start recording stage timings; returns the active recorder."""
+    global RECORDER
+    RECORDER = StageRecorder(slow_ms=slow_ms)
+    return RECORDER
+
+
+def disable_instrumentation():
+    global RECORDER
+    RECORDER = None
+
+
+def timing_snapshot() -> dict:
+    """Current histograms as a dict, or {} when instrumentation is off."""
+    recorder = RECORDER
+    return recorder.snapshot() if recorder is not None else {}
+
+
+if os.getenv("RESPONSE_TIMING", "0") == "1":
+    enable_instrumentation(slow_ms=float(os.getenv("RESPONSE_SLOW_MS", "50")))
@@ -0,0 +1,137 @@
+"""
+keyword_automaton.py
+--------------------
+Aho-Corasick keyword automaton shared by the detectors in ai_app.response_logic.
+
+The automaton is built once per vocabulary and reports every occurrence of every
+term in a single left-to-right pass, so lookup cost follows the prompt length
+instead of the vocabulary size.
+"""
+
+from collections import deque
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordAutomaton:
+    """
+    Multi-pattern matcher over a fixed vocabulary.
+
+    `terms` is either an iterable of strings or a mapping of term -> value (used
+    for aliases, e.g. {"lemons": "lemon"}). Matching is substring-based like the
+    `term in text` checks it replaces; pass whole_words=True to only accept hits
+    that sit on word boundaries.
+    """
+
+    def __init__(self, terms, whole_words: bool = False):
+        if hasattr(terms, "items"):
+            pairs = list(terms.items())
+        else:
+            pairs = [(term, term) for term in terms]
+
+        self.whole_words = whole_words
+        self._terms = []
+        self._values = []
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+
+        index = {}
+        for term, value in pairs:
+            if not term or term in index:
+                continue
+            index[term] = len(self._terms)
+            self._terms.append(term)
+            self._values.append(value)
+            self._insert(term, index[term])
+        self._link()
+
+        # Distinct values, in the order they were first registered
+        self._value_order = {}
+        for value in self._values:
+            self._value_order.setdefault(value, len(self._value_order))
+
+    def __len__(self):
+        return len(self._terms)
+
+    def _insert(self, term, term_id):
+        state = 0
+        for ch in term:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] = (term_id,)
+
+    def _link(self):
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                # Fold suffix outputs in so a match never has to walk fail links
+                out[nxt] = out[nxt] + out[fail[nxt]]
+
+    # --- Matching ---
+    def _hits(self, text):
+        """Yield (end_index, term_ids) for every state that emits a match."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            nxt = goto[state].get(ch)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto[state].get(ch)
+            state = nxt or 0
+            if out[state]:
+                yield i, out[state]
+
+    def _on_boundary(self, text, start, end):
+        return (start == 0 or not _is_word_char(text[start - 1])) and (
+            end == len(text) or not _is_word_char(text[end])
+        )
+
+    def _iter_ids(self, text):
+        terms = self._terms
+        for i, ids in self._hits(text):
+            end = i + 1
+            for term_id in ids:
+                start = end - len(terms[term_id])
+                if self.whole_words and not self._on_boundary(text, start, end):
+                    continue
+                yield start, end, term_id
+
+    def iter_matches(self, text: str):
+        """Yield (start, end, value) for every occurrence, ordered by end offset."""
+        values = self._values
+        for start, end, term_id in self._iter_ids(text):
+            yield start, end, values[term_id]
+
+    def matched_terms(self, text: str) -> set:
+        """Return the set of distinct terms found in `text`."""
+        terms = self._terms
+        if self.whole_words:
+            return {terms[term_id] for _, _, term_id in self._iter_ids(text)}
+        return {terms[term_id] for _, ids in self._hits(text) for term_id in ids}
+
+    def find_all(self, text: str) -> list:
+        """Return distinct matched values, in vocabulary order."""
+        found = {value for _, _, value in self.iter_matches(text)}
+        return sorted(found, key=self._value_order.__getitem__)
+
+    def contains_any(self, text: str) -> bool:
+        """True as soon as any term occurs in `text`."""
+        for _ in self.iter_matches(text):
+            return True
+        return False
@@ -0,0 +1,79 @@
+"""
+lemmas.py
+---------
+Singular/plural normalization for vocabulary words.
+
+build_lemma_table() runs when the vocabulary index is compiled. It maps every
+plural form of every vocabulary word (and every plural vocabulary word itself)
+to its singular lemma. At request time normalization is one dict lookup per
+token: `lemmas.get(word, word)`. Words outside the table are their own lemma.
+
+English rules cover the regular cases; data/lemmas.json lists the irregular
+plurals ("leaves") and the words that only look plural ("asparagus").
+"""
+
+_SIBILANT_ENDINGS = ("s", "x", "z", "ch", "sh", "o")
+_VOWELS = "aeiou"
+
+
+def singularize(word: str, irregular: dict, invariant) -> str:
+    """Best-effort singular of a single lowercase word."""
+    if word in invariant:
+        return word
+    if word in irregular:
+        return irregular[word]
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith("oes") or word.endswith(("ches", "shes", "xes", "zes", "sses")):
+        return word[:-2]
+    if word.endswith(("ss", "us", "is")):
+        return word
+    if word.endswith("s") and len(word) > 3:
+        return word[:-1]
+    return word
+
+
+def plural_forms(word: str) -> set:
+    """Regular plural spellings of a singular word (a superset, some are misspellings)."""
+    forms = {word + "s"}
+    if word.endswith(_SIBILANT_ENDINGS):
+        forms.add(word + "es")
+    if word.endswith("y") and len(word) > 1 and word[-2] not in _VOWELS:
+        forms.add(word[:-1] + "ies")
+    if word.endswith("fe"):
+        forms.add(word[:-2] + "ves")
+    elif word.endswith("f"):
+        forms.add(word[:-1] + "ves")
+    return forms
+
+
+def build_lemma_table(terms, irregular: dict, invariant) -> dict:
+    """
+    {inflected form: lemma} for the words in `terms` (multi-word terms are
+    split). Only forms that differ from their lemma are stored.
+    """
+    invariant = set(invariant)
+    words = list(dict.fromkeys(word for term in terms for word in term.split()))
+    singular_of = {word: singularize(word, irregular, invariant) for word in words}
+
+    table = {word: lemma for word, lemma in singular_of.items() if word != lemma}
+    lemmas = set(singular_of.values())
+    for plural, lemma in irregular.items():
+        if lemma in lemmas:
+            table.setdefault(plural, lemma)
+    for lemma in lemmas:
+        if lemma in invariant:
+            continue
+        for form in plural_forms(lemma):
+            # Never re-map a vocabulary word that is already its own lemma
+            if singular_of.get(form, lemma) != form:
+                table.setdefault(form, lemma)
+    return table
+
+
+def forms_by_lemma(table: dict) -> dict:
+    """{lemma: [inflected forms]} view of a lemma table."""
+    forms = {}
+    for form, lemma in table.items():
+        forms.setdefault(lemma, []).append(form)
+    return forms
@@ -0,0 +1,84 @@
+"""
+prompt_analysis.py
+------------------
+PromptAnalysis: one compact record per request with the normalized prompt and
+everything detected in it. The hub builds it once and hands it to every
+response helper, so no helper lowercases or rescans the prompt again.
+"""
+
+from . import tokenizer
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _word_offset(text: str, term: str):
+    """Offset of the first occurrence of `term` in `text` on word boundaries, or None."""
+    start = text.find(term)
+    while start != -1:
+        end = start + len(term)
+        if (start == 0 or not _is_word_char(text[start - 1])) and (end == len(text) or not _is_word_char(text[end])):
+            return start
+        start = text.find(term, start + 1)
+    return None
+
+
+class PromptAnalysis:
+    """Normalized text, tokens and detected entities for a single prompt."""
+
+    __slots__ = (
+        "text", "text_low", "terms", "restrictions", "equipment", "ingredients",
+        "ingredient_marker", "ambiguous", "help", "cues", "canons", "_tokens", "_words",
+    )
+
+    def __init__(self, text, text_low, terms, restrictions, equipment, ingredients,
+                 ingredient_marker, ambiguous, help, cues=0, canons=frozenset()):
+        self.text = text
+        self.text_low = text_low
+        # Every vocabulary term found in text_low; helpers test membership here
+        self.terms = terms
+        self.restrictions = restrictions
+        self.equipment = equipment
+        self.ingredients = ingredients
+        self.ingredient_marker = ingredient_marker
+        self.ambiguous = ambiguous
+        self.help = help
+        # One bit per vocabulary "response_cues" word found (see vocabulary.CUE_SHIFT)
+        self.cues = cues
+        # Restrictions found by a restriction pattern ("lactose intolerant" -> dairy)
+        self.canons = canons
+        self._tokens = None
+        self._words = None
+
+    @property
+    def tokens(self):
+        """Word tokens of the normalized text, computed on first use."""
+        if self._tokens is None:
+            self._tokens = list(tokenizer.words(self.text_low))
+        return self._tokens
+
+    @property
+    def words(self):
+        """
+        {term: offset} of the first whole-word occurrence of each detected
+        restriction and equipment term, computed on first use.
+        Substring hits such as "ham" in "hamster" are left out.
+        """
+        if self._words is None:
+            text = self.text_low
+            self._words = {}
+            for term in (*self.restrictions, *self.equipment):
+                if term not in self._words:
+                    start = _word_offset(text, term)
+                    if start is not None:
+                        self._words[term] = start
+        return self._words
+
+    def __repr__(self):
+        return (
+            f"PromptAnalysis(text_low={self.text_low!r}, restrictions={self.restrictions!r}, "
+            f"equipment={self.equipment!r}, ingredients={self.ingredients!r}, "
+            f"ingredient_marker={self.ingredient_marker!r}, ambiguous={self.ambiguous!r}, "
+            f"help={self.help!r})"
+        )
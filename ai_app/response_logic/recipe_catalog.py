@@ -0,0 +1,165 @@
+"""
+recipe_catalog.py
+-----------------
+Recipe catalog with an inverted ingredient index and top-k ranking.
+
+Every index entry is a bitset (a Python int, bit i = recipe i): ingredient ->
+recipes using it, equipment -> recipes needing it, restriction term ->
+recipes containing it, tag -> recipes carrying it, size -> recipes with that
+many ingredients. A query ANDs the filters into one "allowed" set, then counts
+pantry overlap with bit-sliced levels (levels[c] = recipes sharing at least c
+pantry ingredients), so the work is a few big-int operations per pantry item
+instead of a loop over recipes.
+
+Ranking: most pantry ingredients used, then fewest missing ingredients, then
+catalog order.
+"""
+
+
+class Recipe:
+    """
+    One catalog entry. `contains` lists restriction categories the recipe
+    falls under beyond its ingredient names ("dairy", "gluten", ...).
+    """
+
+    __slots__ = ("id", "name", "ingredients", "equipment", "tags", "contains")
+
+    def __init__(self, id, name, ingredients, equipment=(), tags=(), contains=()):
+        self.id = id
+        self.name = name
+        self.ingredients = ingredients
+        self.equipment = equipment
+        self.tags = tags
+        self.contains = contains
+
+    def __repr__(self):
+        return f"Recipe({self.id}, {self.name!r})"
+
+
+def _bitset(ids, count: int) -> int:
+    """Int with bit i set for each i in `ids` (built in one pass, not bit by bit)."""
+    buffer = bytearray((count + 7) // 8)
+    for i in ids:
+        buffer[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _lowest_ids(bits: int, limit: int) -> list:
+    ids = []
+    while bits and len(ids) < limit:
+        low = bits & -bits
+        ids.append(low.bit_length() - 1)
+        bits ^= low
+    return ids
+
+
+class RecipeCatalog:
+    """
+    Recipes from `records` (dicts with name, ingredients and optional
+    equipment, tags, contains). Ingredient and restriction words are
+    normalized with `lemmas` ({form: lemma}, see lemmas.py). With a
+    RestrictionIndex, a restriction also excludes every recipe using a term
+    below it in the hierarchy ("dairy" excludes recipes with cheese).
+    """
+
+    def __init__(self, records, lemmas: dict = None, restrictions=None):
+        self._lemmas = lemmas or {}
+        self.restrictions = restrictions
+        self.recipes = []
+        ingredient_ids, equipment_ids, term_ids, tag_ids, size_ids = {}, {}, {}, {}, {}
+
+        for record in records:
+            recipe_id = len(self.recipes)
+            ingredients = tuple(dict.fromkeys(self.normalize(i) for i in record["ingredients"]))
+            recipe = Recipe(
+                id=recipe_id,
+                name=record["name"],
+                ingredients=ingredients,
+                equipment=tuple(e.lower() for e in record.get("equipment", ())),
+                tags=tuple(t.lower() for t in record.get("tags", ())),
+                contains=tuple(self.normalize(c) for c in record.get("contains", ())),
+            )
+            self.recipes.append(recipe)
+            for name in ingredients:
+                ingredient_ids.setdefault(name, []).append(recipe_id)
+            for name in set(ingredients) | set(recipe.contains):
+                term_ids.setdefault(name, []).append(recipe_id)
+            for name in set(recipe.equipment):
+                equipment_ids.setdefault(name, []).append(recipe_id)
+            for name in set(recipe.tags):
+                tag_ids.setdefault(name, []).append(recipe_id)
+            size_ids.setdefault(len(ingredients), []).append(recipe_id)
+
+        count = len(self.recipes)
+        self._all = (1 << count) - 1
+        self._by_ingredient = {name: _bitset(ids, count) for name, ids in ingredient_ids.items()}
+        self._by_equipment = {name: _bitset(ids, count) for name, ids in equipment_ids.items()}
+        self._by_term = {name: _bitset(ids, count) for name, ids in term_ids.items()}
+        self._by_tag = {name: _bitset(ids, count) for name, ids in tag_ids.items()}
+        self._by_size = sorted((size, _bitset(ids, count)) for size, ids in size_ids.items())
+
+        # Recipes each hierarchy term rules out, closure included: one AND-NOT per restriction.
+        # Built members first, so a category ORs its direct members' sets only.
+        self._by_restriction = {}
+        if restrictions is not None:
+            for term in restrictions.bottom_up:
+                bits = self._by_term.get(term, 0)
+                for child in restrictions.children[term]:
+                    bits |= self._by_restriction.get(child, 0)
+                if bits:
+                    self._by_restriction[term] = bits
+
+    def __len__(self):
+        return len(self.recipes)
+
+    def normalize(self, word: str) -> str:
+        """Lowercase lemma of an ingredient or restriction word."""
+        word = word.lower().strip()
+        return self._lemmas.get(word, word)
+
+    def allowed(self, equipment=None, restrictions=None, tags=None) -> int:
+        """
+        Bitset of recipes passing the filters. With `equipment` given (even
+        empty) a recipe qualifies only if it needs nothing outside that list.
+        """
+        allowed = self._all
+        if equipment is not None:
+            have = {e.lower() for e in equipment}
+            for name, bits in self._by_equipment.items():
+                if name not in have:
+                    allowed &= ~bits
+        for term in restrictions or ():
+            term = self.normalize(term)
+            allowed &= ~self._by_restriction.get(term, self._by_term.get(term, 0))
+        for tag in tags or ():
+            allowed &= self._by_tag.get(tag.lower(), 0)
+        return allowed
+
+    def top_k(self, pantry, k: int = 5, equipment=None, restrictions=None, tags=None) -> list:
+        """The k best (Recipe, overlap) pairs for a pantry, best first."""
+        allowed = self.allowed(equipment, restrictions, tags)
+        if not allowed or k <= 0:
+            return []
+
+        # levels[c]: allowed recipes that use at least c pantry ingredients
+        levels = [allowed]
+        for name in dict.fromkeys(self.normalize(item) for item in pantry or ()):
+            posting = self._by_ingredient.get(name, 0) & allowed
+            if not posting:
+                continue
+            levels.append(0)
+            for c in range(len(levels) - 1, 0, -1):
+                levels[c] |= levels[c - 1] & posting
+
+        results = []
+        above = 0
+        for overlap in range(len(levels) - 1, -1, -1):
+            exact = levels[overlap] & ~above
+            above |= exact
+            for _, size_bits in self._by_size:
+                group = exact & size_bits
+                if group:
+                    results.extend((self.recipes[i], overlap) for i in _lowest_ids(group, k - len(results)))
+                    if len(results) == k:
+                        return results
+        return results
@@ -3,20 +3,45 @@ Central routing hub for AI Cooking Assistant responses.
 This module decides which logic module should handle a given prompt.
 """
 
-from typing import Any, Optional, Union, Tuple
-from .ingredient_logic import detect_ingredients
-from .equipment_logic import detect_equipment
+import os
+from itertools import repeat
+from typing import Any, Iterable, List, Optional, Union, Tuple
 from .response_logic import (
     bias_filter,
     _restriction_response,
     _equipment_response,
     _ambiguous_response,
-    contains_equipment,
-    mentions_ingredients,
-    RESTRICTION_PATTERNS,
-    restricted_ingredients
 )
-import re
+from . import instrumentation, scanner, vocabulary
+from .instrumentation import StageTimer
+from .response_cache import MISSING, ResponseCache
+from .router_table import RouterTable, feature_key, render
+from .session_state import SessionState
+
+# Replies are deterministic for a normalized prompt plus the `ingredients` kwarg,
+# so repeated prompts are served from here, each with the PromptAnalysis it was
+# routed from (None for a prompt the bias filter stopped). Set
+# RESPONSE_CACHE_SIZE=0 to disable.
+RESPONSE_CACHE = ResponseCache(
+    maxsize=int(os.getenv("RESPONSE_CACHE_SIZE", "4096")),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL", "300")),
+)
+
+
+def invalidate_response_cache():
+    """Forget cached replies; call after vocabularies or reply templates change."""
+    RESPONSE_CACHE.invalidate()
+
+
+# Cached replies were rendered against the old keyword lists
+vocabulary.on_reload(lambda vocab: invalidate_response_cache())
+
+
+def _cache_key(text_low: str, kwargs: dict):
+    # Session state is not read by the router, so only the prompt and the
+    # explicit ingredients override shape the reply.
+    return text_low, tuple(kwargs.get("ingredients") or ())
+
 
 def generate_response(prompt: str, session: Optional[Any] = None, **kwargs) -> Union[str, Tuple]:
     """
@@ -25,7 +50,8 @@ def generate_response(prompt: str, session: Optional[Any] = None, **kwargs) -> U
 
     Args:
         prompt: User input text
-        session: Optional Flask session for stateful tracking
+        session: Optional Flask session; the equipment, restrictions and ingredients
+            the prompt mentions are merged into its SessionState
         **kwargs: Additional parameters (for backward compatibility with tests)
 
     Returns:
@@ -34,64 +60,150 @@ def generate_response(prompt: str, session: Optional[Any] = None, **kwargs) -> U
     if not prompt or not isinstance(prompt, str):
         return "Please provide some input so I can help you!"
 
+    recorder = instrumentation.RECORDER
+    timer = StageTimer() if recorder is not None else None
+
     text = prompt.strip()
     text_low = text.lower()
+    if not RESPONSE_CACHE.enabled:
+        reply, analysis = _respond(text, text_low, timer, **kwargs)
+    else:
+        key = _cache_key(text_low, kwargs)
+        entry = RESPONSE_CACHE.get(key)
+        if timer is not None:
+            timer.mark("cache_lookup")
+        if entry is MISSING:
+            entry = _respond(text, text_low, timer, **kwargs)
+            RESPONSE_CACHE.put(key, entry)
+        reply, analysis = entry
+
+    if session is not None and analysis is not None:
+        SessionState(session).merge(analysis)
+    if timer is not None:
+        recorder.observe(timer, text)
+    return reply
+
+
+def generate_responses(
+    prompts: Iterable[str], sessions: Optional[Iterable[Any]] = None, **kwargs
+) -> List[Union[str, Tuple]]:
+    """
+    Batch entry point: routes many prompts and returns replies in input order.
+
+    Prompts are normalized once per distinct string and routed once per distinct
+    normalized text, so repeated prompts cost a dict lookup. Detection is not
+    batched: each distinct prompt costs the same as a generate_response call,
+    and since that call's response cache already skips routing for repeats, the
+    batch mainly saves per-call overhead.
+
+    Args:
+        prompts: List or iterator of user input texts
+        sessions: Optional per-prompt sessions, aligned with prompts. Each one gets
+            its prompt's entities merged; routing does not read session state, so
+            identical prompts still share one reply.
+        **kwargs: Applied to every prompt, as in generate_response
+
+    Returns:
+        List of responses, one per prompt
 
+    Raises:
+        ValueError: if sessions is given and its length differs from prompts
+    """
+    by_prompt = {}  # prompt -> (reply, analysis)
+    by_text = {}
+    results = []
+    if sessions is None:
+        pairs = zip(prompts, repeat(None))
+    else:
+        # A missing or extra session is a caller bug, not a shorter batch
+        pairs = zip(prompts, sessions, strict=True)
+    for prompt, session in pairs:
+        if not prompt or not isinstance(prompt, str):
+            results.append(generate_response(prompt, session, **kwargs))
+            continue
+
+        entry = by_prompt.get(prompt)
+        if entry is None:
+            text = prompt.strip()
+            text_low = text.lower()
+            entry = by_text.get(text_low)
+            if entry is None:
+                entry = by_text[text_low] = _respond(text, text_low, None, **kwargs)
+            by_prompt[prompt] = entry
+        reply, analysis = entry
+        if session is not None and analysis is not None:
+            SessionState(session).merge(analysis)
+        results.append(reply)
+    return results
+
+
+def _respond(text: str, text_low: str, timer: Optional[StageTimer] = None, **kwargs) -> Tuple[Any, Any]:
+    """
+    Bias check, detection and routing for an already-normalized prompt.
+    Returns (reply, analysis); analysis is None when the bias filter stopped the
+    prompt, so nothing from it reaches a session.
+    """
     # 1. Check for bias/sensitive content first
     safe, original, bias_msg = bias_filter(text)
+    if timer is not None:
+        timer.mark("bias_filter")
     if not safe:
         # Return just the message string (some tests expect string, some expect tuple)
         # Tests that need tuple format will handle tuple unpacking themselves
-        return bias_msg
-
-    # 2. Check for dietary restrictions
-    restriction_detected = False
-    for canon, patterns in RESTRICTION_PATTERNS.items():
-        for pat in patterns:
-            if re.search(pat, text_low):
-                restriction_detected = True
-                break
-        if restriction_detected:
-            break
-
-    # Also check simple word matches for restrictions
-    if not restriction_detected:
-        for r in restricted_ingredients:
-            if r in text_low:
-                restriction_detected = True
-                break
-
-    # 3. Check for equipment-based queries
-    equipment_detected = contains_equipment(text_low)
-
-    # 4. Check for ingredient-based queries
-    ingredient_detected = mentions_ingredients(text_low) or any(word in text_low for word in ["have", "cook", "using", "recipe"])
-    detected_ingredients = detect_ingredients(text_low)
-
+        return bias_msg, None
+
+    # 2-4. One pass over the prompt collects restriction, equipment and ingredient signals.
+    # The resulting PromptAnalysis is shared by every response helper below.
+    analysis = scanner.SCANNER.scan(text_low, text)
+    if timer is not None:
+        timer.mark("detection")
+
+    # 5. Routing is a table lookup on the detected features; each distinct
+    # feature set is rendered once by _route and reused as a template.
+    key = feature_key(analysis, kwargs)
+    if timer is not None:
+        timer.mark("routing")
+    reply = render(ROUTER.outcome(key, analysis, kwargs), analysis, kwargs)
+    if timer is not None:
+        timer.mark("composition")
+    return reply, analysis
+
+
+def _route(analysis, kwargs) -> str:
+    """Reference branch logic; ROUTER is generated from it."""
     # Handle ambiguous cases first (before multi-axis logic)
-    if any(pattern in text_low for pattern in ["creamy", "traditional", "not sure", "maybe", "ideas"]):
-        ambiguous_result = _ambiguous_response(text)
+    if analysis.ambiguous:
+        ambiguous_result = _ambiguous_response(analysis)
         if ambiguous_result != "Please clarify a bit more so I can suggest the right recipe for your needs.":
             return ambiguous_result
+    return _compose(analysis, kwargs)
+
+
+def _compose(analysis, kwargs) -> str:
+    """Pick and render the reply for a prompt that was not caught as ambiguous."""
+    restriction_detected = bool(analysis.restrictions)
+    equipment_detected = bool(analysis.equipment)
+    ingredient_detected = analysis.ingredient_marker
+    detected_ingredients = analysis.ingredients
 
     # Handle multi-axis queries (equipment + restriction, equipment + ingredients, etc.)
     if equipment_detected and restriction_detected:
         # Combine responses for equipment + restriction
-        equip_resp = _equipment_response(text)
-        restrict_resp = _restriction_response(text)
+        equip_resp = _equipment_response(analysis)
+        restrict_resp = _restriction_response(analysis)
         return f"{equip_resp} {restrict_resp}"
 
     if equipment_detected and detected_ingredients:
         # Equipment + ingredients
         ing_str = ", ".join(detected_ingredients) if detected_ingredients else "your ingredients"
-        return _equipment_response(text).replace("here's a recipe suggestion", f"here's a recipe using {ing_str}")
+        return _equipment_response(analysis).replace("here's a recipe suggestion", f"here's a recipe using {ing_str}")
 
     # Single-axis responses
     if restriction_detected:
-        return _restriction_response(text)
+        return _restriction_response(analysis)
 
     if equipment_detected:
-        return _equipment_response(text)
+        return _equipment_response(analysis)
 
     if ingredient_detected:
         ingredients = kwargs.get('ingredients', [])
@@ -106,8 +218,14 @@ def generate_response(prompt: str, session: Optional[Any] = None, **kwargs) -> U
             return "What ingredients do you have? I can suggest some ideas!"
 
     # 5. Handle unclear queries with "help" or "suggest"
-    if any(word in text_low for word in ["help", "suggest"]) and not ingredient_detected:
+    if analysis.help and not ingredient_detected:
         return "I can suggest meal ideas! Tell me what ingredients you have, what equipment you're using, or any dietary restrictions."
 
     # 6. Default fallback
-    return _ambiguous_response(text)
+    return _ambiguous_response(analysis)
+
+
+ROUTER = RouterTable(_route)
+
+# Cue bit positions follow the vocabulary, so stored outcomes go stale with it
+vocabulary.on_reload(lambda vocab: ROUTER.clear())
@@ -7,43 +7,32 @@ No Flask imports, no routing, no circular dependencies.
 
 
 import re
-from ai_app.response_logic import bias_filter
-from ai_app.response_logic import detect_ingredients
-from ai_app.response_logic import detect_equipment
+from ai_app.response_logic.bias_logic import bias_filter
+from ai_app.response_logic.ingredient_logic import detect_ingredients
+from ai_app.response_logic.equipment_logic import detect_equipment
 from ai_app.response_logic.meal_suggestion_logic import suggest_meal
+from ai_app.response_logic import tokenizer
+from ai_app.response_logic.debug_log import get_log
+from ai_app.response_logic.fuzzy_matcher import correct_words
+from ai_app.response_logic.vocabulary import get_vocabulary
 import os
 from datetime import datetime
 
 
 # --- Global Data ---
-restricted_ingredients = [
-    "flour", "sugar", "turkey", "coconut", "maple syrup", "gelatin", "nuts",
-    "pork", "bacon", "ham", "alcohol", "shellfish", "honey", "dairy", "gluten"
-]
+# Keyword lists live in data/*.json and are compiled by the vocabulary registry.
+# These names are kept as snapshots for callers that import them directly;
+# detectors below always read the registry so a reload reaches them.
+_VOCAB = get_vocabulary()
+
+_log = get_log("extraction")
+
+restricted_ingredients = list(_VOCAB.lists["restricted_ingredients"])
 
 # Synonym / restriction patterns
-RESTRICTION_PATTERNS = {
-    "dairy": [r"\bno\s*dairy\b", r"lactose\s*intolerant", r"dairy[- ]?free"],
-    "gluten": [r"\bno\s*gluten\b", r"gluten[- ]?free"],
-    "shellfish": [r"\bno\s*shellfish\b", r"allergic\s*to\s*shellfish"],
-    "honey": [r"\bno\s*honey\b", r"without\s*honey"],
-    "pork": [r"\bno\s*pork\b", r"avoid\s*pork"],
-    "nuts": [r"\bno\s*nuts?\b", r"nut[- ]?free"],
-    "sugar": [r"\bno\s*sugar\b", r"sugar[- ]?free"],
-}
+RESTRICTION_PATTERNS = _VOCAB.maps["restriction_patterns"]
 
-EQUIPMENT_VARIANTS = {
-    "instant pot": [r"\binstant\s*pot\b", r"\binsta\s*pot\b", r"\bpressure\s*cooker\b"],
-    "wok": [r"\bwok\b"],
-    "cast iron": [r"\bcast[- ]?iron\b", r"\bskillet\b"],
-    "oven": [r"\boven\b"],
-    "stove": [r"\bstove\b", r"\bstovetop\b"],
-    "grill": [r"\bgrill\b"],
-    "pyrex glass bakeware": [r"\bpyrex\b", r"\bglass\s*bakeware\b"],
-    "slow cooker": [r"\bslow\s*cooker\b", r"\bcrock\s*pot\b", r"\bcrockpot\b"],
-    "air fryer": [r"\bair\s*fryer\b"],
-    "microwave": [r"\bmicrowave\b"],
-}
+EQUIPMENT_VARIANTS = _VOCAB.maps["equipment_variants"]
 
 # --- Helpers ---
 def _dedupe(seq):
@@ -57,67 +46,95 @@ def _dedupe(seq):
     return out
 
 def _detect_equipment(text_low):
-    return [canon for canon, patterns in EQUIPMENT_VARIANTS.items()
+    return [canon for canon, patterns in get_vocabulary().maps["equipment_variants"].items()
             if any(re.search(p, text_low) for p in patterns)]
 
 def _detect_restrictions(text_low):
+    vocab = get_vocabulary()
     matches = []
-    for canon, patterns in RESTRICTION_PATTERNS.items():
+    for canon, patterns in vocab.maps["restriction_patterns"].items():
         for pat in patterns:
             if re.search(pat, text_low):
                 matches.append(canon)
                 break
     # also catch simple word matches
-    for r in restricted_ingredients:
+    for r in vocab.lists["restricted_ingredients"]:
         if r in text_low and r not in matches:
             matches.append(r)
     return matches
 
+# Words that signal the user is talking about food they have or want to cook
+INGREDIENT_MARKERS = list(_VOCAB.lists["ingredient_markers"])
+
+# Equipment mentions that route a prompt to the equipment responses
+EQUIPMENT_MENTIONS = list(_VOCAB.lists["equipment_mentions"])
+
+# Reply tables for the response helpers, checked in order
+RESTRICTION_REPLIES = {
+    "peanut": "Here's a safe alternative dinner suggestion without that allergen.",
+    "nuts": "Here's a nut-free recipe suggestion.",
+    "dairy": "To avoid lactose, use almond or oat milk as a substitute for creamy dishes.",
+    "gluten": "Avoid gluten — try rice, corn, or quinoa alternatives for bread-based dishes.",
+    "shellfish": "Here's a chicken or veggie alternative instead.",
+    "pork": "I suggest avoiding restricted meats — here's a healthy alternative dinner idea with other protein options.",
+    "beef": "Here's a recipe using chicken, fish, or plant-based alternatives.",
+    "sugar": "Avoid added sugar — try a fruit-based dessert as a low-sugar alternative instead.",
+    "honey": "Try maple syrup or agave as a substitute."
+}
+
+EQUIPMENT_REPLIES = {
+    "instant pot": "You can cook this quickly in your Instant Pot — here’s a recipe suggestion.",
+    "slow cooker": "Try a slow cooker version — cook on low for 6–8 hours.",
+    "oven": "You can bake this in the oven — here’s a step-by-step recipe.",
+    "stovetop": "You can cook this dish on the stovetop — sauté or simmer for best results.",
+    "grill": "You can grill this recipe — brush with oil and cook evenly.",
+    "air fryer": "Try an air fryer version for a crisp finish.",
+    "wok": "Cook this in your wok — a quick stir-fry will work beautifully.",
+    "microwave": "You can make a quick microwave recipe — use safe containers and short intervals."
+}
+
+# Words _ambiguous_response looks for (reply keys and cues must also be listed
+# under "response_cues" in data/markers.json so the scanner reports them)
+AMBIGUITY_CUES = ["traditional", "bias", "carb", "dessert", "sugar", "creamy", "dairy", "lactose"]
+
 INGR_AFTER_KEYWORDS = re.compile(r"\b(have|cook|with|make|using|got)\s+(.*)", re.IGNORECASE)
 
 
 def contains_equipment(text: str) -> bool:
-    equipment_keywords = [
-        "instant pot", "slow cooker", "oven", "stovetop", "grill", "air fryer", "wok", "microwave"
-    ]
-    return any(eq in text for eq in equipment_keywords)
+    return get_vocabulary().automaton("extract_equipment").contains_any(text)
 
 
 def extract_equipment(text: str):
-    equipment_keywords = [
-        "instant pot", "slow cooker", "oven", "stovetop", "grill", "air fryer", "wok", "microwave"
-    ]
-    return [eq for eq in equipment_keywords if eq in text]
+    return get_vocabulary().automaton("extract_equipment").find_all(text)
 
 
 def mentions_ingredients(text: str) -> bool:
     # check for food-related words
-    ingredient_markers = ["have", "with", "cook", "make", "recipe", "dish", "using"]
-    return any(word in text for word in ingredient_markers)
+    return any(word in text for word in get_vocabulary().lists["ingredient_markers"])
 
 
 
 def extract_ingredients(text: str, provided=None):
     clean_text = text.lower()
-    tokens = re.findall(r'\b\w+\b', clean_text)
+    tokens = tokenizer.words(clean_text)
+    debug = _log.enabled()
 
-    # 👇 Optional: print tokens for debug
-    print("[DEBUG] Tokens:", tokens)
+    if debug:
+        _log.event("tokens", tokens=list(tokens))
 
-    known_ingredients = [
-        "chicken", "beef", "pork", "fish", "rice", "beans", "potato", "carrot",
-        "lemon", "parsley", "garlic", "sugar", "coconut", "bread", "egg", "fruit",
-        "vegetable", "pepper", "onion", "tomato"
-    ]
+    vocab = get_vocabulary()
+    lemmas = vocab.lemmas
 
-    singularized = [t[:-1] if t.endswith("s") else t for t in tokens]
+    singularized = [lemmas.get(t, t) for t in tokens]
 
-    # 👇 Optional: print singularized tokens for debug
-    print("[DEBUG] Singularized:", singularized)
+    if debug:
+        _log.event("singularized", tokens=singularized)
 
-    extracted = [item for item in known_ingredients if item in singularized]
+    found = set(singularized)
+    extracted = [item for item in vocab.lists["known_ingredients"] if lemmas.get(item, item) in found]
 
-    print("[DEBUG][EXTRACTED INGREDIENTS]:", extracted)
+    if debug:
+        _log.event("extracted_ingredients", ingredients=extracted)
 
     if provided:
         extracted.extend(provided)
@@ -130,45 +147,28 @@ def extract_ingredients(text: str, provided=None):
 # --- Restriction Helpers ---
 def contains_restriction(text: str) -> bool:
     """Detect if the user prompt includes dietary or religious restrictions."""
-    restrictions = [
-        "no ", "without ", "avoid ", "allergic", "can’t eat", "cannot eat",
-        "intolerant", "kosher", "halal", "vegan", "vegetarian", "gluten free",
-        "lactose free", "no pork", "no beef"
-    ]
-    return any(word in text.lower() for word in restrictions)
+    return get_vocabulary().automaton("restriction_markers").contains_any(text.lower())
 
 
 def extract_restrictions(text: str):
     """Extract key restricted ingredients or categories from the prompt."""
-    text_low = text.lower()
-    restricted_terms = []
-    known_restrictions = [
-        "pork", "beef", "shellfish", "dairy", "gluten", "nuts",
-        "sugar", "honey", "alcohol"
-    ]
-    for item in known_restrictions:
-        if item in text_low:
-            restricted_terms.append(item)
-    return restricted_terms or ["restricted items"]
+    return get_vocabulary().automaton("restriction_terms").find_all(text.lower()) or ["restricted items"]
 
 # --- Equipment Helper ---
 def contains_equipment(text: str) -> bool:
     """Detect cooking equipment keywords in the prompt."""
-    equipment_keywords = [
-        "instant pot", "slow cooker", "air fryer", "oven", "stovetop", "wok",
-        "microwave", "grill", "toaster", "pressure cooker"
-    ]
-    return any(eq in text.lower() for eq in equipment_keywords)
+    return get_vocabulary().automaton("equipment_mentions").contains_any(text.lower())
 
 
 def _detect_ingredients(prompt: str) -> list[str]:
     """Extract potential ingredients from the prompt."""
-    words = prompt.lower().replace("?", "").split()
-    common_ingredients = [
-        "chicken", "beef", "fish", "rice", "potato", "garlic", "lemon",
-        "parsley", "egg", "bean", "bread", "vegetable", "fruit"
+    # Whole whitespace-separated words only, once question marks are dropped
+    text_low = prompt.lower().replace("?", "")
+    common_ingredients = get_vocabulary().lists["simple_ingredients"]
+    return [
+        word for start, end, word in tokenizer.token_spans(text_low)
+        if word in common_ingredients and tokenizer.is_bare(text_low, start, end)
     ]
-    return [word for word in words if word in common_ingredients]
 
     parts = re.split(r",|\band\b", tail)
     return [p.strip().lower() for p in parts if p.strip().lower() not in ["i", "have", "cook", "make", "using"]]
@@ -179,35 +179,32 @@ def parse_input_list(text: str) -> list[str]:
     Example: "I have chicken, garlic and lemon" ➝ ["chicken", "garlic", "lemon"]
     """
     text = text.lower()
-    tail = ""
+    spans = tokenizer.token_spans(text)
 
-    # Look for common start phrases
+    # Look for common start phrases; the list is the rest of that line
+    lo, hi = 0, len(text)
     match = INGR_AFTER_KEYWORDS.search(text)
     if match:
-        tail = match.group(2)
-    else:
-        tail = text
-
-    parts = re.split(r",|\band\b", tail)
+        lo, hi = match.span(2)
+
+    # Split on commas and on the word "and", reusing the prompt's word spans
+    cuts = [lo]
+    for start, end, word in spans:
+        if start >= lo and end <= hi and word == "and":
+            cuts.extend((start, end))
+    cuts.append(hi)
+
+    parts = []
+    for i in range(0, len(cuts), 2):
+        parts.extend(text[cuts[i]:cuts[i + 1]].split(","))
     return [p.strip() for p in parts if p.strip() and p.strip() not in {"i", "have", "cook", "make", "using"}]
 
 
 def _choose_dish(equipment, ingredients, mood_cozy=False):
-    eq = set(equipment)
-    ings = set(ingredients)
-    if "instant pot" in eq and "chicken" in ings and ("potato" in ings or "carrot" in ings):
-        return "stew"
-    if "wok" in eq:
-        return "stir-fry"
-    if "oven" in eq:
-        return "bake" if "vegetables" in ings else "roast"
-    if "grill" in eq:
-        return "grilled dish"
-    if "air fryer" in eq:
-        return "air fried meal"
-    if "microwave" in eq:
-        return "microwave snack"
-    return "stew" if mood_cozy else "soup"
+    # Rules: the "quick_dish" table in data/dish_rules.json
+    return get_vocabulary().rules.evaluate(
+        "quick_dish", equipment=equipment, ingredients=ingredients, mood=("cozy",) if mood_cozy else None,
+    )
 
 # --- Main Function ---
 # File: generate_html_test_report.py
@@ -285,41 +282,28 @@ def smart_parse_input(prompt: str):
     """Extract ingredients, equipment, and restrictions from natural prompts."""
     text = prompt.lower()
 
-    # --- Ingredient matching (simple list + fuzzy variants) ---
-    known_ingredients = [
-        "chicken", "beef", "pork", "fish", "salmon", "shrimp",
-        "rice", "potato", "carrot", "onion", "garlic", "lemon", "pepper",
-        "tomato", "beans", "egg", "cheese", "spinach", "mushroom", "broccoli"
-    ]
-    fuzzy_aliases = {"lemins": "lemon", "lemons": "lemon", "peppers": "pepper", "potatoes": "potato"}
-
-    ingredients = []
-    for word in text.split():
-        word_clean = re.sub(r"[^a-z]", "", word)
-        if word_clean in known_ingredients:
-            ingredients.append(word_clean)
-        elif word_clean in fuzzy_aliases:
-            ingredients.append(fuzzy_aliases[word_clean])
+    # --- Ingredient matching (simple list + known misspellings) ---
+    vocab = get_vocabulary()
+    ingredient_hits = list(vocab.automaton("smart_ingredients").iter_matches(text))
 
     # --- Equipment matching ---
-    known_equipment = ["instant pot", "oven", "stovetop", "microwave", "wok", "air fryer", "slow cooker", "grill"]
-    equipment = [eq for eq in known_equipment if eq in text]
+    equipment = vocab.automaton("smart_equipment").find_all(text)
 
     # --- Restrictions / dietary hints ---
-    restriction_keywords = {
-        "dairy": ["no dairy", "dairy free", "lactose", "milk", "cheese"],
-        "gluten": ["gluten free", "no gluten", "no bread", "no wheat"],
-        "sugar": ["sugar free", "no sugar", "low sugar"],
-        "pork": ["no pork", "avoid pork", "halal"],
-        "vegan": ["vegan", "plant based"],
-        "vegetarian": ["vegetarian"],
-    }
-
-    restrictions = []
-    for key, variants in restriction_keywords.items():
-        if any(v in text for v in variants):
-            restrictions.append(key)
-
+    restrictions = vocab.automaton("smart_restrictions").find_all(text)
+
+    # --- Typos: longer words none of the matchers above recognised ---
+    exact = (vocab.automaton("smart_ingredients"), vocab.automaton("smart_equipment"),
+             vocab.automaton("smart_restrictions"))
+    typos = correct_words(text, vocab.fuzzy_matcher("smart_ingredients"), exact)
+    if typos:
+        ingredient_hits = sorted(ingredient_hits + typos)
+    corrected = {(start, end) for start, end, _ in typos}
+    for start, end, name in correct_words(text, vocab.fuzzy_matcher("smart_equipment"), exact):
+        if (start, end) not in corrected and name not in equipment:
+            equipment.append(name)
+
+    ingredients = [name for _, _, name in ingredient_hits]
     return ingredients, equipment, restrictions
 
 
@@ -388,56 +372,38 @@ def contains_bias_or_sensitive(text: str) -> bool:
     return not safe
 
 # --- Enhanced Helper Functions for Test Coverage ---
+# Helpers take the request's PromptAnalysis and only test membership in
+# analysis.terms; every key below is part of the scanner vocabulary.
 
-def _restriction_response(prompt: str) -> str:
+def _restriction_response(analysis) -> str:
     """Return a response when a dietary restriction is detected."""
-    restriction_keywords = {
-        "peanut": "Here's a safe alternative dinner suggestion without that allergen.",
-        "nuts": "Here's a nut-free recipe suggestion.",
-        "dairy": "To avoid lactose, use almond or oat milk as a substitute for creamy dishes.",
-        "gluten": "Avoid gluten — try rice, corn, or quinoa alternatives for bread-based dishes.",
-        "shellfish": "Here's a chicken or veggie alternative instead.",
-        "pork": "I suggest avoiding restricted meats — here's a healthy alternative dinner idea with other protein options.",
-        "beef": "Here's a recipe using chicken, fish, or plant-based alternatives.",
-        "sugar": "Avoid added sugar — try a fruit-based dessert as a low-sugar alternative instead.",
-        "honey": "Try maple syrup or agave as a substitute."
-    }
-
-    for key, message in restriction_keywords.items():
-        if key in prompt.lower():
+    terms = analysis.terms
+    for key, message in RESTRICTION_REPLIES.items():
+        if key in terms:
             return message
 
     return "This recipe avoids restricted ingredients and respects your dietary needs."
 
 
-def _equipment_response(prompt: str) -> str:
+def _equipment_response(analysis) -> str:
     """Return a response when specific cooking equipment or method is mentioned."""
-    equipment_map = {
-        "instant pot": "You can cook this quickly in your Instant Pot — here’s a recipe suggestion.",
-        "slow cooker": "Try a slow cooker version — cook on low for 6–8 hours.",
-        "oven": "You can bake this in the oven — here’s a step-by-step recipe.",
-        "stovetop": "You can cook this dish on the stovetop — sauté or simmer for best results.",
-        "grill": "You can grill this recipe — brush with oil and cook evenly.",
-        "air fryer": "Try an air fryer version for a crisp finish.",
-        "wok": "Cook this in your wok — a quick stir-fry will work beautifully.",
-        "microwave": "You can make a quick microwave recipe — use safe containers and short intervals."
-    }
-
-    for equip, response in equipment_map.items():
-        if equip in prompt.lower():
+    terms = analysis.terms
+    for equip, response in EQUIPMENT_REPLIES.items():
+        if equip in terms:
             return response
 
     return "Use your available cooking tools to prepare this recipe safely and easily."
 
 
-def _ambiguous_response(prompt: str) -> str:
+def _ambiguous_response(analysis) -> str:
     """Handle unclear or conflicting instructions."""
-    if "traditional" in prompt.lower() or "bias" in prompt.lower():
+    terms = analysis.terms
+    if "traditional" in terms or "bias" in terms:
         return "Let's keep things fair and flavor-focused — I can suggest several options. Please clarify your preference so I can provide a suitable recipe."
-    if "carb" in prompt.lower():
+    if "carb" in terms:
         return "Would you like me to clarify options? Here's a protein and veggie-focused idea for a low-carb meal — I can suggest specific recipes."
-    if "dessert" in prompt.lower() and "sugar" in prompt.lower():
+    if "dessert" in terms and "sugar" in terms:
         return "Avoid added sugar — try a fruit-based dessert with natural sweetness instead. I can suggest some ideas."
-    if "creamy" in prompt.lower() and ("dairy" in prompt.lower() or "lactose" in prompt.lower()):
+    if "creamy" in terms and ("dairy" in terms or "lactose" in terms):
         return "For creamy textures without dairy, use coconut milk or cashew cream as substitutes — here are some recipe ideas."
     return "Please clarify a bit more so I can suggest the right recipe for your needs."
@@ -0,0 +1,122 @@
+"""
+restriction_index.py
+--------------------
+Dietary restriction and allergen hierarchy as precomputed bitsets.
+
+data/restrictions.json maps each category to its direct members, which may be
+categories themselves ("vegan" -> "vegetarian" -> "meat" -> "pork" ->
+"bacon"). Every term in the hierarchy gets one bit, and each term's closure
+(itself plus everything below it) is stored as an int bitset, so applying any
+set of restrictions is an OR of their closures and filtering a set of terms
+is one AND-NOT:
+
+    allowed = index.bits(ingredients) & ~index.excluded(restrictions)
+
+Terms are normalized with the vocabulary's lemma table ("eggs" -> "egg").
+A restriction outside the hierarchy only excludes itself.
+"""
+
+
+class RestrictionIndex:
+    """
+    Transitive closure of `hierarchy` ({category: [member, ...]}) over one bit
+    per term. At most `memo_size` restriction combinations are remembered.
+    """
+
+    def __init__(self, hierarchy: dict, lemmas: dict = None, memo_size: int = 1024):
+        self._lemmas = lemmas or {}
+        self.memo_size = memo_size
+        self._memo = {}
+
+        children = {}
+        for category, members in hierarchy.items():
+            kids = children.setdefault(self.normalize(category), [])
+            for member in members:
+                kids.append(self.normalize(member))
+                children.setdefault(self.normalize(member), [])
+
+        self.terms = list(children)
+        self.children = children
+        # Every term after all of its members, for building per-term data bottom-up
+        self.bottom_up = []
+        self._bit = {term: 1 << i for i, term in enumerate(self.terms)}
+        self._closure = {}
+        for term in self.terms:
+            self._close(term, ())
+
+    def _close(self, term: str, path: tuple) -> int:
+        bits = self._closure.get(term)
+        if bits is not None:
+            return bits
+        if term in path:
+            raise ValueError(f"Restriction hierarchy has a cycle: {' -> '.join(path + (term,))}")
+        bits = self._bit[term]
+        for child in self.children[term]:
+            bits |= self._close(child, path + (term,))
+        self._closure[term] = bits
+        self.bottom_up.append(term)
+        return bits
+
+    def __contains__(self, term: str):
+        return self.normalize(term) in self._bit
+
+    def normalize(self, word: str) -> str:
+        """Lowercase lemma of a restriction or ingredient word."""
+        word = word.lower().strip()
+        return self._lemmas.get(word, word)
+
+    def bits(self, terms) -> int:
+        """Bitset of the hierarchy terms among `terms` (other words have no bit)."""
+        bits = 0
+        bit = self._bit
+        for term in terms or ():
+            bits |= bit.get(self.normalize(term), 0)
+        return bits
+
+    def excluded(self, restrictions) -> int:
+        """Bitset of every term the restrictions rule out, closure included."""
+        key = tuple(restrictions or ())
+        bits = self._memo.get(key)
+        if bits is None:
+            bits = 0
+            for restriction in key:
+                bits |= self._closure.get(self.normalize(restriction), 0)
+            if len(self._memo) < self.memo_size:
+                self._memo[key] = bits
+        return bits
+
+    def expand(self, restrictions) -> list:
+        """Every term the restrictions rule out, in hierarchy order, plus those outside it."""
+        excluded = self.excluded(restrictions)
+        expanded = []
+        while excluded:
+            low = excluded & -excluded
+            expanded.append(self.terms[low.bit_length() - 1])
+            excluded ^= low
+        for restriction in restrictions or ():
+            term = self.normalize(restriction)
+            if term not in self._bit and term not in expanded:
+                expanded.append(term)
+        return expanded
+
+    def is_excluded(self, term: str, restrictions) -> bool:
+        """Whether `restrictions` rule out `term`."""
+        term = self.normalize(term)
+        bit = self._bit.get(term)
+        if bit is not None:
+            return bool(bit & self.excluded(restrictions))
+        return any(self.normalize(r) == term for r in restrictions or ())
+
+    def filter(self, ingredients, restrictions) -> list:
+        """`ingredients` without the ones `restrictions` rule out."""
+        if not restrictions:
+            return list(ingredients or ())
+        excluded = self.excluded(restrictions)
+        outside = {self.normalize(r) for r in restrictions if self.normalize(r) not in self._bit}
+        kept = []
+        for item in ingredients or ():
+            term = self.normalize(item)
+            bit = self._bit.get(term)
+            if not (bit & excluded if bit is not None else term in outside):
+                kept.append(item)
+        return kept
@@ -0,0 +1,128 @@
+"""
+router_table.py
+---------------
+Lookup-table form of the hub's routing branches.
+
+A reply depends only on a few features of a PromptAnalysis: which detector
+lists are non-empty, the ambiguity/help markers, whether an `ingredients`
+override was passed, and which response-cue words the scanner saw (the words
+the response helpers test for). These are packed into one integer key. The
+reply for a key is rendered once by the hub's own branch logic and reused, so a
+request costs feature extraction plus a table lookup.
+
+Ingredient lists are the only request-specific text in a reply. Outcomes are
+rendered with sentinel ingredient names and split on them, and the real list is
+joined back in at lookup time. Outcomes without ingredient text are stored as
+the finished reply string.
+"""
+
+import threading
+
+from .prompt_analysis import PromptAnalysis
+
+# Feature flags (low bits of the table key; cue bits sit above them)
+RESTRICTED = 1
+EQUIPMENT = 2
+MARKER = 4
+INGREDIENTS = 8
+AMBIGUOUS = 16
+HELP = 32
+KWARG_INGREDIENTS = 64
+_CUE_SHIFT = 7
+
+# Placeholders that cannot occur in a normalized prompt
+_DETECTED = "\x00detected\x00"
+_OVERRIDE = "\x00override\x00"
+
+_TEMPLATE_DETECTED, _TEMPLATE_OVERRIDE = 1, 2
+
+
+def feature_key(analysis: PromptAnalysis, kwargs: dict) -> int:
+    """Pack the routing features of a request into a table key."""
+    flags = analysis.cues << _CUE_SHIFT
+    if analysis.restrictions:
+        flags |= RESTRICTED
+    if analysis.equipment:
+        flags |= EQUIPMENT
+    if analysis.ingredient_marker:
+        flags |= MARKER
+    if analysis.ingredients:
+        flags |= INGREDIENTS
+    if analysis.ambiguous:
+        flags |= AMBIGUOUS
+    if analysis.help:
+        flags |= HELP
+    if kwargs and kwargs.get("ingredients"):
+        flags |= KWARG_INGREDIENTS
+    return flags
+
+
+def render(outcome, analysis: PromptAnalysis, kwargs: dict) -> str:
+    """Turn a stored outcome back into the reply for this request."""
+    if outcome.__class__ is str:
+        return outcome
+    parts, source = outcome
+    items = analysis.ingredients if source == _TEMPLATE_DETECTED else kwargs["ingredients"]
+    return ", ".join(items).join(parts)
+
+
+class RouterTable:
+    """
+    Outcomes of a branch-logic `route(analysis, kwargs)`, keyed by feature_key().
+
+    `route` may read only the fields feature_key() packs, plus analysis.terms
+    restricted to the scanner's response-cue words. At most `maxsize` keys are
+    stored; past that, new keys are routed directly without being remembered.
+    """
+
+    def __init__(self, route, maxsize: int = 65536):
+        self._route = route
+        self.maxsize = maxsize
+        self._table = {}
+        # Distinct replies, so keys with the same outcome share one object
+        self._outcomes = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._table)
+
+    @property
+    def distinct_outcomes(self) -> int:
+        return len(self._outcomes)
+
+    def outcome(self, key: int, analysis: PromptAnalysis, kwargs: dict):
+        """Stored outcome for `key`, rendering it from `analysis` on first use."""
+        outcome = self._table.get(key)
+        if outcome is None:
+            outcome = self._render(analysis, kwargs)
+            with self._lock:
+                outcome = self._outcomes.setdefault(outcome, outcome)
+                if len(self._table) < self.maxsize:
+                    self._table[key] = outcome
+        return outcome
+
+    def lookup(self, analysis: PromptAnalysis, kwargs: dict) -> str:
+        """Reply for a request, as the branch logic would produce it."""
+        return render(self.outcome(feature_key(analysis, kwargs), analysis, kwargs), analysis, kwargs)
+
+    def clear(self):
+        """Forget every outcome, e.g. after the vocabulary (and cue bits) change."""
+        with self._lock:
+            self._table.clear()
+            self._outcomes.clear()
+
+    def _render(self, analysis, kwargs):
+        shadow = PromptAnalysis(
+            analysis.text, analysis.text_low, analysis.terms, analysis.restrictions,
+            analysis.equipment, [_DETECTED] if analysis.ingredients else [],
+            analysis.ingredient_marker, analysis.ambiguous, analysis.help, analysis.cues,
+        )
+        reply = self._route(shadow, {"ingredients": [_OVERRIDE]} if kwargs and kwargs.get("ingredients") else {})
+        detected, override = _DETECTED in reply, _OVERRIDE in reply
+        if detected and override:
+            raise ValueError("A routing outcome may interpolate only one ingredient list")
+        if detected:
+            return tuple(reply.split(_DETECTED)), _TEMPLATE_DETECTED
+        if override:
+            return tuple(reply.split(_OVERRIDE)), _TEMPLATE_OVERRIDE
+        return reply
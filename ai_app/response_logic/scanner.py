@@ -0,0 +1,96 @@
+"""
+scanner.py
+----------
+Precompiled single-pass intent scanner used by the response hub.
+
+Every keyword the router cares about is folded into one shared keyword
+automaton in the vocabulary index. A prompt is walked once and all routing
+signals come back together in a PromptAnalysis, instead of rescanning the text
+per detector.
+"""
+
+import re
+
+from . import vocabulary
+from .prompt_analysis import PromptAnalysis
+from .vocabulary import AMBIGUOUS, ANCHOR, CUE_SHIFT, EQUIPMENT, HELP, INGREDIENT, MARKER, RESTRICTED
+
+
+class IntentScanner:
+    """Single-pass matcher over the router vocabularies."""
+
+    def __init__(self, compiled: dict):
+        self._flags = compiled["flags"]
+        self._order = compiled["order"]
+        self._anchored = compiled["anchored"]
+        self._unanchored = compiled["unanchored"]
+        self._canon_order = compiled["canon_order"]
+        self._automaton = compiled["automaton"]
+        self._patterns = {}
+
+    def _search(self, pattern: str, text_low: str):
+        compiled = self._patterns.get(pattern)
+        if compiled is None:
+            compiled = self._patterns[pattern] = re.compile(pattern)
+        return compiled.search(text_low)
+
+    def scan(self, text_low: str, text: str = None) -> PromptAnalysis:
+        """Walk `text_low` once and collect every routing signal."""
+        flags = self._flags
+        hits = self._automaton.matched_terms(text_low)
+        seen = 0
+        for term in hits:
+            seen |= flags[term]
+
+        canons = set()
+        if seen & ANCHOR:
+            for term in hits:
+                for canon, pattern in self._anchored.get(term, ()):
+                    if canon not in canons and self._search(pattern, text_low):
+                        canons.add(canon)
+        for canon, pattern in self._unanchored:
+            if canon not in canons and self._search(pattern, text_low):
+                canons.add(canon)
+
+        restrictions = sorted(canons, key=self._canon_order.__getitem__)
+        if seen & RESTRICTED:
+            restrictions += self._collect(hits, RESTRICTED, skip=canons)
+
+        return PromptAnalysis(
+            text=text_low if text is None else text,
+            text_low=text_low,
+            terms=hits,
+            restrictions=restrictions,
+            equipment=self._collect(hits, EQUIPMENT) if seen & EQUIPMENT else [],
+            ingredients=self._collect(hits, INGREDIENT) if seen & INGREDIENT else [],
+            ingredient_marker=bool(seen & MARKER),
+            ambiguous=bool(seen & AMBIGUOUS),
+            help=bool(seen & HELP),
+            cues=seen >> CUE_SHIFT,
+            canons=canons,
+        )
+
+    def _collect(self, hits, flag, skip=()):
+        order = self._order[flag]
+        return sorted((t for t in hits if t in order and t not in skip), key=order.__getitem__)
+
+
+# Shared by every request; swapped when the vocabulary is reloaded
+SCANNER = IntentScanner(vocabulary.get_vocabulary().scanner)
+
+
+@vocabulary.on_reload
+def _rebuild_scanner(vocab):
+    global SCANNER
+    SCANNER = IntentScanner(vocab.scanner)
+
+
+def scan_prompt(text_low: str) -> PromptAnalysis:
+    """Scan an already-lowercased prompt with the shared scanner."""
+    return SCANNER.scan(text_low)
+
+
+def analyze_prompt(text: str) -> PromptAnalysis:
+    """Normalize `text` once and scan it."""
+    text = text.strip()
+    return SCANNER.scan(text.lower(), text)
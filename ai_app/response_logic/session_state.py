@@ -0,0 +1,229 @@
+"""
+session_state.py
+----------------
+Conversation state gathered across turns: the equipment, restrictions and
+ingredients mentioned so far.
+
+Each prompt's PromptAnalysis is merged into three deduplicated lists kept in
+the session in first-mention order. Only what the prompt states about the user
+is merged (see mentions()): terms named as whole words, restrictions only when
+negated or stated by a restriction pattern, and no equipment or ingredients a
+negation reaches ("no beef", "allergic to fish") or a restriction rules out.
+Ingredients are kept as lemmas, so "a potato" and "potatoes" are one entry.
+A version counter in the session moves
+only when a merge adds something new. Text derived from the state (the app's
+plan summary and suggested dish) is cached in the session next to the version
+it was rendered at, so it is rendered again only after the state changes:
+
+    state = SessionState(session)
+    state.observe("I have chicken and an oven")    # True: version 0 -> 1
+    state.observe("what about chicken?")           # False: nothing new
+    plan = state.rendered(render_plan)              # render_plan runs once per version
+"""
+
+import re
+
+from . import scanner, tokenizer, vocabulary
+
+FIELDS = ("equipment", "restrictions", "ingredients")
+
+# Rendered text depends on the vocabulary too; a reload makes earlier renders stale
+_generation = 0
+
+
+@vocabulary.on_reload
+def _invalidate_renders(vocab):
+    global _generation
+    _generation += 1
+
+
+# A negation reaches no further back than clause punctuation or "but"
+_CLAUSE_BREAK = re.compile(r"[.,;:!?()]|\bbut\b")
+
+# (generation, negation cue regex, filler words, {ingredient lemma: words}),
+# rebuilt after a reload
+_rules = None
+
+
+def _tracking_rules():
+    global _rules
+    if _rules is None or _rules[0] != _generation:
+        vocab = vocabulary.get_vocabulary()
+        lists, lemmas = vocab.lists, vocab.lemmas
+        cues = sorted(lists["negation_cues"], key=len, reverse=True)
+        pattern = re.compile(r"\b(?:" + "|".join(map(re.escape, cues)) + r")\b")
+        ingredients = {}
+        for term in lists["common_ingredients"]:
+            words = tuple(lemmas.get(word, word) for word in term.split())
+            ingredients.setdefault(" ".join(words), len(words))
+        _rules = (_generation, pattern, frozenset(lists["negation_fillers"]), ingredients)
+    return _rules[1:]
+
+
+def _negated(text_low: str, start: int, entity_words) -> bool:
+    """Whether a negation cue in the same clause reaches the mention at `start`."""
+    cues, fillers, _ = _tracking_rules()
+    clause = 0
+    for match in _CLAUSE_BREAK.finditer(text_low, 0, start):
+        clause = match.end()
+    cue = None
+    for cue in cues.finditer(text_low, clause, start):
+        pass
+    if cue is None:
+        return False
+    # "no pork and beef", "allergic to fish": only fillers and other mentions in between
+    return all(
+        word in fillers or word in entity_words
+        for _, _, word in tokenizer.iter_spans(text_low[cue.end():start])
+    )
+
+
+def _ingredient_spans(text_low: str, lemmas: dict):
+    """
+    (start, lemma, words) for each whole-word ingredient mention, singular or
+    plural ("a potato", "potatoes" -> "potato"; "soy sauce" -> "soy sauce").
+    """
+    _, _, ingredients = _tracking_rules()
+    spans = tokenizer.token_spans(text_low)
+    found = []
+    i = 0
+    while i < len(spans):
+        start, end, word = spans[i]
+        lemma = lemmas.get(word, word)
+        if i + 1 < len(spans) and text_low[end:spans[i + 1][0]] == " ":
+            nxt = spans[i + 1][2]
+            pair = f"{lemma} {lemmas.get(nxt, nxt)}"
+            if ingredients.get(pair) == 2:
+                found.append((start, pair, (word, nxt)))
+                i += 2
+                continue
+        if ingredients.get(lemma) == 1:
+            found.append((start, lemma, (word,)))
+        i += 1
+    return found
+
+
+def _restriction_span(analysis, restriction: str, lemmas: dict, index):
+    """
+    (start, end) of the words that name `restriction`: the term itself, or a
+    word it is part of that the restriction covers ("nuts" in "peanuts"), or
+    None ("ham" in "hamster").
+    """
+    if " " in restriction:
+        start = analysis.words.get(restriction)
+        return None if start is None else (start, start + len(restriction))
+    for start, end, word in tokenizer.token_spans(analysis.text_low):
+        if restriction in word and (word == restriction or index.is_excluded(lemmas.get(word, word), [restriction])):
+            return start, end
+    return None
+
+
+def mentions(analysis, known_restrictions=()):
+    """
+    (equipment, restrictions, ingredients) that `analysis` states about the user.
+
+    Terms must appear as whole words ("rice" in "price" does not count), or for
+    a restriction, as part of a word the restriction hierarchy puts under it
+    ("peanuts" -> nuts). A restriction counts when a restriction pattern found
+    it or a negation reaches it ("no pork"); equipment and ingredients count
+    when no negation reaches them. Ingredients are their lemmas ("potatoes" ->
+    "potato"), and those that `known_restrictions` or the prompt's own
+    restrictions rule out are dropped.
+    """
+    vocab = vocabulary.get_vocabulary()
+    lemmas, index = vocab.lemmas, vocab.restrictions
+    text = analysis.text_low
+    found_restrictions = {
+        r: _restriction_span(analysis, r, lemmas, index) for r in analysis.restrictions if r not in analysis.canons
+    }
+    found_equipment = {e: analysis.words[e] for e in analysis.equipment if e in analysis.words}
+    found_ingredients = _ingredient_spans(text, lemmas)
+
+    entity_words = {word for _, _, words in found_ingredients for word in words}
+    for term in found_equipment:
+        entity_words.update(term.split())
+    for span in found_restrictions.values():
+        if span is not None:
+            entity_words.update(word for _, _, word in tokenizer.iter_spans(text[span[0]:span[1]]))
+
+    def negated(start):
+        return _negated(text, start, entity_words)
+
+    restrictions = [
+        r for r in analysis.restrictions
+        if r in analysis.canons or (found_restrictions[r] is not None and negated(found_restrictions[r][0]))
+    ]
+    equipment = [e for e, start in found_equipment.items() if not negated(start)]
+    ingredients = list(dict.fromkeys(lemma for start, lemma, _ in found_ingredients if not negated(start)))
+    avoid = [*known_restrictions, *restrictions]
+    if ingredients and avoid:
+        ingredients = index.filter(ingredients, avoid)
+    return equipment, restrictions, ingredients
+
+
+class SessionState:
+    """Accumulated entities of one session, stored in the session mapping itself."""
+
+    __slots__ = ("session",)
+
+    def __init__(self, session):
+        # Only merges and renders write to the session, so reading it leaves it unmodified
+        self.session = session
+
+    @property
+    def version(self) -> int:
+        return self.session.get("state_version", 0)
+
+    def merge(self, analysis) -> bool:
+        """Add what `analysis` mentions that is not in the state yet; True if anything was."""
+        session = self.session
+        known = session.get("restrictions", [])
+        changed = False
+        for field, found in zip(FIELDS, mentions(analysis, known)):
+            if not found:
+                continue
+            current = session.get(field, [])
+            if field == "ingredients":
+                # Lists from older sessions or batch contexts may hold plural spellings
+                lemmas = vocabulary.get_vocabulary().lemmas
+                seen = {lemmas.get(item, item) for item in current}
+            else:
+                seen = set(current)
+            added = [item for item in found if item not in seen and not seen.add(item)]
+            if added:
+                # A new list, so the session sees the change
+                session[field] = current + added
+                changed = True
+        restrictions = session.get("restrictions", [])
+        if restrictions is not known and session.get("ingredients"):
+            # New restrictions also apply to the ingredients mentioned before them
+            kept = vocabulary.get_vocabulary().restrictions.filter(session["ingredients"], restrictions)
+            if len(kept) != len(session["ingredients"]):
+                session["ingredients"] = kept
+        if changed:
+            session["state_version"] = self.version + 1
+        return changed
+
+    def observe(self, text: str) -> bool:
+        """Scan a user message and merge what it mentions."""
+        return self.merge(scanner.analyze_prompt(text))
+
+    def cached(self):
+        """The value last rendered for the current state, or None."""
+        cached = self.session.get("rendered")
+        if cached is not None and cached[0] == self.version and cached[1] == _generation:
+            return cached[2]
+        return None
+
+    def rendered(self, render):
+        """
+        `render(equipment, restrictions, ingredients)` for the current state,
+        reusing the session's cached value when neither the state nor the
+        vocabulary changed since it was rendered.
+        """
+        value = self.cached()
+        if value is None:
+            session = self.session
+            value = render(*(session.get(field, []) for field in FIELDS))
+            session["rendered"] = [self.version, _generation, value]
+        return value
@@ -0,0 +1,38 @@
+"""
+tokenizer.py
+------------
+Shared word tokenizer for the extractors in ai_app.response_logic.
+
+A prompt is split once into word spans (maximal runs of \\w characters, the
+same tokens as re.findall(r"\\b\\w+\\b")) and the spans are cached per prompt,
+so every extractor that looks at the same text reuses one tokenization.
+Singular/plural normalization is the vocabulary's lemma table (lemmas.py).
+"""
+
+import re
+from functools import lru_cache
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def iter_spans(text: str):
+    """Yield (start, end, word) for every word in `text`, left to right."""
+    for match in _WORD_RE.finditer(text):
+        yield match.start(), match.end(), match.group()
+
+
+@lru_cache(maxsize=2048)
+def token_spans(text_low: str) -> tuple:
+    """All (start, end, word) spans of an already-lowercased prompt, cached."""
+    return tuple(iter_spans(text_low))
+
+
+@lru_cache(maxsize=2048)
+def words(text_low: str) -> tuple:
+    """Just the words of token_spans(text_low)."""
+    return tuple(word for _, _, word in token_spans(text_low))
+
+
+def is_bare(text: str, start: int, end: int) -> bool:
+    """True when text[start:end] is a whole whitespace-delimited chunk, as str.split() gives it."""
+    return (start == 0 or text[start - 1].isspace()) and (end == len(text) or text[end].isspace())
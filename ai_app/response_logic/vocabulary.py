@@ -0,0 +1,375 @@
+"""
+vocabulary.py
+-------------
+Single registry for every keyword list the detectors use.
+
+Vocabularies live in JSON files under data/. They are compiled into one index
+(keyword automata, alias maps, canonical term ids and the scanner tables) that
+is pickled next to the data and reused on the next start. The index is rebuilt
+only when the data files or the code that compiles them change (by content
+hash). Regex restriction patterns
+stay as source text in the index and are compiled on first use.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sys
+from pathlib import Path
+
+from .decision_table import RuleBook, atom_terms
+from .fuzzy_matcher import FuzzyMatcher
+from .keyword_automaton import KeywordAutomaton
+from .lemmas import build_lemma_table, forms_by_lemma
+from .recipe_catalog import RecipeCatalog
+from .restriction_index import RestrictionIndex
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent / "data"
+INDEX_PATH = Path(os.getenv("VOCAB_INDEX_PATH", DATA_DIR / "__pycache__" / "vocabulary.idx"))
+
+# Bump when the compiled layout changes so stale indexes are rebuilt
+INDEX_VERSION = 10
+
+# The index pickles instances of these modules' classes, so their source is part
+# of the fingerprint: editing any of them rebuilds the index without a version bump
+COMPILER_MODULES = (
+    __name__,
+    KeywordAutomaton.__module__,
+    FuzzyMatcher.__module__,
+    RuleBook.__module__,
+    RecipeCatalog.__module__,
+    RestrictionIndex.__module__,
+    build_lemma_table.__module__,
+)
+
+# Scanner category bits attached to every scanner term
+RESTRICTED = 1
+EQUIPMENT = 2
+INGREDIENT = 4
+MARKER = 8
+AMBIGUOUS = 16
+HELP = 32
+ANCHOR = 64
+CUE = 128  # keywords the response helpers look up in PromptAnalysis.terms
+
+# Each response cue also gets its own bit at CUE_SHIFT + its position in
+# "response_cues", so one scan yields PromptAnalysis.cues for the router
+CUE_SHIFT = 8
+
+SCANNER_GROUPS = [
+    (RESTRICTED, "restricted_ingredients"),
+    (EQUIPMENT, "equipment_mentions"),
+    (INGREDIENT, "common_ingredients"),
+    (MARKER, "ingredient_markers"),
+    (AMBIGUOUS, "ambiguity_markers"),
+    (HELP, "help_markers"),
+    (CUE, "response_cues"),
+]
+
+# Plain keyword lists that get their own substring automaton
+AUTOMATON_LISTS = [
+    "common_ingredients", "equipment_keywords", "equipment_mentions", "extract_equipment",
+    "smart_equipment", "restriction_terms", "restriction_markers",
+]
+
+# Lists that also get a fuzzy (typo-tolerant) matcher
+FUZZY_LISTS = ["common_ingredients", "smart_equipment"]
+
+
+class VocabularyIndex:
+    """In-memory view of the compiled index shared by every detector."""
+
+    def __init__(self, compiled: dict):
+        self.fingerprint = compiled["fingerprint"]
+        self.lists = compiled["lists"]
+        self.maps = compiled["maps"]
+        self.term_ids = compiled["term_ids"]
+        self.automata = compiled["automata"]
+        self.fuzzy = compiled["fuzzy"]
+        # {inflected form: lemma}; normalize a word with lemmas.get(word, word)
+        self.lemmas = compiled["lemmas"]
+        # Dish rule tables from data/dish_rules.json
+        self.rules = compiled["rules"]
+        # Restriction hierarchy closure from data/restrictions.json
+        self.restrictions = compiled["restrictions"]
+        # Recipes from data/recipes.json, indexed by ingredient
+        self.catalog = compiled["catalog"]
+        self.scanner = compiled["scanner"]
+
+    def automaton(self, name: str) -> KeywordAutomaton:
+        return self.automata[name]
+
+    def fuzzy_matcher(self, name: str) -> FuzzyMatcher:
+        return self.fuzzy[name]
+
+    def term_id(self, term: str):
+        """Canonical integer id for an ingredient, equipment or restriction term."""
+        return self.term_ids.get(term)
+
+
+# --- Compilation ---
+_QUANTIFIERS = "*+?{"
+_ZERO_WIDTH = "AbBZ"
+
+
+def _literal_anchor(pattern):
+    """
+    Return the longest literal run every match of `pattern` must contain ("" if none).
+
+    Only characters outside groups and classes count, and a top-level "|" means
+    there is no single anchor, so the result is conservative: a pattern that is
+    not understood is simply run on every prompt.
+    """
+    runs, current = [], []
+    depth = i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        literal = None
+        if ch == "\\":
+            escaped = pattern[i + 1:i + 2]
+            i += 2
+            if escaped and escaped in _ZERO_WIDTH:
+                continue
+            if escaped and not escaped.isalnum() and not depth:
+                literal = escaped
+        elif ch == "[":
+            # Skip the class; "]" right after "[" or "[^" is a member
+            i += 2 if pattern[i + 1:i + 2] == "^" else 1
+            i += 1 if pattern[i:i + 1] == "]" else 0
+            while i < len(pattern) and pattern[i] != "]":
+                i += 2 if pattern[i] == "\\" else 1
+            i += 1
+        elif ch == "(":
+            depth += 1
+            i += 1
+        elif ch == ")":
+            depth -= 1
+            i += 1
+        elif ch == "|" and not depth:
+            return ""
+        elif ch in _QUANTIFIERS:
+            # The quantified item may be absent or repeated: it ends the run
+            if current:
+                current.pop()
+            i = pattern.index("}", i) + 1 if ch == "{" and "}" in pattern[i:] else i + 1
+            runs.append("".join(current))
+            current = []
+            continue
+        else:
+            i += 1
+            if ch not in ".^$|" and not depth:
+                literal = ch
+        if literal is None:
+            runs.append("".join(current))
+            current = []
+        else:
+            current.append(literal)
+    runs.append("".join(current))
+    return max(runs, key=len)
+
+
+def _compile_scanner(lists, maps):
+    flags, order = {}, {}
+    for flag, name in SCANNER_GROUPS:
+        # Hits are reported in vocabulary order, per group
+        group_order = order.setdefault(flag, {})
+        for word in lists[name]:
+            group_order.setdefault(word, len(group_order))
+            flags[word] = flags.get(word, 0) | flag
+
+    for word, position in order[CUE].items():
+        flags[word] |= 1 << (CUE_SHIFT + position)
+
+    # Regex restrictions only run when their literal anchor shows up in the pass
+    anchored, unanchored = {}, []
+    patterns = maps["restriction_patterns"]
+    for canon, sources in patterns.items():
+        for pat in sources:
+            anchor = _literal_anchor(pat)
+            if anchor:
+                anchored.setdefault(anchor, []).append((canon, pat))
+                flags[anchor] = flags.get(anchor, 0) | ANCHOR
+            else:
+                unanchored.append((canon, pat))
+
+    return {
+        "flags": flags,
+        "order": order,
+        "anchored": anchored,
+        "unanchored": unanchored,
+        "canon_order": {canon: i for i, canon in enumerate(patterns)},
+        "automaton": KeywordAutomaton(list(flags)),
+    }
+
+
+def compile_index(sources: dict, fingerprint: str) -> dict:
+    """Compile parsed data files ({filename: {name: list|dict}}) into an index."""
+    lists, maps = {}, {}
+    for filename, entries in sorted(sources.items()):
+        for name, value in entries.items():
+            if name in lists or name in maps:
+                raise ValueError(f"Vocabulary '{name}' is defined twice (last seen in {filename})")
+            if isinstance(value, dict):
+                maps[name] = value
+            else:
+                lists[name] = tuple(value)
+
+    # Cue positions become router key bits, so each cue must have exactly one
+    cues = lists["response_cues"]
+    repeated = sorted({cue for cue in cues if cues.count(cue) > 1})
+    if repeated:
+        raise ValueError(f"Duplicate response_cues entries: {', '.join(repeated)}")
+
+    term_ids = {}
+    for name in ("common_ingredients", "known_ingredients", "simple_ingredients", "smart_ingredients",
+                 "equipment_keywords", "equipment_mentions", "restricted_ingredients"):
+        for term in lists[name]:
+            term_ids.setdefault(term, len(term_ids))
+    for term in list(maps["ingredient_aliases"].values()) + list(maps["equipment_variants"]):
+        term_ids.setdefault(term, len(term_ids))
+
+    recipe_words = [item for recipe in lists["recipes"] for item in recipe["ingredients"]]
+    hierarchy = maps["restriction_hierarchy"]
+    hierarchy_words = list(hierarchy) + [member for members in hierarchy.values() for member in members]
+    rule_words = list(atom_terms(maps["dish_rules"]))
+    lemmas = build_lemma_table(
+        list(term_ids) + recipe_words + hierarchy_words + rule_words,
+        maps["irregular_plurals"], lists["invariant_words"],
+    )
+    restrictions = RestrictionIndex(hierarchy, lemmas)
+
+    # smart_parse_input names: every singular/plural spelling, then the typo aliases
+    forms = forms_by_lemma(lemmas)
+    smart_names = {}
+    for name in lists["smart_ingredients"]:
+        lemma = lemmas.get(name, name)
+        for form in [name, lemma, *forms.get(lemma, ())]:
+            smart_names.setdefault(form, name)
+    smart_names.update(maps["ingredient_aliases"])
+
+    automata = {name: KeywordAutomaton(lists[name]) for name in AUTOMATON_LISTS}
+    automata["smart_ingredients"] = KeywordAutomaton(smart_names, whole_words=True)
+    automata["smart_restrictions"] = KeywordAutomaton({
+        variant: key
+        for key, variants in maps["smart_restrictions"].items()
+        for variant in variants
+    })
+
+    # Typo correction for the words the exact matchers above miss
+    fuzzy = {name: FuzzyMatcher(lists[name]) for name in FUZZY_LISTS}
+    fuzzy["smart_ingredients"] = FuzzyMatcher(smart_names)
+
+    return {
+        "version": INDEX_VERSION,
+        "fingerprint": fingerprint,
+        "lists": lists,
+        "maps": maps,
+        "term_ids": term_ids,
+        "automata": automata,
+        "fuzzy": fuzzy,
+        "lemmas": lemmas,
+        "rules": RuleBook(maps["dish_rules"], lemmas),
+        "restrictions": restrictions,
+        "catalog": RecipeCatalog(lists["recipes"], lemmas, restrictions),
+        "scanner": _compile_scanner(lists, maps),
+    }
+
+
+# --- Loading ---
+_code_digest = None
+
+
+def _compiler_digest() -> bytes:
+    """Hash of the source of COMPILER_MODULES, read once per process."""
+    global _code_digest
+    if _code_digest is None:
+        digest = hashlib.sha256()
+        for name in COMPILER_MODULES:
+            digest.update(name.encode())
+            path = getattr(sys.modules[name], "__file__", None)
+            try:
+                digest.update(Path(path).read_bytes())
+            except (OSError, TypeError):
+                # No source on disk (frozen install): only INDEX_VERSION guards the layout
+                pass
+        _code_digest = digest.digest()
+    return _code_digest
+
+
+def _fingerprint(raw: dict) -> str:
+    digest = hashlib.sha256(f"v{INDEX_VERSION}".encode())
+    digest.update(_compiler_digest())
+    for name in sorted(raw):
+        digest.update(name.encode())
+        digest.update(raw[name])
+    return digest.hexdigest()
+
+
+def _read_index(path: Path, fingerprint: str):
+    try:
+        with open(path, "rb") as f:
+            compiled = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+    if not isinstance(compiled, dict) or compiled.get("version") != INDEX_VERSION:
+        return None
+    if compiled.get("fingerprint") != fingerprint:
+        return None
+    return compiled
+
+
+def _write_index(path: Path, compiled: dict):
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "wb") as f:
+            pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError as e:
+        # A read-only install still works, it just recompiles on every start
+        logger.debug("Could not write vocabulary index %s: %s", path, e)
+
+
+def load_vocabulary(data_dir: Path = DATA_DIR, index_path: Path = INDEX_PATH) -> VocabularyIndex:
+    """Load the compiled index for `data_dir`, rebuilding it if the data changed."""
+    raw = {p.name: p.read_bytes() for p in sorted(Path(data_dir).glob("*.json"))}
+    fingerprint = _fingerprint(raw)
+
+    compiled = _read_index(Path(index_path), fingerprint)
+    if compiled is None:
+        sources = {name: json.loads(data.decode("utf-8")) for name, data in raw.items()}
+        compiled = compile_index(sources, fingerprint)
+        _write_index(Path(index_path), compiled)
+    return VocabularyIndex(compiled)
+
+
+# Loaded on first use so importing this module does no file IO
+VOCABULARY = None
+
+_reload_listeners = []
+
+
+def get_vocabulary() -> VocabularyIndex:
+    global VOCABULARY
+    if VOCABULARY is None:
+        VOCABULARY = load_vocabulary()
+    return VOCABULARY
+
+
+def on_reload(callback):
+    """Register `callback(vocabulary)` to run after reload_vocabulary()."""
+    _reload_listeners.append(callback)
+    return callback
+
+
+def reload_vocabulary(data_dir: Path = DATA_DIR, index_path: Path = INDEX_PATH) -> VocabularyIndex:
+    """Re-read the data files and swap in the new index for every detector."""
+    global VOCABULARY
+    VOCABULARY = load_vocabulary(data_dir, index_path)
+    for callback in _reload_listeners:
+        callback(VOCABULARY)
+    return VOCABULARY
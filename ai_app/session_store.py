@@ -0,0 +1,253 @@
+# ai_app/session_store.py
+"""
+Server-side sessions for the Flask app and the ASGI mode.
+
+The session cookie carries only a signed random id; the session dict lives in
+a SessionStore on the server:
+
+    MemorySessionStore   one process; LRU-bounded, entries expire after a TTL
+    SQLiteSessionStore   one database file shared by every worker process
+
+configure_sessions() installs ServerSessionInterface on the app. The backend is
+chosen with SESSION_BACKEND=memory (default), sqlite or cookie (Flask's signed
+cookie sessions, unchanged). Other settings:
+
+    SESSION_TTL        seconds a session lives after its last use (86400)
+    SESSION_MAX        sessions kept by the memory store (10000)
+    SESSION_DB         SQLite file (instance/sessions.sqlite3)
+
+A session is written back only when the request changed it.
+"""
+
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SecureCookieSession, SecureCookieSessionInterface, SessionInterface
+from itsdangerous import BadSignature, Signer
+
+DEFAULT_TTL = 24 * 60 * 60
+
+
+def _copy(data: dict) -> dict:
+    # One level deep: the app only appends to or replaces the session's lists
+    return {key: list(value) if isinstance(value, list) else value for key, value in data.items()}
+
+
+class SessionStore:
+    """Where session dicts live, by session id."""
+
+    def load(self, sid: str):
+        """The session dict for `sid`, or None if it is unknown or expired."""
+        raise NotImplementedError
+
+    def save(self, sid: str, data: dict):
+        raise NotImplementedError
+
+    def delete(self, sid: str):
+        raise NotImplementedError
+
+
+class MemorySessionStore(SessionStore):
+    """
+    Sessions in a dict of this process. At most `max_sessions` are kept
+    (least recently used are evicted first); a session unused for `ttl`
+    seconds is gone.
+    """
+
+    def __init__(self, max_sessions: int = 10_000, ttl: float = DEFAULT_TTL, clock=time.monotonic):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()  # sid -> [expires, data], least recently used first
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def load(self, sid: str):
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(sid)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._entries[sid]
+                return None
+            entry[0] = now + self.ttl
+            self._entries.move_to_end(sid)
+            return _copy(entry[1])
+
+    def save(self, sid: str, data: dict):
+        now = self._clock()
+        with self._lock:
+            self._entries[sid] = [now + self.ttl, _copy(data)]
+            self._entries.move_to_end(sid)
+            # Expired sessions collect at the old end; drop them with the overflow
+            while self._entries:
+                oldest_sid, (expires, _) = next(iter(self._entries.items()))
+                if expires > now and len(self._entries) <= self.max_sessions:
+                    break
+                del self._entries[oldest_sid]
+
+    def delete(self, sid: str):
+        with self._lock:
+            self._entries.pop(sid, None)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Sessions in an SQLite table (Flask's tagged JSON, which also keeps bytes,
+    plus expiry time), so several worker processes can share them. Each thread uses its own connection.
+    Loading a session pushes its expiry back like a save does. Expired rows are
+    purged every `purge_every` saves.
+    """
+
+    def __init__(self, path, ttl: float = DEFAULT_TTL, purge_every: int = 1000, clock=time.time):
+        self.path = str(path)
+        self.ttl = ttl
+        self.purge_every = purge_every
+        self._clock = clock
+        self._saves = 0
+        self._local = threading.local()
+        self._serializer = TaggedJSONSerializer()
+
+    def _db(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            import sqlite3
+
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "id TEXT PRIMARY KEY, data TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS sessions_expires ON sessions (expires)")
+            self._local.db = db
+        return db
+
+    def __len__(self):
+        return self._db().execute("SELECT COUNT(*) FROM sessions WHERE expires > ?", (self._clock(),)).fetchone()[0]
+
+    def load(self, sid: str):
+        now = self._clock()
+        # One statement, so the TTL slides even for requests that never save (RETURNING needs SQLite 3.35)
+        row = self._db().execute(
+            "UPDATE sessions SET expires = ? WHERE id = ? AND expires > ? RETURNING data", (now + self.ttl, sid, now)
+        ).fetchone()
+        return self._serializer.loads(row[0]) if row else None
+
+    def save(self, sid: str, data: dict):
+        now = self._clock()
+        db = self._db()
+        db.execute(
+            "INSERT INTO sessions (id, data, expires) VALUES (?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET data = excluded.data, expires = excluded.expires",
+            (sid, self._serializer.dumps(data), now + self.ttl),
+        )
+        self._saves += 1
+        if self._saves % self.purge_every == 0:
+            db.execute("DELETE FROM sessions WHERE expires <= ?", (now,))
+
+    def delete(self, sid: str):
+        self._db().execute("DELETE FROM sessions WHERE id = ?", (sid,))
+
+
+class ServerSideSession(SecureCookieSession):
+    """A session dict with the id it is stored under."""
+
+    def __init__(self, initial=None, sid: str = None, new: bool = False):
+        super().__init__(initial)
+        self.sid = sid
+        self.new = new
+
+
+class ServerSessionInterface(SessionInterface):
+    """Flask session interface keeping sessions in `store` and only their signed id in the cookie."""
+
+    def __init__(self, store: SessionStore):
+        self.store = store
+
+    def _signer(self, app) -> Signer:
+        return Signer(app.secret_key, salt="ai_app-session-id")
+
+    def load(self, app, cookie_value: str = None) -> ServerSideSession:
+        """The session a cookie value points to, or a fresh one (also for unknown or forged ids)."""
+        if cookie_value:
+            try:
+                sid = self._signer(app).unsign(cookie_value).decode()
+            except BadSignature:
+                sid = None
+            data = self.store.load(sid) if sid else None
+            if data is not None:
+                return ServerSideSession(data, sid=sid)
+        return ServerSideSession(sid=secrets.token_urlsafe(24), new=True)
+
+    def persist(self, app, session: ServerSideSession):
+        """
+        Write a changed session to the store. Returns the cookie value to send,
+        "" when the cookie should be deleted, or None when nothing changed.
+        """
+        if not session:
+            if session.modified and not session.new:
+                self.store.delete(session.sid)
+                return ""
+            return None
+        if not (session.modified or session.new):
+            return None
+        self.store.save(session.sid, dict(session))
+        return self._signer(app).sign(session.sid).decode()
+
+    def open_session(self, app, request):
+        return self.load(app, request.cookies.get(self.get_cookie_name(app)))
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        if session.accessed:
+            response.vary.add("Cookie")
+        value = self.persist(app, session)
+        if value == "":
+            response.delete_cookie(name, **cookie_options(self, app))
+        elif value is not None:
+            response.set_cookie(name, value, expires=self.get_expiration_time(app, session), **cookie_options(self, app))
+
+
+def cookie_options(interface: SessionInterface, app) -> dict:
+    """
+    Set-Cookie attributes for the session cookie, from the app's SESSION_COOKIE_*
+    settings. Shared by every server so they all send the same cookie.
+    """
+    options = {
+        "domain": interface.get_cookie_domain(app),
+        "path": interface.get_cookie_path(app),
+        "httponly": interface.get_cookie_httponly(app),
+        "secure": interface.get_cookie_secure(app),
+        "samesite": interface.get_cookie_samesite(app),
+    }
+    if hasattr(interface, "get_cookie_partitioned"):  # Flask 3.1+
+        options["partitioned"] = interface.get_cookie_partitioned(app)
+    return options
+
+
+def configure_sessions(app, backend: str = None):
+    """Install the session backend named by `backend` or SESSION_BACKEND on `app`."""
+    backend = (backend or os.getenv("SESSION_BACKEND", "memory")).lower()
+    ttl = float(os.getenv("SESSION_TTL", str(DEFAULT_TTL)))
+    if backend == "cookie":
+        app.session_interface = SecureCookieSessionInterface()
+        return
+    if backend == "memory":
+        store = MemorySessionStore(int(os.getenv("SESSION_MAX", "10000")), ttl)
+    elif backend == "sqlite":
+        store = SQLiteSessionStore(os.getenv("SESSION_DB", os.path.join(app.instance_path, "sessions.sqlite3")), ttl)
+    else:
+        raise ValueError(f"Unknown SESSION_BACKEND: {backend!r} (expected memory, sqlite or cookie)")
+    app.session_interface = ServerSessionInterface(store)
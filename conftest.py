@@ -7,6 +7,7 @@ import subprocess
 import time
 import signal
 import json
+import logging
 from datetime import datetime
 from pathlib import Path
 
@@ -22,7 +23,8 @@ SRC = ROOT / "src"
 if SRC.exists() and str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
-print("PYTHONPATH:", sys.path)
+logger = logging.getLogger(__name__)
+logger.debug("PYTHONPATH: %s", sys.path)
 
 # ---- Optional: base URL fixture for UI tests ----
 @pytest.fixture(scope="session")
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Async Server Load Benchmark
+Compares the threaded Flask server (ai_app/app.py) with the ASGI mode
+(ai_app/asgi.py under uvicorn) at several concurrent-connection levels.
+
+Each server runs in its own process. Clients POST generated prompts to
+/api/response, one connection per request, and the script reports throughput
+and latency percentiles per server and concurrency level. --slow-clients keeps
+that many extra connections open, trickling their request bodies, to show what
+slow clients cost the other requests.
+
+Usage:
+    python tests/perf/bench_async_server.py [--requests 2000] [--concurrency 1 16 64]
+                                            [--slow-clients 0] [--json results.json]
+
+Requires uvicorn for the ASGI side (pip install uvicorn).
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from bench_batch_responses import build_corpus  # noqa: E402  (same directory)
+
+SERVERS = {
+    "flask-threaded": lambda port: [sys.executable, "-c", (
+        "from ai_app.app import app; "
+        f"app.run(host='127.0.0.1', port={port}, debug=False, threaded=True)"
+    )],
+    "asgi-uvicorn": lambda port: [
+        sys.executable, "-m", "uvicorn", "ai_app.asgi:app",
+        "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+    ],
+}
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_healthy(port, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1) as s:
+                s.sendall(b"GET /health HTTP/1.1\r\nHost: bench\r\nConnection: close\r\n\r\n")
+                if s.recv(64).split(b" ", 2)[1:2] == [b"200"]:
+                    return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server on port {port} did not become healthy")
+
+
+def _request_bytes(prompt):
+    body = json.dumps({"input": prompt}).encode()
+    head = (
+        "POST /api/response HTTP/1.1\r\nHost: bench\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+    ).encode()
+    return head, body
+
+
+async def _one_request(port, prompt):
+    head, body = _request_bytes(prompt)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        writer.write(head + body)
+        await writer.drain()
+        data = await reader.read()
+    finally:
+        writer.close()
+    return data.startswith(b"HTTP/1.1 200") or data.startswith(b"HTTP/1.0 200")
+
+
+async def _slow_client(port, stop):
+    """Send headers, then trickle the body one byte at a time until `stop` is set."""
+    while not stop.is_set():
+        head, body = _request_bytes("I have chicken and rice")
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            await asyncio.sleep(0.05)
+            continue
+        try:
+            writer.write(head)
+            for byte in body:
+                if stop.is_set():
+                    return  # hang up mid-body rather than wait for a reply
+                writer.write(bytes([byte]))
+                await writer.drain()
+                await asyncio.sleep(0.05)
+            await reader.read()
+        except OSError:
+            pass
+        finally:
+            writer.close()
+
+
+async def _load(port, prompts, concurrency, slow_clients):
+    latencies, errors = [], 0
+    queue = iter(prompts)
+    stop = asyncio.Event()
+    slow = [asyncio.create_task(_slow_client(port, stop)) for _ in range(slow_clients)]
+
+    async def worker():
+        nonlocal errors
+        for prompt in queue:
+            start = time.perf_counter()
+            try:
+                ok = await _one_request(port, prompt)
+            except OSError:
+                ok = False
+            latencies.append(time.perf_counter() - start)
+            errors += not ok
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await asyncio.gather(*slow, return_exceptions=True)
+    return latencies, errors, elapsed
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(pct / 100.0 * len(sorted_values)))]
+
+
+def run_server(name, prompts, levels, slow_clients):
+    port = _free_port()
+    proc = subprocess.Popen(
+        SERVERS[name](port), cwd=PROJECT_ROOT,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        env={**os.environ, "PYTHONPATH": str(PROJECT_ROOT)},
+    )
+    results = []
+    try:
+        _wait_healthy(port)
+        asyncio.run(_load(port, prompts[:50], 4, 0))  # warm caches and imports
+        for concurrency in levels:
+            latencies, errors, elapsed = asyncio.run(_load(port, prompts, concurrency, slow_clients))
+            latencies.sort()
+            results.append({
+                "server": name,
+                "concurrency": concurrency,
+                "slow_clients": slow_clients,
+                "requests": len(latencies),
+                "errors": errors,
+                "rps": len(latencies) / elapsed,
+                "p50_ms": _percentile(latencies, 50) * 1000,
+                "p99_ms": _percentile(latencies, 99) * 1000,
+                "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+            })
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--slow-clients", type=int, default=0)
+    parser.add_argument("--servers", nargs="+", default=list(SERVERS), choices=list(SERVERS))
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+
+    if "asgi-uvicorn" in args.servers:
+        try:
+            import uvicorn  # noqa: F401
+        except ImportError:
+            sys.exit("uvicorn is not installed; pip install uvicorn or pass --servers flask-threaded")
+
+    prompts = build_corpus(args.requests, unique=500)
+    results = []
+    for name in args.servers:
+        results.extend(run_server(name, prompts, args.concurrency, args.slow_clients))
+
+    print(f"{'server':<16} {'conc':>5} {'slow':>5} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for r in results:
+        print(f"{r['server']:<16} {r['concurrency']:>5} {r['slow_clients']:>5} {r['rps']:>9.1f} "
+              f"{r['p50_ms']:>9.2f} {r['p99_ms']:>9.2f} {r['errors']:>7}")
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Batch API Benchmark
+Answers the same generated prompts through the Flask test client three ways:
+one /api/response request per prompt, one /api/batch request, and one
+/api/batch request streamed as NDJSON. Checks that all three give the same
+replies and prints the cost per prompt.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from ai_app import app as app_module  # noqa: E402
+from ai_app.response_logic.response_hub import invalidate_response_cache  # noqa: E402
+from bench_batch_responses import build_corpus  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--prompts", type=int, default=1_000)
+    parser.add_argument("--unique", type=int, default=200)
+    args = parser.parse_args()
+    prompts = build_corpus(args.prompts, args.unique)
+    app_module.BATCH_MAX_ITEMS = max(app_module.BATCH_MAX_ITEMS, len(prompts))
+    app_module.BATCH_MAX_BYTES = max(app_module.BATCH_MAX_BYTES, 200 * len(prompts))
+    rows = []
+
+    invalidate_response_cache()
+    start = time.perf_counter()
+    single = [
+        app_module.app.test_client().post("/api/response", json={"input": p}).get_json()["response"]
+        for p in prompts
+    ]
+    rows.append(("/api/response per prompt", time.perf_counter() - start))
+
+    client = app_module.app.test_client()
+    invalidate_response_cache()
+    start = time.perf_counter()
+    batch = client.post("/api/batch", json={"prompts": prompts}).get_json()["responses"]
+    rows.append(("/api/batch", time.perf_counter() - start))
+
+    invalidate_response_cache()
+    start = time.perf_counter()
+    resp = client.post("/api/batch", json={"prompts": prompts}, headers={"Accept": "application/x-ndjson"})
+    streamed = [json.loads(line)["response"] for line in resp.get_data(as_text=True).splitlines()]
+    rows.append(("/api/batch (NDJSON)", time.perf_counter() - start))
+
+    assert single == batch == streamed, "batch replies differ from /api/response"
+    print(f"{len(prompts)} prompts, {len(set(prompts))} distinct; replies identical")
+    print(f"{'mode':<28} {'total ms':>9} {'us/prompt':>10}")
+    for label, elapsed in rows:
+        print(f"{label:<28} {elapsed * 1e3:>9.1f} {elapsed / len(prompts) * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Batch Response Benchmark
+Compares a per-call generate_response loop with generate_responses on a generated
+corpus of logged-style prompts. --distinct makes every prompt unique, which
+shows the batch cost when nothing repeats.
+
+Usage:
+    python tests/perf/bench_batch_responses.py [--size 1000000] [--unique 5000] [--distinct]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from ai_app.response_logic import generate_response, generate_responses  # noqa: E402
+from ai_app.response_logic.response_hub import invalidate_response_cache  # noqa: E402
+
+TEMPLATES = [
+    "I have {ing} and {ing2}",
+    "Can I cook {ing} in the {eq}?",
+    "{Eq} recipe with {ing}, no {res}",
+    "No {res} please, something with {ing}",
+    "Make something with {ing} and {ing2}",
+    "I'm not sure what to make with {ing}",
+    "Suggest a dinner using the {eq}",
+]
+INGREDIENTS = ["chicken", "rice", "beans", "potatoes", "carrots", "salmon", "beef", "eggs", "spinach", "pasta"]
+EQUIPMENT = ["instant pot", "slow cooker", "oven", "wok", "air fryer", "microwave", "grill"]
+RESTRICTIONS = ["dairy", "gluten", "pork", "nuts", "sugar", "honey"]
+
+
+def build_corpus(size, unique, seed=7):
+    """`size` prompts drawn from `unique` distinct ones, like repetitive chat logs."""
+    rng = random.Random(seed)
+    distinct = []
+    for _ in range(unique):
+        eq = rng.choice(EQUIPMENT)
+        prompt = rng.choice(TEMPLATES).format(
+            ing=rng.choice(INGREDIENTS), ing2=rng.choice(INGREDIENTS),
+            eq=eq, Eq=eq.title(), res=rng.choice(RESTRICTIONS),
+        )
+        # Casing / whitespace noise as seen in real logs
+        if rng.random() < 0.3:
+            prompt = prompt.lower() + " "
+        distinct.append(prompt)
+    return [rng.choice(distinct) for _ in range(size)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--unique", type=int, default=5_000)
+    parser.add_argument("--distinct", action="store_true", help="number every prompt so none repeat")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.size, args.unique)
+    if args.distinct:
+        corpus = [f"{prompt} (order {i})" for i, prompt in enumerate(corpus)]
+    invalidate_response_cache()
+
+    start = time.perf_counter()
+    loop_results = [generate_response(p) for p in corpus]
+    loop_s = time.perf_counter() - start
+
+    invalidate_response_cache()
+    start = time.perf_counter()
+    batch_results = generate_responses(corpus)
+    batch_s = time.perf_counter() - start
+
+    assert loop_results == batch_results, "batch output diverged from per-call output"
+    print(f"prompts: {args.size:,} ({len(set(corpus)):,} distinct)")
+    print(f"per-call loop: {loop_s:8.2f}s  {args.size / loop_s:12,.0f} prompts/s")
+    print(f"batch:         {batch_s:8.2f}s  {args.size / batch_s:12,.0f} prompts/s")
+    print(f"speedup:       {loop_s / batch_s:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Chat Pipeline Benchmark
+Times whole requests through the Flask test client for /api/response against
+a reference route with the old per-route code path (session setdefaults,
+get_json, jsonify, session.modified = True) running the same turn. Reports
+per-request cost and session store writes for answered turns and for rejected
+(400) requests, with and without orjson.
+"""
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from flask import jsonify, request, session  # noqa: E402
+
+from ai_app import app as app_module  # noqa: E402
+from ai_app.session_store import ServerSessionInterface  # noqa: E402
+
+REQUESTS = 2_000
+PROMPTS = ["I have chicken and rice.", "No dairy please", "Can I use my Instant Pot?", "What about garlic?"]
+
+
+@app_module.app.route("/bench/legacy", methods=["POST"])
+def legacy_route():
+    for key in ("restrictions", "equipment", "ingredients"):
+        session.setdefault(key, [])
+    session.setdefault("messages", b"")
+    data = request.get_json(silent=True) or {}
+    user_input = (data.get("input") or "").strip()
+    if not user_input:
+        return jsonify({"error": "No input provided"}), 400
+    session.modified = True
+    return jsonify({"response": app_module._chat_turn(session, user_input)})
+
+
+def run(path, payloads, store):
+    client = app_module.app.test_client()
+    client.post("/api/response", json={"input": "warm up"})
+    saves = []
+    original = store.save
+    store.save = lambda sid, data: saves.append(sid) or original(sid, data)
+    try:
+        start = time.perf_counter()
+        for i in range(REQUESTS):
+            client.post(path, json=payloads[i % len(payloads)])
+        elapsed = (time.perf_counter() - start) / REQUESTS * 1e6
+    finally:
+        store.save = original
+    return elapsed, len(saves)
+
+
+def main():
+    interface = app_module.app.session_interface
+    if not isinstance(interface, ServerSessionInterface):
+        sys.exit("Run with a server-side SESSION_BACKEND (memory or sqlite)")
+    app_module.MAX_HISTORY_MESSAGES = 20
+
+    cases = [
+        ("answered turn", [{"input": p} for p in PROMPTS]),
+        ("rejected (400)", [{"input": "  "}]),
+    ]
+    encoders = [("orjson", app_module.orjson), ("stdlib json", None)] if app_module.orjson else [("stdlib json", None)]
+    print(f"{REQUESTS} requests per row")
+    print(f"{'request':<16} {'route':<26} {'json':<12} {'us/request':>11} {'session writes':>15}")
+    for label, payloads in cases:
+        legacy, legacy_saves = run("/bench/legacy", payloads, interface.store)
+        print(f"{label:<16} {'old per-route code':<26} {'jsonify':<12} {legacy:>11.0f} {legacy_saves:>15}")
+        for name, module in encoders:
+            app_module.orjson = module
+            elapsed, saves = run("/api/response", payloads, interface.store)
+            print(f"{label:<16} {'pipeline':<26} {name:<12} {elapsed:>11.0f} {saves:>15}")
+        app_module.orjson = encoders[0][1]
+
+
+if __name__ == "__main__":
+    main()
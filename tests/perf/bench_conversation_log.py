@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Conversation Log Benchmark
+Measures the memory held per active session for 100k sessions of chat history
+in three forms: the old list of {"role", "content"} dicts with full reply
+texts, ConversationLog objects (ring buffer, shared context strings) and the
+binary form sessions now store. Then times recording one turn the way the
+chat routes do (decode, append two messages, encode).
+"""
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from ai_app.conversation_log import ConversationLog  # noqa: E402
+
+CAPACITY = 20
+WORDS = "chicken carrot rice garlic onion basil oven skillet roast simmer broth lemon butter pepper".split()
+
+
+def text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def conversation(rng, turns):
+    """(user, basic response, context) per turn; the plan changes every third turn."""
+    out, context = [], ""
+    for turn in range(turns):
+        if turn % 3 == 0:
+            context = (
+                f"\n\nPlan so far:\n- Equipment: {text(rng, 2)}\n- Restrictions: {text(rng, 1)}\n"
+                f"- Ingredients: {text(rng, 6)}\n\nSuggested dish: {text(rng, 30)}"
+            )
+        out.append((text(rng, 8), text(rng, 25), context))
+    return out
+
+
+def as_dicts(turns):
+    messages = []
+    for user, basic, context in turns:
+        messages.append({"role": "user", "content": user})
+        messages.append({"role": "assistant", "content": basic + context})
+    return messages
+
+
+def as_log(turns):
+    log = ConversationLog(CAPACITY)
+    for user, basic, context in turns:
+        log.append("user", user)
+        log.append("assistant", basic, context)
+    return log
+
+
+def measure(label, build, sessions, turns, seed):
+    # Each session's text is generated inside the traced window and only what
+    # `build` keeps survives, as when a session is decoded from its store
+    rng = random.Random(seed)
+    gc.collect()
+    tracemalloc.start()
+    held = [build(conversation(rng, turns)) for _ in range(sessions)]
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{label:<32} {used / 2**20:>9.1f} {used / sessions:>11.0f}")
+    del held
+    gc.collect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--turns", type=int, default=CAPACITY // 2)
+    args = parser.parse_args()
+
+    print(f"{args.sessions} sessions x {args.turns} turns (capacity {CAPACITY} messages)")
+    print(f"{'representation':<32} {'MiB':>9} {'bytes/sess':>11}")
+    measure("list of dicts", as_dicts, args.sessions, args.turns, 1)
+    measure("ConversationLog", as_log, args.sessions, args.turns, 1)
+    measure("binary (session['messages'])", lambda chat: as_log(chat).to_bytes(), args.sessions, args.turns, 1)
+
+    rng = random.Random(2)
+    chat = conversation(rng, args.turns)
+    stored = as_log(chat[:-1]).to_bytes()
+    user, basic, context = chat[-1]
+    calls = 20_000
+    start = time.perf_counter()
+    for _ in range(calls):
+        log = ConversationLog.load(stored, CAPACITY)
+        log.append("user", user)
+        log.append("assistant", basic, context)
+        log.to_bytes()
+    per_turn = (time.perf_counter() - start) / calls * 1e6
+    print(f"\nrecord one turn (decode + 2 appends + encode): {per_turn:.1f} us, {len(stored)} bytes stored")
+
+
+if __name__ == "__main__":
+    main()
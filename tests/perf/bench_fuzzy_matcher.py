@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Fuzzy Matcher Benchmark
+Times typo lookups in the symmetric-delete FuzzyMatcher at 10k and 100k terms,
+compared with a naive edit-distance scan over the whole vocabulary.
+"""
+import gc
+import random
+import string
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from ai_app.response_logic.fuzzy_matcher import FuzzyMatcher, edit_distance, typo_budget  # noqa: E402
+from ai_app.response_logic.vocabulary import get_vocabulary  # noqa: E402
+
+VOCAB_SIZES = [10_000, 100_000]
+LOOKUPS = 2_000
+
+
+def synthetic_vocabulary(size, seed=42):
+    """Real ingredient and equipment terms padded with random pseudo-words up to `size` terms."""
+    lists = get_vocabulary().lists
+    rng = random.Random(seed)
+    vocab = list(dict.fromkeys(list(lists["smart_ingredients"]) + list(lists["smart_equipment"])))[:size]
+    seen = set(vocab)
+    while len(vocab) < size:
+        word = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 12)))
+        if word not in seen:
+            seen.add(word)
+            vocab.append(word)
+    return vocab
+
+
+def misspell(word, rng):
+    """Apply one random edit (delete, insert, substitute or transpose)."""
+    i = rng.randrange(len(word))
+    kind = rng.choice("dist")
+    if kind == "d":
+        return word[:i] + word[i + 1:]
+    if kind == "i":
+        return word[:i] + rng.choice(string.ascii_lowercase) + word[i:]
+    if kind == "s":
+        return word[:i] + rng.choice(string.ascii_lowercase) + word[i + 1:]
+    i = min(i, len(word) - 2)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def naive_lookup(vocab, word, limit):
+    best = None
+    for term in vocab:
+        distance = edit_distance(word, term, limit)
+        if distance <= limit and (best is None or distance < best[1]):
+            best = (term, distance)
+    return best
+
+
+def main():
+    print(f"{'terms':>8} {'build (s)':>10} {'index (MB)':>11} {'lookup (us)':>12} {'hit rate':>9} {'naive (us)':>11}")
+    for size in VOCAB_SIZES:
+        vocab = synthetic_vocabulary(size)
+        rng = random.Random(7)
+        queries = [misspell(rng.choice(vocab), rng) for _ in range(LOOKUPS)]
+        queries = [q for q in queries if typo_budget(q)]
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        matcher = FuzzyMatcher(vocab)
+        build_s = time.perf_counter() - start
+        index_mb = tracemalloc.get_traced_memory()[0] / 1e6
+        tracemalloc.stop()
+
+        gc.collect()
+        for q in queries[:200]:  # warm up
+            matcher.lookup(q, typo_budget(q))
+        start = time.perf_counter()
+        hits = sum(matcher.lookup(q, typo_budget(q)) is not None for q in queries)
+        lookup_us = (time.perf_counter() - start) / len(queries) * 1e6
+
+        # The naive scan is slow, so sample it
+        sample = queries[:max(5, 200_000 // size)]
+        start = time.perf_counter()
+        for q in sample:
+            naive_lookup(vocab, q, typo_budget(q))
+        naive_us = (time.perf_counter() - start) / len(sample) * 1e6
+
+        print(f"{size:>8} {build_s:>10.2f} {index_mb:>11.1f} {lookup_us:>12.1f} "
+              f"{hits / len(queries):>9.1%} {naive_us:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Recipe Catalog Benchmark
+Times top-k pantry queries on a RecipeCatalog (bitset inverted index) against
+scoring every recipe in a loop, for synthetic catalogs of 1k to 50k recipes.
+"""
+import gc
+import random
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from ai_app.response_logic.recipe_catalog import RecipeCatalog  # noqa: E402
+
+CATALOG_SIZES = [1_000, 10_000, 50_000]
+INGREDIENTS = [f"ingredient {i}" for i in range(1_500)]
+EQUIPMENT = ["oven", "stovetop", "wok", "grill", "instant pot", "slow cooker", "air fryer", "microwave"]
+RESTRICTIONS = ["dairy", "gluten", "nuts", "shellfish"]
+TAGS = ["cozy", "vegan", "vegetarian", "quick"]
+QUERIES = 500
+BUDGET_MS = 1.0
+
+
+def synthetic_recipes(count, seed=42):
+    rng = random.Random(seed)
+    return [
+        {
+            "name": f"recipe {i}",
+            "ingredients": rng.sample(INGREDIENTS, rng.randint(3, 12)),
+            "equipment": rng.sample(EQUIPMENT, rng.randint(0, 2)),
+            "tags": rng.sample(TAGS, rng.randint(0, 2)),
+            "contains": rng.sample(RESTRICTIONS, rng.randint(0, 1)),
+        }
+        for i in range(count)
+    ]
+
+
+def queries(seed=7):
+    rng = random.Random(seed)
+    return [
+        {
+            "pantry": rng.sample(INGREDIENTS, rng.randint(2, 12)),
+            "equipment": rng.sample(EQUIPMENT, rng.randint(1, 4)),
+            "restrictions": rng.sample(RESTRICTIONS, rng.randint(0, 2)),
+            "tags": rng.sample(TAGS, rng.randint(0, 1)),
+        }
+        for _ in range(QUERIES)
+    ]
+
+
+def linear_top_k(records, pantry, k, equipment, restrictions, tags):
+    have, avoid, pantry = set(equipment), set(restrictions), set(pantry)
+    scored = []
+    for i, recipe in enumerate(records):
+        ingredients = set(recipe["ingredients"])
+        if not have.issuperset(recipe["equipment"]) or avoid & (ingredients | set(recipe["contains"])):
+            continue
+        if not set(tags) <= set(recipe["tags"]):
+            continue
+        scored.append((-len(pantry & ingredients), len(ingredients), i))
+    scored.sort()
+    return [(i, -overlap) for overlap, _, i in scored[:k]]
+
+
+def latencies(fn, calls):
+    times = []
+    for query in calls:
+        start = time.perf_counter()
+        fn(query)
+        times.append((time.perf_counter() - start) * 1e3)
+    times.sort()
+    return times[len(times) // 2], times[int(len(times) * 0.99)]
+
+
+def main():
+    calls = queries()
+    print(f"{'recipes':>8} {'build (ms)':>11} {'top-10 p50 (ms)':>16} {'p99 (ms)':>9} {'linear p50 (ms)':>16}")
+    worst = 0.0
+    for size in CATALOG_SIZES:
+        records = synthetic_recipes(size)
+        start = time.perf_counter()
+        catalog = RecipeCatalog(records)
+        build_ms = (time.perf_counter() - start) * 1e3
+
+        for query in calls[:50]:
+            got = [(recipe.id, overlap) for recipe, overlap in catalog.top_k(k=10, **query)]
+            assert got == linear_top_k(records, k=10, **query)
+
+        gc.collect()
+        p50, p99 = latencies(lambda q: catalog.top_k(k=10, **q), calls)
+        linear, _ = latencies(lambda q: linear_top_k(records, k=10, **q), calls[:20])
+        worst = max(worst, p50)
+        print(f"{size:>8} {build_ms:>11.1f} {p50:>16.3f} {p99:>9.3f} {linear:>16.2f}")
+
+    print(f"\nmedian query {'within' if worst < BUDGET_MS else 'OVER'} the {BUDGET_MS:.0f} ms budget")
+
+
+if __name__ == "__main__":
+    main()
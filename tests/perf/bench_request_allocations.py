@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Per-Request Allocation Benchmark
+Counts memory blocks allocated and str.lower() calls for one uncached reply per
+sample prompt, three ways: the response helpers as they were before requests
+shared a PromptAnalysis (each helper lowercases the prompt text per keyword),
+the same branch logic with helpers reading the shared PromptAnalysis, and the
+hub's current _respond.
+
+A block count is the sum of every rise in sys.getallocatedblocks() between
+profiler events, so short-lived temporaries count too; the profiler's own
+overhead (an empty call) is subtracted.
+
+Usage:
+    python tests/perf/bench_request_allocations.py
+"""
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from ai_app.response_logic import response_hub  # noqa: E402
+from ai_app.response_logic.response_logic import (  # noqa: E402
+    EQUIPMENT_REPLIES,
+    RESTRICTION_REPLIES,
+    bias_filter,
+)
+from ai_app.response_logic.scanner import scan_prompt  # noqa: E402
+
+PROMPTS = [
+    "Make a creamy soup without dairy.",
+    "Healthy dinner but no carbs (clarify if needed)",
+    "Instant Pot recipe with chicken and potatoes, no dairy",
+    "Microwave mac and cheese without dairy.",
+    "I have chicken, potatoes, and carrots",
+    "asdfghjkl qwertyuiop zxcvbnm",
+]
+CLARIFY = "Please clarify a bit more so I can suggest the right recipe for your needs."
+
+
+# --- The helpers before PromptAnalysis: they take the prompt text ---
+def legacy_restriction_response(prompt):
+    for key, message in RESTRICTION_REPLIES.items():
+        if key in prompt.lower():
+            return message
+    return "This recipe avoids restricted ingredients and respects your dietary needs."
+
+
+def legacy_equipment_response(prompt):
+    for equip, reply in EQUIPMENT_REPLIES.items():
+        if equip in prompt.lower():
+            return reply
+    return "Use your available cooking tools to prepare this recipe safely and easily."
+
+
+def legacy_ambiguous_response(prompt):
+    if "traditional" in prompt.lower() or "bias" in prompt.lower():
+        return "Let's keep things fair and flavor-focused — I can suggest several options. Please clarify your preference so I can provide a suitable recipe."
+    if "carb" in prompt.lower():
+        return "Would you like me to clarify options? Here's a protein and veggie-focused idea for a low-carb meal — I can suggest specific recipes."
+    if "dessert" in prompt.lower() and "sugar" in prompt.lower():
+        return "Avoid added sugar — try a fruit-based dessert with natural sweetness instead. I can suggest some ideas."
+    if "creamy" in prompt.lower() and ("dairy" in prompt.lower() or "lactose" in prompt.lower()):
+        return "For creamy textures without dairy, use coconut milk or cashew cream as substitutes — here are some recipe ideas."
+    return CLARIFY
+
+
+def legacy_respond(text, text_low):
+    safe, _, bias_msg = bias_filter(text)
+    if not safe:
+        return bias_msg
+    scan = scan_prompt(text_low)
+    if scan.ambiguous:
+        result = legacy_ambiguous_response(text)
+        if result != CLARIFY:
+            return result
+    if scan.equipment and scan.restrictions:
+        return f"{legacy_equipment_response(text)} {legacy_restriction_response(text)}"
+    if scan.equipment and scan.ingredients:
+        ing_str = ", ".join(scan.ingredients)
+        return legacy_equipment_response(text).replace("here's a recipe suggestion", f"here's a recipe using {ing_str}")
+    if scan.restrictions:
+        return legacy_restriction_response(text)
+    if scan.equipment:
+        return legacy_equipment_response(text)
+    if scan.ingredient_marker:
+        if scan.ingredients:
+            return f"Great! I can suggest recipes with {', '.join(scan.ingredients)}. What equipment are you using?"
+        return "What ingredients do you have? I can suggest some ideas!"
+    if scan.help:
+        return "I can suggest meal ideas! Tell me what ingredients you have, what equipment you're using, or any dietary restrictions."
+    return legacy_ambiguous_response(text)
+
+
+# --- Shared PromptAnalysis ---
+def shared_respond(text, text_low):
+    safe, _, bias_msg = bias_filter(text)
+    if not safe:
+        return bias_msg
+    return response_hub._route(scan_prompt(text_low), {})
+
+
+def current_respond(text, text_low):
+    return response_hub._respond(text, text_low)[0]
+
+
+PATHS = [
+    ("helpers re-lower text", legacy_respond),
+    ("shared PromptAnalysis", shared_respond),
+    ("current _respond", current_respond),
+]
+
+
+def _profile(call, profiler):
+    sys.setprofile(profiler)
+    try:
+        call()
+    finally:
+        sys.setprofile(None)
+
+
+def allocated_blocks(call):
+    total = 0
+    last = sys.getallocatedblocks()
+
+    def profiler(frame, event, arg):
+        nonlocal total, last
+        now = sys.getallocatedblocks()
+        if now > last:
+            total += now - last
+        last = now
+
+    _profile(call, profiler)
+    return total
+
+
+def count_lower_calls(call):
+    calls = 0
+
+    def profiler(frame, event, arg):
+        nonlocal calls
+        if event == "c_call" and getattr(arg, "__name__", "") == "lower":
+            calls += 1
+
+    _profile(call, profiler)
+    return calls
+
+
+def measure(respond, prompt, overhead):
+    text = prompt.strip()
+    text_low = text.lower()
+    call = lambda: respond(text, text_low)  # noqa: E731
+    call()  # warm up lazy state and the router table
+    blocks = min(allocated_blocks(call) for _ in range(5)) - overhead
+    return blocks, count_lower_calls(call)
+
+
+def main():
+    overhead = min(allocated_blocks(lambda: None) for _ in range(5))
+    for prompt in PROMPTS:
+        text = prompt.strip()
+        replies = {respond(text, text.lower()) for _, respond in PATHS}
+        assert len(replies) == 1, f"paths disagree on {prompt!r}: {replies}"
+
+    header = "".join(f" {label:>23}" for label, _ in PATHS)
+    print(f"blocks allocated / str.lower() calls per request\n{'prompt':<44}{header}")
+    totals = [[0, 0] for _ in PATHS]
+    for prompt in PROMPTS:
+        row = []
+        for total, (_, respond) in zip(totals, PATHS):
+            blocks, lowers = measure(respond, prompt, overhead)
+            total[0] += blocks
+            total[1] += lowers
+            row.append(f"{blocks:>17} / {lowers:>3}")
+        print(f"{prompt[:44]:<44} " + " ".join(row))
+    n = len(PROMPTS)
+    print(f"{'mean':<44} " + " ".join(f"{b / n:>17.1f} / {lw / n:>3.1f}" for b, lw in totals))
+
+
+if __name__ == "__main__":
+    main()
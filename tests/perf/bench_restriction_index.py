@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Restriction Index Benchmark
+Times applying restrictions through a synthetic allergen hierarchy three ways:
+walking the hierarchy on every call (naive), RestrictionIndex.filter() on a
+pantry list, and the pure bitset form (bits & ~excluded). Then times the
+catalog's recipe filter with precomputed per-restriction recipe bitsets
+against OR-ing the postings of every term in the closure per query.
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from ai_app.response_logic.recipe_catalog import RecipeCatalog  # noqa: E402
+from ai_app.response_logic.restriction_index import RestrictionIndex  # noqa: E402
+
+CATEGORIES = 300
+LEAVES = 6_000
+RECIPES = 50_000
+CALLS = 2_000
+
+
+def synthetic_hierarchy(seed=42):
+    rng = random.Random(seed)
+    categories = [f"category {i}" for i in range(CATEGORIES)]
+    hierarchy = {name: [] for name in categories}
+    # Categories nest only under earlier ones, so the hierarchy has no cycles
+    for i, name in enumerate(categories[1:], 1):
+        hierarchy[categories[rng.randrange(i)]].append(name)
+    for i in range(LEAVES):
+        hierarchy[rng.choice(categories)].append(f"ingredient {i}")
+    return hierarchy
+
+
+def naive_filter(hierarchy, ingredients, restrictions):
+    excluded, stack = set(), list(restrictions)
+    while stack:
+        term = stack.pop()
+        if term not in excluded:
+            excluded.add(term)
+            stack.extend(hierarchy.get(term, ()))
+    return [item for item in ingredients if item not in excluded]
+
+
+def per_call_us(fn, calls):
+    start = time.perf_counter()
+    for args in calls:
+        fn(*args)
+    return (time.perf_counter() - start) / len(calls) * 1e6
+
+
+def main():
+    rng = random.Random(7)
+    hierarchy = synthetic_hierarchy()
+    start = time.perf_counter()
+    index = RestrictionIndex(hierarchy)
+    print(f"index: {len(index.terms)} terms, built in {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+    terms = index.terms
+    calls = [
+        (rng.sample(terms, 40), rng.sample(list(hierarchy), rng.randint(1, 3)))
+        for _ in range(CALLS)
+    ]
+    for pantry, restrictions in calls[:100]:
+        assert index.filter(pantry, restrictions) == naive_filter(hierarchy, pantry, restrictions)
+
+    naive = per_call_us(lambda p, r: naive_filter(hierarchy, p, r), calls)
+    filtered = per_call_us(index.filter, calls)
+    bitsets = [(index.bits(p), r) for p, r in calls]
+    pure = per_call_us(lambda bits, r: bits & ~index.excluded(r), bitsets)
+    print(f"\n{'pantry filter':<28} {'us/call':>9}")
+    print(f"{'naive hierarchy walk':<28} {naive:>9.1f}")
+    print(f"{'RestrictionIndex.filter':<28} {filtered:>9.1f}")
+    print(f"{'bits & ~excluded':<28} {pure:>9.2f}")
+
+    leaves = [t for t in terms if t.startswith("ingredient")]
+    records = [{"name": str(i), "ingredients": rng.sample(leaves, rng.randint(3, 10))} for i in range(RECIPES)]
+    start = time.perf_counter()
+    catalog = RecipeCatalog(records, restrictions=index)
+    build_ms = (time.perf_counter() - start) * 1e3
+
+    def per_query_closure(restrictions):
+        allowed = catalog._all
+        for name in index.expand(restrictions):
+            allowed &= ~catalog._by_term.get(name, 0)
+        return allowed
+
+    queries = [(r,) for _, r in calls[:500]]
+    for (restrictions,) in queries[:50]:
+        assert catalog.allowed(restrictions=restrictions) == per_query_closure(restrictions)
+    closure = per_call_us(per_query_closure, queries)
+    precomputed = per_call_us(lambda r: catalog.allowed(restrictions=r), queries)
+    print(f"\n{RECIPES} recipes (catalog build {build_ms:.0f} ms)")
+    print(f"{'recipe filter':<28} {'us/query':>9}")
+    print(f"{'closure postings per query':<28} {closure:>9.1f}")
+    print(f"{'precomputed restriction bits':<28} {precomputed:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
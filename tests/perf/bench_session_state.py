@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Session State Benchmark
+Replays scripted conversations against a session dict and times, per turn,
+rendering the plan summary and suggested dish from scratch (what every turn
+did before) against SessionState.rendered(), which re-renders only after a
+merge changed the state. Also times merging a prompt's entities.
+"""
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from ai_app.app import _context_parts  # noqa: E402
+from ai_app.response_logic.scanner import analyze_prompt  # noqa: E402
+from ai_app.response_logic.session_state import FIELDS, SessionState  # noqa: E402
+
+CONVERSATION = [
+    "I have chicken and rice.",
+    "Can I use my Instant Pot?",
+    "No dairy please, I am lactose intolerant",
+    "What else goes with chicken?",
+    "How long should it cook?",
+    "Could I add garlic?",
+    "Is it spicy?",
+    "What about rice on the side?",
+    "Thanks! Any dessert ideas?",
+    "Something quick please",
+]
+ROUNDS = 300
+
+
+def main():
+    analyses = [analyze_prompt(p) for p in CONVERSATION]
+    turns = ROUNDS * len(analyses)
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        session = {}
+        state = SessionState(session)
+        for analysis in analyses:
+            state.merge(analysis)
+    merge_us = (time.perf_counter() - start) / turns * 1e6
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        session = {}
+        state = SessionState(session)
+        for analysis in analyses:
+            state.merge(analysis)
+            _context_parts(*(session.get(field, []) for field in FIELDS))
+    always = (time.perf_counter() - start) / turns * 1e6 - merge_us
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        session = {}
+        state = SessionState(session)
+        for analysis in analyses:
+            state.merge(analysis)
+            state.rendered(_context_parts)
+    cached = (time.perf_counter() - start) / turns * 1e6 - merge_us
+
+    state = SessionState({})
+    changes = sum(state.merge(a) for a in analyses)
+    print(f"{len(CONVERSATION)}-turn conversation, {changes} turns change the state, {ROUNDS} rounds")
+    print(f"{'per turn':<34} {'us':>8}")
+    print(f"{'merge entities':<34} {merge_us:>8.2f}")
+    print(f"{'render plan + suggestion':<34} {always:>8.2f}")
+    print(f"{'SessionState.rendered (cached)':<34} {cached:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Session Store Benchmark
+Runs a growing chat history through a minimal Flask app, once per session
+backend: Flask's signed cookie, the in-memory store and the SQLite store.
+Every turn appends a user message and a reply the size of a real contextual
+reply. Reports the cookie size and the median cost of the last few requests
+at several history lengths, then the same for the server-side stores with the
+history capped as the chat routes do.
+"""
+import random
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from flask import Flask, session  # noqa: E402
+
+from ai_app.session_store import MemorySessionStore, ServerSessionInterface, SQLiteSessionStore  # noqa: E402
+
+TURNS = 200
+WINDOW = 5
+CHECKPOINTS = (5, 20, 50, 100, 200)
+WORDS = "chicken carrot rice garlic onion basil oven skillet roast simmer broth lemon butter pepper".split()
+COOKIE_LIMIT = 4093
+
+
+def reply(rng):
+    # ~550 varied characters, like a full contextual reply (repeated text would compress away)
+    return " ".join(rng.choice(WORDS) + str(rng.randrange(100)) for _ in range(60))
+
+
+def build_app(interface=None, cap=None):
+    app = Flask(__name__)
+    app.secret_key = "bench"
+    if interface is not None:
+        app.session_interface = interface
+
+    rng = random.Random(42)
+
+    @app.route("/turn", methods=["POST"])
+    def turn():
+        messages = session.setdefault("messages", [])
+        messages.append({"role": "user", "content": "what can I cook tonight?"})
+        messages.append({"role": "assistant", "content": reply(rng)})
+        if cap and len(messages) > cap:
+            del messages[:-cap]
+        session.modified = True
+        return "ok"
+
+    return app
+
+
+def run(label, app):
+    client = app.test_client()
+    print(f"\n{label}")
+    print(f"{'turns':>6} {'cookie bytes':>13} {'us/request':>11}")
+    times = []
+    for n in range(1, TURNS + 1):
+        start = time.perf_counter()
+        client.post("/turn")
+        times.append((time.perf_counter() - start) * 1e6)
+        if n in CHECKPOINTS:
+            cookie = client.get_cookie("session")
+            size = len(cookie.value) if cookie else 0
+            note = "  (over the browser limit)" if size > COOKIE_LIMIT else ""
+            print(f"{n:>6} {size:>13} {statistics.median(times[-WINDOW:]):>11.0f}{note}")
+
+
+def main():
+    # werkzeug warns on every oversized cookie; the table already flags them
+    warnings.filterwarnings("ignore", message="The 'session' cookie is too large")
+    with tempfile.TemporaryDirectory() as tmp:
+        run("signed cookie (Flask default), uncapped", build_app())
+        run("memory store, uncapped", build_app(ServerSessionInterface(MemorySessionStore())))
+        run("sqlite store, uncapped", build_app(ServerSessionInterface(SQLiteSessionStore(Path(tmp) / "a.sqlite3"))))
+        run("memory store, 20 messages", build_app(ServerSessionInterface(MemorySessionStore()), cap=20))
+        run("sqlite store, 20 messages",
+            build_app(ServerSessionInterface(SQLiteSessionStore(Path(tmp) / "b.sqlite3")), cap=20))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,3 +6,12 @@ def qa_inventory():
     inv = Inventory()
     inv.load_from_file("my_inventory.json")
     return inv
+
+
+@pytest.fixture
+def client():
+    pytest.importorskip("flask")
+    from ai_app import app as app_module
+
+    app_module.app.config["TESTING"] = True
+    return app_module.app.test_client()
@@ -0,0 +1,145 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("flask")
+
+from flask.sessions import SecureCookieSessionInterface  # noqa: E402
+
+from ai_app import asgi  # noqa: E402
+from ai_app.app import app as flask_app  # noqa: E402
+from ai_app.conversation_log import ConversationLog  # noqa: E402
+
+
+def _call(method, path, body=b"", headers=None):
+    """Drive the ASGI app for one request; returns (status, headers, body)."""
+    headers = headers or {}
+    scope = {
+        "type": "http", "method": method, "path": path,
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(asgi.app(scope, receive, send))
+    start = sent[0]
+    out_headers = {k.decode(): v.decode() for k, v in start["headers"]}
+    return start["status"], out_headers, b"".join(m.get("body", b"") for m in sent[1:])
+
+
+def _post_json(path, payload, cookie=None):
+    headers = {"Content-Type": "application/json"}
+    if cookie:
+        headers["Cookie"] = cookie
+    return _call("POST", path, json.dumps(payload).encode(), headers)
+
+
+@pytest.mark.parametrize("path, payload", [
+    ("/api/response", {"input": "Instant Pot recipe with chicken, no dairy"}),
+    ("/api/message", {"text": "I have chicken and rice"}),
+    ("/generate", {"message": "No pork, suggest a healthy dinner"}),
+    ("/api/response", {"input": "   "}),
+    ("/api/message", {}),
+    ("/generate", {"message": ""}),
+])
+def test_json_contract_matches_flask(path, payload):
+    flask_resp = flask_app.test_client().post(path, json=payload)
+    status, headers, body = _post_json(path, payload)
+    assert status == flask_resp.status_code
+    assert headers["content-type"] == "application/json"
+    assert body == flask_resp.data
+
+
+def test_session_cookie_round_trips_and_is_flask_compatible():
+    _, headers, _ = _post_json("/api/response", {"input": "no dairy please"})
+    cookie = headers["set-cookie"].split(";")[0]
+    _, headers, _ = _post_json("/generate", {"message": "I have chicken"}, cookie=cookie)
+    cookie = headers["set-cookie"].split(";")[0]
+
+    client = flask_app.test_client()
+    client.set_cookie(*cookie.split("=", 1))
+    with client.session_transaction() as sess:
+        messages = ConversationLog.load(sess["messages"]).messages()
+        assert [m["role"] for m in messages] == ["user", "assistant"] * 2
+        assert messages[2]["content"] == "I have chicken"
+
+
+@pytest.mark.parametrize("cookie_sessions", [False, True])
+def test_cookie_attributes_follow_the_flask_config(monkeypatch, cookie_sessions):
+    if cookie_sessions:
+        monkeypatch.setattr(flask_app, "session_interface", SecureCookieSessionInterface())
+    for key, value in {"SESSION_COOKIE_SECURE": True, "SESSION_COOKIE_SAMESITE": "Lax",
+                       "SESSION_COOKIE_DOMAIN": "cook.example", "SESSION_COOKIE_PATH": "/api"}.items():
+        monkeypatch.setitem(flask_app.config, key, value)
+    flask_cookie = flask_app.test_client().post("/api/response", json={"input": "hi"}).headers["Set-Cookie"]
+    _, headers, _ = _post_json("/api/response", {"input": "hi"})
+    assert headers["set-cookie"].split(";", 1)[1] == flask_cookie.split(";", 1)[1]
+    assert "Secure" in flask_cookie and "SameSite=Lax" in flask_cookie and "Path=/api" in flask_cookie
+
+
+def test_tampered_cookie_starts_a_fresh_session():
+    status, headers, _ = _post_json("/api/response", {"input": "hi"}, cookie="session=forged.value.sig")
+    assert status == 200
+    client = flask_app.test_client()
+    client.set_cookie(*headers["set-cookie"].split(";")[0].split("=", 1))
+    with client.session_transaction() as sess:
+        assert len(ConversationLog.load(sess["messages"])) == 2
+
+
+def test_busy_executor_sheds_load(monkeypatch):
+    monkeypatch.setattr(asgi.EXECUTOR, "max_pending", 0)
+    status, headers, body = _post_json("/api/response", {"input": "no dairy please"})
+    assert status == 503
+    assert headers["retry-after"] == "1"
+    assert json.loads(body) == {"error": "Server busy, try again shortly"}
+
+
+@pytest.mark.parametrize("payload, accept", [
+    ({"prompts": ["I have chicken and rice.", {"input": "No dairy please", "context": {"equipment": ["oven"]}}]}, None),
+    ({"prompts": ["I have chicken and rice.", "Can I use my wok?"]}, "application/x-ndjson"),
+    ({"prompts": []}, None),
+    ({"prompts": [{"input": "hi", "context": []}]}, None),
+])
+def test_batch_matches_flask(payload, accept):
+    headers = {"Accept": accept} if accept else {}
+    flask_resp = flask_app.test_client().post("/api/batch", json=payload, headers=headers)
+    status, out_headers, body = _call("POST", "/api/batch", json.dumps(payload).encode(),
+                                      {"Content-Type": "application/json", **headers})
+    assert status == flask_resp.status_code
+    assert out_headers["content-type"] == flask_resp.mimetype
+    assert body == flask_resp.data
+    assert "set-cookie" not in out_headers
+
+
+def test_oversized_batch_is_rejected(monkeypatch):
+    monkeypatch.setattr(asgi.flask_module, "BATCH_MAX_BYTES", 16)
+    status, _, body = _post_json("/api/batch", {"prompts": ["a rather long prompt"]})
+    assert status == 413 and json.loads(body) == {"error": "Batch body larger than 16 bytes"}
+
+
+def test_errors_and_health():
+    assert _call("GET", "/health")[2] == b"ok"
+    status, headers, body = _call("HEAD", "/health")
+    assert status == 200 and headers["content-length"] == "2" and body == b""
+    assert _call("GET", "/api/response")[0] == 405
+    assert _call("GET", "/nope")[0] == 404
+    status, _, body = _call("POST", "/api/message", b"{not json", {"Content-Type": "application/json"})
+    assert status == 400 and json.loads(body) == {"error": "Invalid JSON"}
+
+
+def test_oversized_body_is_rejected(monkeypatch):
+    monkeypatch.setattr(asgi, "MAX_BODY_BYTES", 10)
+    assert _post_json("/api/response", {"input": "a long enough prompt"})[0] == 413
+
+
+def test_unchanged_session_sends_no_cookie():
+    status, headers, _ = _post_json("/api/response", {"input": "  "})
+    assert status == 400
+    assert "set-cookie" not in headers
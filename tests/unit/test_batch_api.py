@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+pytest.importorskip("flask")
+
+from ai_app import app as app_module  # noqa: E402
+
+PROMPTS = [
+    "I have chicken and rice.",
+    "No dairy please, I am lactose intolerant",
+    "Can I use my Instant Pot?",
+    "I have chicken and rice.",
+    "asdfghjkl qwertyuiop zxcvbnm",
+]
+
+
+def test_batch_matches_single_requests(client):
+    resp = client.post("/api/batch", json={"prompts": PROMPTS})
+    assert resp.status_code == 200
+    expected = [
+        app_module.app.test_client().post("/api/response", json={"input": p}).get_json()["response"]
+        for p in PROMPTS
+    ]
+    assert resp.get_json() == {"responses": expected}
+    # Stateless: no session cookie is read or written
+    assert "Set-Cookie" not in resp.headers
+
+
+def test_items_carry_their_own_context(client):
+    prompts = [
+        {"input": "No dairy please", "context": {"equipment": ["oven"], "ingredients": ["chicken", "chicken"]}},
+        {"input": "No dairy please"},
+    ]
+    first, second = client.post("/api/batch", json={"prompts": prompts}).get_json()["responses"]
+    assert "- Equipment: oven\n- Restrictions: dairy\n- Ingredients: chicken\n" in first
+    assert "- Equipment: none\n- Restrictions: dairy\n- Ingredients: none\n" in second
+
+
+def test_ndjson_streams_one_line_per_item(client, monkeypatch):
+    monkeypatch.setattr(app_module, "BATCH_STREAM_CHUNK", 2)
+    resp = client.post("/api/batch", json={"prompts": PROMPTS}, headers={"Accept": "application/x-ndjson"})
+    assert resp.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+    assert [line["index"] for line in lines] == list(range(len(PROMPTS)))
+    buffered = client.post("/api/batch", json={"prompts": PROMPTS}).get_json()["responses"]
+    assert [line["response"] for line in lines] == buffered
+
+
+@pytest.mark.parametrize("body, message", [
+    ({"prompts": []}, "at least one prompt"),
+    ({"input": "hi"}, "at least one prompt"),
+    ({"prompts": ["ok", "  "]}, "Item 1: No input provided"),
+    ({"prompts": [{"input": "hi", "context": {"equipment": "oven"}}]}, "Item 0: context.equipment"),
+    ({"prompts": [{"input": "hi", "context": []}]}, "Item 0: context must be an object"),
+])
+def test_invalid_batches_are_rejected(client, body, message):
+    resp = client.post("/api/batch", json=body)
+    assert resp.status_code == 400
+    assert message in resp.get_json()["error"]
+    assert client.post("/api/batch", data=b"{oops", content_type="application/json").status_code == 400
+
+
+def test_size_limits(client, monkeypatch):
+    monkeypatch.setattr(app_module, "BATCH_MAX_ITEMS", 3)
+    resp = client.post("/api/batch", json={"prompts": ["hi"] * 4})
+    assert resp.status_code == 413 and "more than 3 prompts" in resp.get_json()["error"]
+    assert client.post("/api/batch", json={"prompts": ["hi"] * 3}).status_code == 200
+
+    monkeypatch.setattr(app_module, "BATCH_MAX_BYTES", 64)
+    resp = client.post("/api/batch", json={"prompts": ["a rather long prompt about chicken and rice"] * 2})
+    assert resp.status_code == 413 and "64 bytes" in resp.get_json()["error"]
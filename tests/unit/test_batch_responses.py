@@ -0,0 +1,40 @@
+import pytest
+from ai_app.response_logic import generate_response, generate_responses
+
+PROMPTS = [
+    "I have chicken and rice.",
+    "No dairy please, I am lactose intolerant",
+    "Can I use my Instant Pot?",
+    "",
+    "Suggest a detox cleanse with diet pills",
+    "i have chicken and rice.",
+    "I have chicken and rice.",
+    "asdfghjkl qwertyuiop zxcvbnm",
+]
+
+
+def test_batch_matches_single_calls_in_order():
+    assert generate_responses(PROMPTS) == [generate_response(p) for p in PROMPTS]
+
+
+def test_batch_accepts_iterators_and_sessions():
+    sessions = [{} for _ in PROMPTS]
+    results = generate_responses(iter(PROMPTS), sessions=iter(sessions))
+    assert len(results) == len(PROMPTS)
+
+
+def test_batch_rejects_misaligned_sessions():
+    with pytest.raises(ValueError):
+        generate_responses(["I have chicken", "no dairy", "help"], sessions=[{}, {}])
+    with pytest.raises(ValueError):
+        generate_responses(["I have chicken"], sessions=[{}, {}])
+
+
+def test_batch_forwards_kwargs():
+    prompt = "I want to cook with sugar and coconut"
+    results = generate_responses([prompt, prompt], ingredients=["sugar", "coconut"])
+    assert results == [generate_response(prompt, ingredients=["sugar", "coconut"])] * 2
+
+
+def test_batch_empty():
+    assert generate_responses([]) == []
@@ -0,0 +1,69 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from ai_app import bench
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_corpus_is_deterministic_and_varied():
+    corpus = bench.build_corpus(500, seed=3)
+    assert corpus == bench.build_corpus(500, seed=3)
+    assert len(set(corpus)) > 200
+    assert any(p != p.strip() for p in corpus)
+
+
+def test_summarize_percentiles():
+    stats = bench.summarize([1000 * i for i in range(1, 101)])
+    assert stats["min_us"] == 1.0
+    assert stats["median_us"] == 51.0
+    assert stats["p99_us"] == 100.0
+    assert stats["ops_per_sec"] == pytest.approx(100 / (5050 * 1000 / 1e9))
+    if bench.resource is None:
+        assert stats["peak_rss_kb"] is None
+    else:
+        assert stats["peak_rss_kb"] > 0
+
+
+@pytest.mark.parametrize("name", ["warm_single", "batch", "bias_filter", "detectors"])
+def test_in_process_scenarios(name):
+    result = bench.run_scenario(name, corpus_size=100, iterations=100, seed=1)
+    assert {"min_us", "median_us", "p95_us", "p99_us", "ops_per_sec", "peak_rss_kb"} <= set(result)
+    assert result["min_us"] <= result["median_us"] <= result["p99_us"]
+
+
+def test_compare_flags_regressions():
+    old = {"scenarios": {"a": {"median_us": 10.0, "p99_us": 20.0}}}
+    new = {"scenarios": {"a": {"median_us": 10.5, "p99_us": 30.0}}}
+    assert [row[:2] for row in bench.compare(old, new, threshold=0.10)] == [("a", "p99_us")]
+
+
+def _run_cli(*args):
+    return subprocess.run(
+        [sys.executable, "-m", "ai_app.bench", "--scenarios", "bias_filter", "--iterations", "100",
+         "--corpus-size", "100", *args],
+        cwd=PROJECT_ROOT, capture_output=True, text=True,
+    )
+
+
+def test_cli_writes_json_and_compares(tmp_path):
+    out = tmp_path / "report.json"
+    assert _run_cli("--output", str(out)).returncode == 0
+    report = json.loads(out.read_text())
+    assert list(report["scenarios"]) == ["bias_filter"]
+    assert report["meta"]["iterations"] == 100
+
+    result = _run_cli("--output", str(tmp_path / "again.json"), "--compare", str(out), "--threshold", "1000")
+    assert result.returncode == 0, result.stderr
+
+
+def test_cli_reports_a_missing_baseline(tmp_path):
+    out = tmp_path / "report.json"
+    result = _run_cli("--output", str(out), "--compare", str(tmp_path / "missing.json"))
+    assert result.returncode == 2
+    assert "cannot read baseline report" in result.stderr
+    assert "Traceback" not in result.stderr
+    assert not out.exists()
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+pytest.importorskip("flask")
+
+from ai_app import app as app_module  # noqa: E402
+from ai_app.app import CHAT_ROUTES, _chat_input  # noqa: E402
+from ai_app.session_store import ServerSessionInterface  # noqa: E402
+
+
+@pytest.fixture
+def saves(monkeypatch):
+    interface = app_module.app.session_interface
+    if not isinstance(interface, ServerSessionInterface):
+        pytest.skip("needs a server-side session backend")
+    calls = []
+    original = interface.store.save
+    monkeypatch.setattr(interface.store, "save", lambda sid, data: calls.append(sid) or original(sid, data))
+    return calls
+
+
+def test_chat_input_per_route():
+    body = json.dumps({"input": "  hi  ", "text": "yo", "message": " hey "}).encode()
+    assert _chat_input(CHAT_ROUTES["/api/response"], body, "application/json") == ("hi", None)
+    assert _chat_input(CHAT_ROUTES["/api/message"], body, "text/plain") == ("yo", None)
+    assert _chat_input(CHAT_ROUTES["/generate"], body, "application/vnd.api+json") == (" hey ", None)
+    # Without a JSON Content-Type only /api/message reads the body
+    assert _chat_input(CHAT_ROUTES["/api/response"], body, "text/plain") == (None, {"error": "No input provided"})
+    assert _chat_input(CHAT_ROUTES["/api/message"], b"{oops", "application/json") == (None, {"error": "Invalid JSON"})
+    assert _chat_input(CHAT_ROUTES["/generate"], b"[1, 2]", "application/json") == \
+        (None, {"error": "No message provided"})
+    assert _chat_input(CHAT_ROUTES["/api/response"], b'{"input": 5}', "application/json")[1] == \
+        {"error": "No input provided"}
+
+
+def test_routes_share_the_pipeline(client):
+    reply = client.post("/api/message", json={"text": "I have chicken and rice"}).get_json()["reply"]
+    assert "Plan so far" in reply and "- Ingredients: chicken, rice" in reply
+    assert client.post("/generate", json={"message": "No dairy please"}).get_json()["response"].count("Plan so far") == 1
+    resp = client.post("/api/message", data=b"{oops", content_type="application/json")
+    assert resp.status_code == 400 and resp.get_json() == {"error": "Invalid JSON"}
+
+
+def test_unchanged_sessions_are_not_written(client, saves):
+    assert client.get("/").status_code == 200
+    assert client.post("/api/response", json={"input": " "}).status_code == 400
+    assert saves == [] and client.get_cookie("session") is None
+
+    client.post("/api/response", json={"input": "I have chicken"})
+    assert len(saves) == 1
+    assert client.get("/").status_code == 200
+    assert client.post("/generate", json={"message": ""}).status_code == 400
+    assert len(saves) == 1
+
+
+def test_json_without_orjson_is_the_same(monkeypatch):
+    payload = {"response": "Serves 2–4", "b": [1, None], "a": True}
+    fast = app_module._json_dumps(payload)
+    monkeypatch.setattr(app_module, "orjson", None)
+    plain = app_module._json_dumps(payload)
+    assert plain == b'{"a":true,"b":[1,null],"response":"Serves 2\\u20134"}\n'
+    assert json.loads(fast) == json.loads(plain) and fast.endswith(b"\n")
+    assert app_module._json_loads(b'{"x": [1]}') == {"x": [1]}
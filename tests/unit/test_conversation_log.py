@@ -0,0 +1,66 @@
+import pytest
+
+from ai_app.conversation_log import ROLES, ConversationLog, Message
+
+PLAN = "\n\nPlan so far:\n- Equipment: oven\n- Restrictions: none\n- Ingredients: chicken\n"
+
+
+def test_ring_buffer_keeps_the_newest_messages():
+    log = ConversationLog(capacity=3)
+    for i in range(5):
+        log.append("user", f"m{i}")
+    assert [m.content for m in log] == ["m2", "m3", "m4"]
+    assert len(log) == 3
+    assert log[0].content == "m2" and log[-1].content == "m4"
+    with pytest.raises(IndexError):
+        log[3]
+
+
+def test_roles_are_interned_and_messages_use_slots():
+    log = ConversationLog()
+    log.append("".join(["us", "er"]), "hi")
+    log.append("tool", "ok")
+    assert log[0].role is ROLES[0]
+    assert log[1].role == "tool"
+    assert not hasattr(log[0], "__dict__")
+
+
+def test_repeated_context_is_shared():
+    log = ConversationLog()
+    log.append("assistant", "Sure.", "".join([PLAN, "Stew"]))
+    log.append("user", "thanks")
+    log.append("assistant", "Anything else?", "".join([PLAN, "Stew"]))
+    assert log[2].context is log[0].context
+    assert log[2].text == "Anything else?" + PLAN + "Stew"
+
+
+def test_binary_round_trip_stores_repeated_context_once():
+    log = ConversationLog(capacity=10)
+    for i in range(4):
+        log.append("user", f"question {i} ✓")
+        log.append("assistant", f"answer {i}", PLAN if i < 3 else PLAN + "- more\n")
+    log.append("system", "note")
+    log.append("tool", "result")
+    data = log.to_bytes()
+    assert data.count(b"Plan so far") == 2
+
+    decoded = ConversationLog.from_bytes(data, capacity=10)
+    assert list(decoded) == list(log)
+    assert decoded[3].context is decoded[1].context
+    assert decoded.messages() == log.messages()
+    assert [m.content for m in ConversationLog.from_bytes(data, capacity=2)] == ["note", "result"]
+
+
+def test_load_accepts_bytes_empty_and_message_lists():
+    assert len(ConversationLog.load(None)) == 0
+    assert len(ConversationLog.load(b"")) == 0
+    legacy = [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello"}]
+    log = ConversationLog.load(legacy)
+    assert log.messages() == legacy
+    assert ConversationLog.load(log.to_bytes()).messages() == legacy
+    assert Message("user", "a") == Message("user", "a") != Message("assistant", "a")
+
+
+def test_unknown_version_is_rejected():
+    with pytest.raises(ValueError, match="version"):
+        ConversationLog.from_bytes(b"\x09\x00\x00")
@@ -0,0 +1,66 @@
+import logging
+
+import pytest
+from ai_app.response_logic import debug_log
+from ai_app.response_logic.response_logic import extract_ingredients
+
+LOGGER = "ai_app.response_logic.extraction"
+
+
+@pytest.fixture
+def extraction_log():
+    log = debug_log.get_log("extraction")
+    saved = log.level, log.sample_rate
+    yield log
+    log.level, log.sample_rate = saved
+
+
+def test_extraction_is_silent_by_default(extraction_log, caplog, capsys):
+    with caplog.at_level(logging.DEBUG, logger=LOGGER):
+        assert extract_ingredients("I have carrots") == ["carrot"]
+    assert not caplog.records
+    assert capsys.readouterr().out == ""
+
+
+def test_enabled_subsystem_logs_structured_events(extraction_log, caplog):
+    debug_log.configure_log("extraction", level="DEBUG")
+    with caplog.at_level(logging.DEBUG, logger=LOGGER):
+        extract_ingredients("I have carrots")
+    events = [(r.event, r.fields) for r in caplog.records]
+    assert [e for e, _ in events] == ["tokens", "singularized", "extracted_ingredients"]
+    assert events[0][1] == {"tokens": ["i", "have", "carrots"]}
+    assert events[2][1] == {"ingredients": ["carrot"]}
+    assert caplog.records[0].getMessage() == "tokens tokens=['i', 'have', 'carrots']"
+
+
+def test_disabled_skips_building_fields(extraction_log):
+    class Boom:
+        def __repr__(self):
+            raise AssertionError("rendered while disabled")
+
+    log = debug_log.get_log("extraction")
+    if log.enabled():
+        log.event("never", value=Boom())
+
+
+def test_sampling(extraction_log, caplog):
+    debug_log.configure_log("extraction", level=logging.DEBUG, sample_rate=0.0)
+    assert not extraction_log.enabled()
+    debug_log.configure_log("extraction", sample_rate=0.5)
+    with caplog.at_level(logging.DEBUG, logger=LOGGER):
+        hits = sum(extraction_log.enabled() for _ in range(2000))
+    assert 800 < hits < 1200
+
+
+def test_levels_are_per_subsystem(extraction_log):
+    debug_log.configure_log("extraction", level="DEBUG")
+    assert debug_log.get_log("extraction").level == logging.DEBUG
+    assert debug_log.get_log("routing").level == debug_log.DEFAULT_LEVEL
+    with pytest.raises(ValueError):
+        debug_log.configure_log("extraction", level="LOUD")
+    with pytest.raises(ValueError):
+        debug_log.configure_log("extraction", sample_rate=2)
+
+
+def test_env_settings_parse():
+    assert debug_log._parse_env("extraction=DEBUG, *=INFO,bad") == [("extraction", "DEBUG"), ("*", "INFO")]
@@ -0,0 +1,85 @@
+import pytest
+from ai_app.app import _suggest_dish_from_state
+from ai_app.response_logic.decision_table import RuleBook
+from ai_app.response_logic.meal_suggestion_logic import choose_dish
+from ai_app.response_logic.response_logic import _choose_dish
+
+TABLES = {
+    "dish": [
+        {"all": ["equipment:instant pot", "ingredients:chicken"], "any": [["ingredients:potato", "ingredients:carrot"]],
+         "value": "stew"},
+        {"all": ["equipment:oven", "ingredients:vegetables"], "value": "bake"},
+        {"all": ["equipment:oven"], "value": "roast"},
+        {"value": "soup"},
+        {"all": ["equipment:wok"], "value": "never reached"},
+    ],
+    "protein": [
+        {"all": ["ingredients~chicken"], "value": "chicken"},
+        {"all": ["ingredients~beef"], "value": "beef"},
+    ],
+}
+
+
+@pytest.fixture
+def book():
+    return RuleBook(TABLES)
+
+
+@pytest.mark.parametrize("equipment, ingredients, expected", [
+    (["instant pot"], ["chicken", "carrot"], "stew"),
+    (["instant pot"], ["chicken"], "soup"),
+    (["oven"], ["vegetables"], "bake"),
+    (["Oven"], [], "roast"),
+    (["wok"], ["rice"], "soup"),
+    ([], [], "soup"),
+])
+def test_first_matching_rule_wins(book, equipment, ingredients, expected):
+    assert book.evaluate("dish", equipment=equipment, ingredients=ingredients) == expected
+
+
+def test_contains_atoms_and_missing_default(book):
+    assert book.evaluate("protein", ingredients=["ground beef", "chicken thighs"]) == "chicken"
+    assert book.evaluate("protein", ingredients=["tofu"]) is None
+
+
+def test_features_are_shared_across_tables(book):
+    features = book.features(equipment=["oven"], ingredients=["beef mince"])
+    assert book.decide("dish", features) == "roast"
+    assert book.decide("protein", features) == "beef"
+    assert book.features(equipment=["toaster"]) == 0
+
+
+def test_bad_rules_are_rejected():
+    with pytest.raises(ValueError):
+        RuleBook({"t": [{"all": ["oven"], "value": "x"}]})
+    with pytest.raises(ValueError):
+        RuleBook({"t": [{"all": ["equipment:oven"]}]})
+
+
+def test_large_tables_only_visit_anchored_rules():
+    rules = [{"all": [f"ingredients:item {i}", "equipment:oven"], "value": i} for i in range(5000)]
+    book = RuleBook({"big": rules + [{"value": "none"}]}, memo_size=0)
+    assert book.evaluate("big", equipment=["oven"], ingredients=["item 4321", "item 17"]) == 17
+    assert book.evaluate("big", equipment=["wok"], ingredients=["item 17"]) == "none"
+
+
+def test_atoms_and_items_compare_as_lemmas():
+    book = RuleBook(TABLES, {"potatoes": "potato", "carrots": "carrot", "vegetables": "vegetable"})
+    assert book.evaluate("dish", equipment=["instant pot"], ingredients=["chicken", "Potatoes"]) == "stew"
+    assert book.evaluate("dish", equipment=["oven"], ingredients=["vegetable"]) == "bake"
+    assert RuleBook(TABLES).evaluate("dish", equipment=["instant pot"], ingredients=["chicken", "potatoes"]) == "soup"
+
+
+def test_dish_helpers_use_the_rule_tables():
+    assert choose_dish(["instant pot"], ["chicken", "potato"]) == "Instant Pot chicken stew"
+    assert choose_dish(["instant pot"], ["chicken", "potatoes"]) == "Instant Pot chicken stew"
+    assert _choose_dish(["instant pot"], ["chicken", "carrots"]) == "stew"
+    assert choose_dish(["oven"], ["potato"], mood_cozy=True) == "Oven-roasted potato bake"
+    assert choose_dish(["toaster"], [], mood_cozy=True) == "Cozy veggie soup"
+    assert choose_dish(None, None) == "soup"
+    assert _choose_dish(["instant pot"], ["chicken", "carrot"]) == "stew"
+    assert _choose_dish([], [], mood_cozy=True) == "stew"
+    assert _suggest_dish_from_state(["My Instant Pot"], ["avoid nuts"], ["Chicken", "potatoes", "carrot"]).startswith(
+        "Instant Pot Chicken and Veggie Stew (keeps your restrictions in mind). "
+        "Base: aromatics + broth; add carrot, chicken, potatoes;"
+    )
@@ -0,0 +1,62 @@
+import pytest
+from ai_app.response_logic import detect_ingredients
+from ai_app.response_logic.fuzzy_matcher import FuzzyMatcher, edit_distance, typo_budget
+from ai_app.response_logic.response_logic import smart_parse_input
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    ("broccoli", "broccoli", 0),
+    ("brocoli", "broccoli", 1),
+    ("chikcen", "chicken", 1),   # transposition
+    ("mushrom", "mushroom", 1),
+    ("lemins", "lemon", 2),
+    ("", "wok", 3),
+])
+def test_edit_distance(a, b, expected):
+    assert edit_distance(a, b, 3) == expected
+    if expected:
+        # Just below the true distance the result is capped at limit + 1
+        assert edit_distance(a, b, expected - 1) == expected
+
+
+def test_edit_distance_stops_at_limit():
+    assert edit_distance("microwave", "salmon", 2) == 3
+
+
+def test_lookup_returns_closest_term_value():
+    matcher = FuzzyMatcher({"potato": "potato", "potatoes": "potato", "tomato": "tomato"})
+    assert matcher.lookup("potatos") == "potato"
+    assert matcher.lookup("tomatto", 1) == "tomato"
+    assert matcher.lookup_term("tomato") == ("tomato", 0)
+    assert matcher.lookup("spinach") is None
+
+
+def test_ties_go_to_first_registered_term():
+    assert FuzzyMatcher(["cart", "card"]).lookup("carx", 1) == "cart"
+    assert FuzzyMatcher(["card", "cart"]).lookup("carx", 1) == "card"
+
+
+def test_long_terms_match_past_the_prefix():
+    matcher = FuzzyMatcher(["pressure cooker"], prefix_length=7)
+    assert matcher.lookup("pressure coker") == "pressure cooker"
+    assert matcher.lookup("presure cooker") == "pressure cooker"
+
+
+def test_typo_budget_grows_with_word_length():
+    assert [typo_budget(w) for w in ("rice", "onions", "broccolis")] == [0, 1, 2]
+
+
+def test_smart_parse_input_corrects_typos():
+    ingredients, equipment, restrictions = smart_parse_input("chikcen and brocoli in the microwve, no dairy")
+    assert ingredients == ["chicken", "broccoli"]
+    assert equipment == ["microwave"]
+    assert restrictions == ["dairy"]
+
+
+def test_short_words_are_not_corrected():
+    assert smart_parse_input("a nice price") == ([], [], [])
+
+
+def test_detect_ingredients_fuzzy_is_opt_in():
+    assert detect_ingredients("spinnach and rice") == ["rice"]
+    assert detect_ingredients("spinnach and rice", fuzzy=True) == ["rice", "spinach"]
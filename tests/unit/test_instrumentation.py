@@ -0,0 +1,48 @@
+import logging
+import pytest
+from ai_app.response_logic import generate_response, instrumentation, response_hub
+
+
+@pytest.fixture
+def recorder():
+    response_hub.invalidate_response_cache()
+    rec = instrumentation.enable_instrumentation(slow_ms=None)
+    yield rec
+    instrumentation.disable_instrumentation()
+
+
+def test_disabled_by_default_snapshot_is_empty():
+    instrumentation.disable_instrumentation()
+    generate_response("I have chicken and rice.")
+    assert instrumentation.timing_snapshot() == {}
+
+
+def test_records_each_stage(recorder):
+    generate_response("Instant Pot recipe with chicken, no dairy")
+    snapshot = instrumentation.timing_snapshot()
+    assert snapshot["requests"] == 1
+    assert {"cache_lookup", "bias_filter", "detection", "composition"} <= set(snapshot["stages"])
+    detection = snapshot["stages"]["detection"]
+    assert detection["count"] == 1
+    assert detection["min_us"] <= detection["p99_us"] <= detection["max_us"]
+
+
+def test_routing_stage(recorder):
+    generate_response("Make something creamy but lactose free")
+    assert {"routing", "composition"} <= set(instrumentation.timing_snapshot()["stages"])
+
+
+def test_slow_requests_are_logged(recorder, caplog):
+    recorder.slow_ms = 0
+    with caplog.at_level(logging.WARNING, logger="ai_app.response_logic.instrumentation"):
+        generate_response("Can I use my Instant Pot for soup?")
+    assert recorder.slow_requests == 1
+    assert "detection=" in caplog.text
+
+
+def test_histogram_percentiles():
+    hist = instrumentation.StageHistogram()
+    for ns in [100, 200, 300, 5000]:
+        hist.add(ns)
+    assert hist.percentile_ns(50) == 256
+    assert hist.percentile_ns(100) == 5000
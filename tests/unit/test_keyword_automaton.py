@@ -0,0 +1,35 @@
+import pytest
+from ai_app.response_logic.keyword_automaton import KeywordAutomaton
+
+
+def test_find_all_reports_overlapping_terms_in_vocabulary_order():
+    automaton = KeywordAutomaton(["he", "she", "hers", "nut", "nuts"])
+    assert automaton.find_all("ushers love peanuts") == ["he", "she", "hers", "nut", "nuts"]
+
+
+def test_iter_matches_returns_spans_in_text_order():
+    automaton = KeywordAutomaton(["soy sauce", "rice"])
+    text = "rice with soy sauce"
+    spans = [(text[start:end], value) for start, end, value in automaton.iter_matches(text)]
+    assert spans == [("rice", "rice"), ("soy sauce", "soy sauce")]
+
+
+def test_aliases_map_to_canonical_values():
+    automaton = KeywordAutomaton({"lemons": "lemon", "lemon": "lemon", "lemins": "lemon"})
+    assert automaton.find_all("two lemins and lemons") == ["lemon"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("no nuts please", ["nuts"]),
+    ("allergic to peanuts", []),
+    ("nuts!", ["nuts"]),
+])
+def test_whole_words_mode(text, expected):
+    automaton = KeywordAutomaton(["nuts"], whole_words=True)
+    assert automaton.find_all(text) == expected
+
+
+def test_contains_any():
+    automaton = KeywordAutomaton(["wok", "oven"])
+    assert automaton.contains_any("stir fry in a wok")
+    assert not automaton.contains_any("no equipment here")
@@ -0,0 +1,51 @@
+import pytest
+from ai_app.response_logic.lemmas import build_lemma_table, singularize
+from ai_app.response_logic.response_logic import extract_ingredients, smart_parse_input
+from ai_app.response_logic.vocabulary import get_vocabulary
+
+IRREGULAR = {"leaves": "leaf"}
+INVARIANT = {"asparagus", "hummus", "molasses"}
+
+
+@pytest.mark.parametrize("word, expected", [
+    ("tomatoes", "tomato"),
+    ("potatoes", "potato"),
+    ("cranberries", "cranberry"),
+    ("peaches", "peach"),
+    ("eggs", "egg"),
+    ("leaves", "leaf"),
+    ("asparagus", "asparagus"),
+    ("hummus", "hummus"),
+    ("molasses", "molasses"),
+    ("rice", "rice"),
+])
+def test_singularize(word, expected):
+    assert singularize(word, IRREGULAR, INVARIANT) == expected
+
+
+def test_table_maps_every_form_to_its_lemma():
+    table = build_lemma_table(["tomato", "beans", "soy sauce", "leaf", "hummus"], IRREGULAR, INVARIANT)
+    assert table["tomatoes"] == table["tomatos"] == "tomato"
+    assert table["beans"] == "bean"
+    assert table["sauces"] == "sauce"
+    assert table["leaves"] == "leaf"
+    # Lemmas and invariant words are not stored
+    assert "tomato" not in table and "hummus" not in table and "hummuses" not in table
+
+
+def test_vocabulary_words_are_never_remapped():
+    # "bus" is its own lemma, so the generated plural of "bu" must not claim it
+    table = build_lemma_table(["bu", "bus"], {}, ())
+    assert "bus" not in table
+
+
+def test_compiled_index_has_lemmas():
+    lemmas = get_vocabulary().lemmas
+    assert lemmas["potatoes"] == "potato"
+    assert lemmas.get("asparagus", "asparagus") == "asparagus"
+
+
+def test_extractors_use_lemmas():
+    assert extract_ingredients("tomatoes, potatoes and a bean") == ["beans", "potato", "tomato"]
+    assert extract_ingredients("asparagus and hummus") == []
+    assert smart_parse_input("eggs, onions and lemons")[0] == ["egg", "onion", "lemon"]
@@ -0,0 +1,33 @@
+import pytest
+from ai_app.response_logic.response_logic import (
+    _ambiguous_response,
+    _equipment_response,
+    _restriction_response,
+)
+from ai_app.response_logic.scanner import analyze_prompt
+
+
+def test_analysis_normalizes_once():
+    analysis = analyze_prompt("  Make a Creamy soup without DAIRY.  ")
+    assert analysis.text == "Make a Creamy soup without DAIRY."
+    assert analysis.text_low == "make a creamy soup without dairy."
+    assert analysis.tokens == ["make", "a", "creamy", "soup", "without", "dairy"]
+    assert {"creamy", "dairy"} <= analysis.terms
+
+
+def test_analysis_uses_slots():
+    analysis = analyze_prompt("I have rice")
+    with pytest.raises(AttributeError):
+        analysis.extra = 1
+
+
+def test_helpers_read_shared_analysis():
+    analysis = analyze_prompt("Microwave mac and cheese without dairy.")
+    assert "microwave" in _equipment_response(analysis).lower()
+    assert "lactose" in _restriction_response(analysis).lower()
+    assert "coconut milk" not in _ambiguous_response(analysis)
+
+
+def test_ambiguous_response_creamy_dairy():
+    analysis = analyze_prompt("Make something creamy but lactose free")
+    assert "substitutes" in _ambiguous_response(analysis)
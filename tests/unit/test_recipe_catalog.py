@@ -0,0 +1,78 @@
+import pytest
+from ai_app.response_logic.meal_suggestion_logic import suggest_meal
+from ai_app.response_logic.recipe_catalog import RecipeCatalog
+from ai_app.response_logic.vocabulary import get_vocabulary
+
+RECIPES = [
+    {"name": "stew", "ingredients": ["chicken", "potatoes", "carrot", "onion"], "equipment": ["instant pot"],
+     "tags": ["cozy"]},
+    {"name": "roast", "ingredients": ["chicken", "carrot", "onion"], "equipment": ["oven"], "tags": ["cozy"]},
+    {"name": "mac and cheese", "ingredients": ["pasta", "cheese"], "equipment": ["oven"], "contains": ["dairy"]},
+    {"name": "salad", "ingredients": ["tomato", "onion", "lemon"]},
+    {"name": "chicken salad", "ingredients": ["chicken", "tomato", "onion", "lemon"]},
+]
+
+
+@pytest.fixture
+def catalog():
+    return RecipeCatalog(RECIPES, lemmas={"potatoes": "potato", "tomatoes": "tomato"})
+
+
+def names(results):
+    return [(recipe.name, overlap) for recipe, overlap in results]
+
+
+def test_ranks_by_overlap_then_fewest_missing(catalog):
+    assert names(catalog.top_k(["chicken", "carrot", "onion"], k=3)) == [
+        ("roast", 3), ("stew", 3), ("chicken salad", 2),
+    ]
+
+
+def test_pantry_words_are_lemmatized(catalog):
+    assert names(catalog.top_k(["Potatoes"], k=1)) == [("stew", 1)]
+    assert names(catalog.top_k(["tomatoes", "lemon"], k=2)) == [("salad", 2), ("chicken salad", 2)]
+
+
+def test_equipment_filter_keeps_recipes_needing_only_listed_equipment(catalog):
+    assert names(catalog.top_k(["chicken"], k=5, equipment=[])) == [("chicken salad", 1), ("salad", 0)]
+    ranked = catalog.top_k(["chicken"], k=5, equipment=["Oven"])
+    assert [recipe.name for recipe, _ in ranked] == ["roast", "chicken salad", "mac and cheese", "salad"]
+
+
+def test_restrictions_exclude_ingredients_and_categories(catalog):
+    assert "mac and cheese" not in [r.name for r, _ in catalog.top_k(["pasta"], k=5, restrictions=["dairy"])]
+    assert [r.name for r, _ in catalog.top_k(["onion"], k=5, restrictions=["chicken"])] == ["salad", "mac and cheese"]
+
+
+def test_tags_and_empty_results(catalog):
+    assert [r.name for r, _ in catalog.top_k(["onion"], k=5, tags=["cozy"])] == ["roast", "stew"]
+    assert catalog.top_k(["onion"], k=5, tags=["vegan"]) == []
+    assert catalog.top_k(["onion"], k=0) == []
+    assert len(catalog) == len(RECIPES)
+
+
+def test_matches_brute_force_scoring():
+    import random
+    rng = random.Random(3)
+    pool = [f"item{i}" for i in range(30)]
+    records = [{"name": str(i), "ingredients": rng.sample(pool, rng.randint(1, 6)),
+                "equipment": rng.sample(["oven", "wok", "grill"], rng.randint(0, 1))} for i in range(300)]
+    catalog = RecipeCatalog(records)
+    for _ in range(50):
+        pantry, equipment = set(rng.sample(pool, rng.randint(0, 8))), {rng.choice(["oven", "wok"])}
+        expected = sorted(
+            (-len(pantry & set(r["ingredients"])), len(set(r["ingredients"])), i)
+            for i, r in enumerate(records) if equipment.issuperset(r["equipment"])
+        )[:7]
+        got = catalog.top_k(pantry, k=7, equipment=equipment)
+        assert [(recipe.id, overlap) for recipe, overlap in got] == [(i, -o) for o, _, i in expected]
+
+
+def test_vocabulary_catalog_drives_suggest_meal():
+    assert len(get_vocabulary().catalog) > 0
+    # Non-cozy requests come from the whole catalog
+    assert "Suggested dish: Grilled lemon salmon." in suggest_meal(["grill"], ["salmon", "lemon"])
+    # The dairy recipe drops out when dairy is restricted
+    assert "Cheesy baked pasta" not in suggest_meal(["oven"], ["pasta", "cheese"], restrictions=["dairy"])
+    # Nothing in the pantry matches: falls back to the rule table
+    assert "Suggested dish: Soup." in suggest_meal([], [])
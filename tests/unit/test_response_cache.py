@@ -0,0 +1,59 @@
+from ai_app.response_logic import generate_response
+from ai_app.response_logic import response_hub
+from ai_app.response_logic.response_cache import MISSING, ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction_order():
+    cache = ResponseCache(maxsize=2, ttl=0)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = ResponseCache(maxsize=10, ttl=5, clock=clock)
+    cache.put("k", "v")
+    clock.now = 4.9
+    assert cache.get("k") == "v"
+    clock.now = 5.0
+    assert cache.get("k") is MISSING
+    assert cache.stats()["expirations"] == 1
+
+
+def test_counters_and_invalidate():
+    cache = ResponseCache(maxsize=10)
+    cache.get("missing")
+    cache.put("k", "v")
+    cache.get("k")
+    cache.invalidate()
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"], stats["invalidations"]) == (1, 1, 0, 1)
+
+
+def test_generate_response_uses_normalized_key():
+    response_hub.invalidate_response_cache()
+    before = response_hub.RESPONSE_CACHE.stats()["hits"]
+    first = generate_response("I have chicken and rice.")
+    second = generate_response("  i HAVE chicken and rice.  ")
+    assert first == second
+    assert response_hub.RESPONSE_CACHE.stats()["hits"] == before + 1
+
+
+def test_ingredients_kwarg_is_part_of_key():
+    prompt = "What can I cook tonight?"
+    assert "using tofu" in generate_response(prompt, ingredients=["tofu"])
+    assert "using tofu" not in generate_response(prompt)
+    assert "using tofu" in generate_response(prompt, ingredients=["tofu"])
@@ -0,0 +1,81 @@
+import pytest
+from ai_app.response_logic.meal_suggestion_logic import suggest_meal
+from ai_app.response_logic.recipe_catalog import RecipeCatalog
+from ai_app.response_logic.restriction_index import RestrictionIndex
+from ai_app.response_logic.vocabulary import get_vocabulary
+
+HIERARCHY = {
+    "dairy": ["milk", "cheese", "butter"],
+    "cheese": ["parmesan"],
+    "nuts": ["peanut", "tree nuts"],
+    "tree nuts": ["almond"],
+    "meat": ["pork"],
+    "pork": ["bacon"],
+    "vegetarian": ["meat"],
+    "vegan": ["vegetarian", "dairy", "egg"],
+}
+
+
+@pytest.fixture
+def index():
+    return RestrictionIndex(HIERARCHY, lemmas={"eggs": "egg", "peanuts": "peanut"})
+
+
+def test_closure_is_transitive(index):
+    assert set(index.expand(["vegan"])) == {
+        "vegan", "vegetarian", "meat", "pork", "bacon", "dairy", "milk", "cheese", "butter", "parmesan", "egg",
+    }
+    assert set(index.expand(["nuts"])) == {"nuts", "peanut", "tree nuts", "almond"}
+    assert index.expand(["pork"]) == ["pork", "bacon"]
+
+
+def test_filter_drops_members_and_lemmas(index):
+    pantry = ["Cheese", "rice", "peanuts", "Bacon", "eggs", "Parmesan"]
+    assert index.filter(pantry, ["dairy"]) == ["rice", "peanuts", "Bacon", "eggs"]
+    assert index.filter(pantry, ["nuts", "meat"]) == ["Cheese", "rice", "eggs", "Parmesan"]
+    assert index.filter(pantry, ["vegan"]) == ["rice", "peanuts"]
+    assert index.filter(pantry, []) == pantry
+
+
+def test_terms_outside_the_hierarchy_exclude_themselves(index):
+    assert index.filter(["rice", "cilantro"], ["Cilantro"]) == ["rice"]
+    assert index.expand(["cilantro", "pork"]) == ["pork", "bacon", "cilantro"]
+    assert index.is_excluded("cilantro", ["cilantro"])
+    assert not index.is_excluded("rice", ["cilantro"])
+
+
+def test_bitsets_apply_restrictions_in_one_operation(index):
+    candidates = index.bits(["milk", "almond", "bacon", "egg"])
+    assert candidates & ~index.excluded(["dairy", "nuts"]) == index.bits(["bacon", "egg"])
+    assert index.excluded(["dairy", "nuts"]) == index.excluded(["nuts"]) | index.excluded(["dairy"])
+    assert index.is_excluded("Parmesan", ["dairy"]) and not index.is_excluded("milk", ["cheese"])
+    assert "tree nuts" in index and "rice" not in index
+
+
+def test_cycles_are_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        RestrictionIndex({"a": ["b"], "b": ["c"], "c": ["a"]})
+
+
+def test_catalog_restrictions_use_the_closure(index):
+    catalog = RecipeCatalog([
+        {"name": "carbonara", "ingredients": ["pasta", "bacon", "parmesan", "egg"]},
+        {"name": "satay", "ingredients": ["chicken", "peanut"]},
+        {"name": "rice bowl", "ingredients": ["rice", "egg"]},
+    ], restrictions=index)
+    names = lambda **kw: [r.name for r, _ in catalog.top_k(["egg", "chicken"], k=5, **kw)]
+    assert names(restrictions=["dairy"]) == ["satay", "rice bowl"]
+    assert names(restrictions=["nuts"]) == ["rice bowl", "carbonara"]
+    assert names(restrictions=["vegetarian"]) == ["satay", "rice bowl"]
+    assert names(restrictions=["vegan"]) == ["satay"]
+
+
+def test_vocabulary_hierarchy_reaches_suggest_meal():
+    restrictions = get_vocabulary().restrictions
+    assert restrictions.is_excluded("cheese", ["dairy"])
+    assert restrictions.is_excluded("peanut", ["nuts"])
+    assert restrictions.is_excluded("bacon", ["vegetarian"])
+    # The cheese no longer counts toward the dairy recipe, which is excluded anyway
+    result = suggest_meal(["oven"], ["pasta", "cheese"], restrictions=["dairy"])
+    assert "avoiding: dairy" in result and "Cheesy" not in result
+    assert "Roast" not in suggest_meal(["oven"], ["chicken", "carrot"], restrictions=["meat"])
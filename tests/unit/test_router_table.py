@@ -0,0 +1,62 @@
+import random
+
+import pytest
+from ai_app.response_logic import response_hub, vocabulary
+from ai_app.response_logic.response_logic import AMBIGUITY_CUES, EQUIPMENT_REPLIES, RESTRICTION_REPLIES
+from ai_app.response_logic.router_table import RouterTable, feature_key
+from ai_app.response_logic.scanner import analyze_prompt
+
+
+def _corpus(n=3000, seed=7):
+    lists = vocabulary.get_vocabulary().lists
+    words = sorted(set(
+        list(RESTRICTION_REPLIES) + list(EQUIPMENT_REPLIES) + AMBIGUITY_CUES
+        + list(lists["ingredient_markers"]) + list(lists["ambiguity_markers"]) + list(lists["help_markers"])
+        + list(lists["common_ingredients"]) + list(lists["restricted_ingredients"])
+        + list(lists["equipment_mentions"]) + ["no", "without", "allergic to", "free", "recipe", "tonight"]
+    ))
+    rng = random.Random(seed)
+    for _ in range(n):
+        yield " ".join(rng.sample(words, rng.randint(1, 6)))
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"ingredients": ["tofu", "rice"]}, {"ingredients": []}])
+def test_table_matches_branch_logic(kwargs):
+    table = RouterTable(response_hub._route)
+    for prompt in _corpus():
+        analysis = analyze_prompt(prompt)
+        assert table.lookup(analysis, kwargs) == response_hub._route(analysis, kwargs), prompt
+    # Far fewer distinct replies than prompts
+    assert 0 < table.distinct_outcomes < len(table) < 3000
+
+
+def test_helper_words_are_cue_bits():
+    analysis = analyze_prompt("no peanut, creamy dessert in the wok")
+    cue_order = list(dict.fromkeys(vocabulary.get_vocabulary().lists["response_cues"]))
+    seen = {word for i, word in enumerate(cue_order) if analysis.cues >> i & 1}
+    assert seen == {"peanut", "creamy", "dessert", "wok"}
+
+
+def test_detected_ingredients_are_interpolated_per_request():
+    table = RouterTable(response_hub._route)
+    first = analyze_prompt("I have chicken and rice")
+    second = analyze_prompt("I have salmon and pasta")
+    assert feature_key(first, {}) == feature_key(second, {})
+    assert table.lookup(first, {}) == "Great! I can suggest recipes with chicken, rice. What equipment are you using?"
+    assert table.lookup(second, {}) == "Great! I can suggest recipes with salmon, pasta. What equipment are you using?"
+    assert len(table) == 1
+
+
+def test_ingredient_override_is_interpolated():
+    table = RouterTable(response_hub._route)
+    analysis = analyze_prompt("What can I cook tonight?")
+    assert table.lookup(analysis, {"ingredients": ["tofu"]}) == response_hub._route(analysis, {"ingredients": ["tofu"]})
+    assert "kale, leek" in table.lookup(analysis, {"ingredients": ["kale", "leek"]})
+
+
+def test_maxsize_bounds_the_table():
+    table = RouterTable(response_hub._route, maxsize=2)
+    for prompt in ["no nuts", "no dairy", "no gluten", "no honey"]:
+        analysis = analyze_prompt(prompt)
+        assert table.lookup(analysis, {}) == response_hub._route(analysis, {})
+    assert len(table) == 2
@@ -0,0 +1,39 @@
+import pytest
+from ai_app.response_logic.scanner import scan_prompt
+
+
+def test_scan_collects_all_signals():
+    scan = scan_prompt("instant pot recipe with chicken and potatoes, no dairy")
+    assert scan.equipment == ["instant pot"]
+    assert scan.ingredients == ["chicken", "potatoes"]
+    assert scan.restrictions == ["dairy"]
+    assert scan.ingredient_marker
+
+
+def test_scan_matches_overlapping_terms():
+    # "nuts" sits inside "peanuts", "cook" inside "slow cooker"
+    scan = scan_prompt("allergic to peanuts, using a slow cooker")
+    assert "nuts" in scan.restrictions
+    assert scan.equipment == ["slow cooker"]
+    assert scan.ingredient_marker
+
+
+def test_scan_regex_restriction_without_literal():
+    scan = scan_prompt("i am lactose intolerant")
+    assert scan.restrictions == ["dairy"]
+
+
+def test_scan_ingredients_keep_vocabulary_order():
+    scan = scan_prompt("rice then chicken then beef")
+    assert scan.ingredients == ["chicken", "beef", "rice"]
+
+
+@pytest.mark.parametrize("prompt, ambiguous, help_", [
+    ("i'm not sure what i have", True, False),
+    ("please help", False, True),
+    ("asdfghjkl qwertyuiop", False, False),
+])
+def test_scan_markers(prompt, ambiguous, help_):
+    scan = scan_prompt(prompt)
+    assert scan.ambiguous is ambiguous
+    assert scan.help is help_
@@ -0,0 +1,155 @@
+import pytest
+
+from ai_app.response_logic import generate_response, generate_responses, response_hub, scanner, session_state
+from ai_app.response_logic.scanner import analyze_prompt
+from ai_app.response_logic.session_state import SessionState
+
+
+def test_merge_deduplicates_and_versions_changes():
+    session = {}
+    state = SessionState(session)
+    assert state.version == 0
+    assert state.merge(analyze_prompt("Instant Pot recipe with chicken, no dairy"))
+    assert session["equipment"] == ["instant pot"]
+    assert session["restrictions"] == ["dairy"]
+    assert session["ingredients"] == ["chicken"]
+    assert state.version == 1
+
+    assert not state.observe("more chicken in the instant pot please")
+    assert state.version == 1
+    assert state.observe("I also have an oven and eggs")
+    assert session["equipment"] == ["instant pot", "oven"]
+    assert session["ingredients"] == ["chicken", "egg"]
+    assert state.version == 2
+    assert not state.observe("one egg and a chicken")
+
+
+@pytest.mark.parametrize("prompt, equipment, restrictions, ingredients", [
+    ("No pork and no beef please, I am allergic to fish", [], ["pork"], []),
+    ("what is the price of a hamster", [], [], []),
+    ("I don't have eggs, only rice", [], [], ["rice"]),
+    ("I have chicken without garlic", [], [], ["chicken"]),
+    ("I'm lactose intolerant, I have cheese", [], ["dairy"], []),
+    ("I don't have an oven, just a microwave", ["microwave"], [], []),
+    ("no dairy in the instant pot with chicken", ["instant pot"], ["dairy"], ["chicken"]),
+    ("I'm allergic to peanuts", [], ["nuts"], []),
+    ("no peanuts please", [], ["nuts"], []),
+    ("I have peanuts", [], [], []),
+    ("I have a potato and one egg", [], [], ["potato", "egg"]),
+    ("I have potatoes, eggs and tomato sauces", [], [], ["potato", "egg", "tomato sauce"]),
+])
+def test_mentions_skip_substrings_negations_and_restricted_items(prompt, equipment, restrictions, ingredients):
+    assert session_state.mentions(analyze_prompt(prompt)) == (equipment, restrictions, ingredients)
+
+
+def test_new_restrictions_apply_to_earlier_ingredients():
+    session = {}
+    state = SessionState(session)
+    state.observe("I have chicken, rice and cheese")
+    assert session_state.mentions(analyze_prompt("and more chicken"), ["vegetarian"])[2] == []
+    assert state.observe("No dairy please")
+    assert session["ingredients"] == ["chicken", "rice"]
+    assert session["restrictions"] == ["dairy"]
+
+
+def test_singular_and_plural_mentions_are_one_ingredient():
+    session = {"ingredients": ["potatoes"]}
+    state = SessionState(session)
+    assert not state.observe("I have a potato")
+    assert state.observe("eggs, then another egg")
+    assert session["ingredients"] == ["potatoes", "egg"]
+
+
+def test_rendered_text_is_reused_until_the_state_changes():
+    calls = []
+
+    def render(equipment, restrictions, ingredients):
+        calls.append(list(ingredients))
+        return ", ".join(ingredients)
+
+    state = SessionState({})
+    state.observe("I have chicken")
+    assert state.cached() is None
+    assert state.rendered(render) == "chicken"
+    assert state.rendered(render) == "chicken"
+    state.observe("chicken again")
+    assert state.rendered(render) == "chicken"
+    assert calls == [["chicken"]]
+
+    state.observe("and eggs")
+    assert state.rendered(render) == "chicken, egg"
+    session_state._invalidate_renders(None)
+    assert state.cached() is None
+    assert state.rendered(render) == "chicken, egg"
+    assert len(calls) == 3
+
+
+def test_hub_merges_prompts_into_the_session():
+    session = {}
+    generate_response("I have chicken and rice.", session)
+    generate_response("No dairy please", session)
+    generate_response("No dairy please", session)
+    assert session["ingredients"] == ["chicken", "rice"]
+    assert session["restrictions"] == ["dairy"]
+    assert session["state_version"] == 2
+
+    sessions = [{}, {}, {}]
+    generate_responses(["I have chicken", "I have chicken", "Can I use my wok?"], sessions=sessions)
+    assert sessions[0]["ingredients"] == sessions[1]["ingredients"] == ["chicken"]
+    assert sessions[2]["equipment"] == ["wok"]
+
+
+@pytest.mark.parametrize("cache_size", [0, 16])
+def test_hub_reuses_the_routing_analysis_and_skips_unsafe_prompts(monkeypatch, cache_size):
+    monkeypatch.setattr(response_hub.RESPONSE_CACHE, "maxsize", cache_size)
+    response_hub.invalidate_response_cache()
+    scans = []
+    real_scan = scanner.SCANNER.scan
+    monkeypatch.setattr(scanner.SCANNER, "scan", lambda *a: scans.append(a) or real_scan(*a))
+
+    session = {}
+    generate_response("I have chicken and rice", session)
+    assert len(scans) == 1
+    generate_response("I have chicken and rice", session)
+    assert len(scans) == (2 if cache_size == 0 else 1)
+    assert session["ingredients"] == ["chicken", "rice"]
+
+    unsafe = {}
+    generate_response("Suggest a detox cleanse with diet pills and chicken", unsafe)
+    generate_responses(["detox with salmon"], sessions=[unsafe])
+    assert unsafe == {}
+
+
+def test_app_plan_ignores_negated_mentions():
+    pytest.importorskip("flask")
+    from ai_app import app as app_module
+
+    client = app_module.app.test_client()
+    reply = client.post("/api/response", json={"input": "No pork and no beef please, I am allergic to fish"})
+    reply = reply.get_json()["response"]
+    assert "- Equipment: none\n- Restrictions: pork\n- Ingredients: none\n" in reply
+    reply = client.post("/api/response", json={"input": "what is the price of a hamster"}).get_json()["response"]
+    assert "- Restrictions: pork\n- Ingredients: none\n" in reply
+
+    client = app_module.app.test_client()
+    reply = client.post("/api/response", json={"input": "I'm allergic to peanuts"}).get_json()["response"]
+    assert "without that allergen" in reply and "- Restrictions: nuts\n" in reply
+
+
+def test_app_plan_accumulates_and_renders_once_per_state(monkeypatch):
+    pytest.importorskip("flask")
+    from ai_app import app as app_module
+
+    calls = []
+    original = app_module._suggest_dish_from_state
+    monkeypatch.setattr(app_module, "_suggest_dish_from_state", lambda *a: calls.append(a) or original(*a))
+    client = app_module.app.test_client()
+
+    client.post("/api/response", json={"input": "I have chicken and an oven"})
+    reply = client.post("/api/response", json={"input": "No dairy please"}).get_json()["response"]
+    assert "- Equipment: oven\n- Restrictions: dairy\n- Ingredients: chicken\n" in reply
+    assert len(calls) == 2
+
+    again = client.post("/api/response", json={"input": "What about dairy?"}).get_json()["response"]
+    assert len(calls) == 2
+    assert again.endswith(reply[reply.index("\n\nPlan so far"):])
@@ -0,0 +1,143 @@
+import pytest
+
+pytest.importorskip("flask")
+
+from flask import Flask  # noqa: E402
+from flask.sessions import SecureCookieSessionInterface  # noqa: E402
+
+from ai_app import app as app_module  # noqa: E402
+from ai_app.conversation_log import ConversationLog  # noqa: E402
+from ai_app.session_store import (  # noqa: E402
+    MemorySessionStore,
+    ServerSessionInterface,
+    SQLiteSessionStore,
+    configure_sessions,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_memory_store_evicts_least_recently_used():
+    store = MemorySessionStore(max_sessions=2)
+    store.save("a", {"n": 1})
+    store.save("b", {"n": 2})
+    assert store.load("a") == {"n": 1}  # "b" is now the least recently used
+    store.save("c", {"n": 3})
+    assert len(store) == 2
+    assert store.load("b") is None
+    assert store.load("a") == {"n": 1} and store.load("c") == {"n": 3}
+
+
+def test_memory_store_expires_after_ttl():
+    clock = FakeClock()
+    store = MemorySessionStore(ttl=10, clock=clock)
+    store.save("a", {"n": 1})
+    store.save("b", {"n": 2})
+    clock.now = 8
+    assert store.load("a") == {"n": 1}  # use refreshes the TTL
+    clock.now = 15
+    assert store.load("b") is None
+    assert store.load("a") == {"n": 1}
+    clock.now = 30
+    store.save("c", {})
+    assert len(store) == 1
+
+
+def test_memory_store_returns_copies():
+    store = MemorySessionStore()
+    store.save("a", {"messages": [1]})
+    loaded = store.load("a")
+    loaded["messages"].append(2)
+    assert store.load("a") == {"messages": [1]}
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    path = tmp_path / "sessions" / "db.sqlite3"
+    SQLiteSessionStore(path).save("a", {"messages": b"\x01log", "ingredients": ["egg"]})
+    other = SQLiteSessionStore(path)
+    assert other.load("a") == {"messages": b"\x01log", "ingredients": ["egg"]}
+    other.delete("a")
+    assert SQLiteSessionStore(path).load("a") is None
+    expired = SQLiteSessionStore(path, ttl=-1)
+    expired.save("b", {})
+    assert expired.load("b") is None and len(expired) == 0
+
+
+def test_sqlite_store_expires_after_ttl(tmp_path):
+    clock = FakeClock()
+    store = SQLiteSessionStore(tmp_path / "db.sqlite3", ttl=10, clock=clock)
+    store.save("a", {"n": 1})
+    store.save("b", {"n": 2})
+    clock.now = 8
+    assert store.load("a") == {"n": 1}  # use refreshes the TTL
+    clock.now = 15
+    assert store.load("b") is None
+    assert store.load("a") == {"n": 1}
+    clock.now = 30
+    assert len(store) == 0 and store.load("a") is None
+
+
+def test_cookie_carries_only_a_signed_id():
+    app = Flask(__name__)
+    app.secret_key = "test"
+    store = MemorySessionStore()
+    app.session_interface = ServerSessionInterface(store)
+
+    @app.route("/add/<word>")
+    def add(word):
+        from flask import session
+        session.setdefault("words", []).append(word * 500)
+        session.modified = True
+        return "ok"
+
+    @app.route("/read")
+    def read():
+        from flask import session
+        return ",".join(w[0] for w in session.get("words", []))
+
+    client = app.test_client()
+    for word in "abcdef":
+        client.get(f"/add/{word}")
+    cookie = client.get_cookie("session")
+    assert len(cookie.value) < 100
+    assert len(store) == 1
+    assert client.get("/read").get_data(as_text=True) == "a,b,c,d,e,f"
+    assert "session" not in client.get("/read").headers.get("Set-Cookie", "")  # unchanged, not re-sent
+
+    client.set_cookie("session", cookie.value[:-2] + "xx")
+    assert client.get("/read").get_data(as_text=True) == ""
+
+
+def test_configure_sessions_selects_the_backend(tmp_path, monkeypatch):
+    app = Flask(__name__)
+    configure_sessions(app, "cookie")
+    assert not isinstance(app.session_interface, ServerSessionInterface)
+    monkeypatch.setenv("SESSION_DB", str(tmp_path / "s.sqlite3"))
+    configure_sessions(app, "sqlite")
+    assert isinstance(app.session_interface.store, SQLiteSessionStore)
+    configure_sessions(app, "memory")
+    assert isinstance(app.session_interface.store, MemorySessionStore)
+    # Switching back, e.g. when .env sets SESSION_BACKEND=cookie after import
+    configure_sessions(app, "cookie")
+    assert isinstance(app.session_interface, SecureCookieSessionInterface)
+    with pytest.raises(ValueError, match="SESSION_BACKEND"):
+        configure_sessions(app, "redis")
+
+
+def test_chat_history_is_capped(monkeypatch):
+    monkeypatch.setattr(app_module, "MAX_HISTORY_MESSAGES", 4)
+    app_module.app.config["TESTING"] = True
+    client = app_module.app.test_client()
+    for i in range(5):
+        assert client.post("/api/response", json={"input": f"I have {i} eggs"}).status_code == 200
+    with client.session_transaction() as sess:
+        messages = ConversationLog.load(sess["messages"]).messages()
+    assert len(messages) == 4
+    assert [m["content"] for m in messages if m["role"] == "user"] == ["I have 3 eggs", "I have 4 eggs"]
+    assert len(client.get_cookie("session").value) < 100
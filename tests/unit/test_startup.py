@@ -0,0 +1,84 @@
+"""
+Startup budget checks.
+
+Each check runs in a fresh interpreter so module caches from the rest of the
+suite do not hide regressions. Budgets are deliberately loose; tighten them
+per machine with IMPORT_BUDGET_MS / COLD_START_BUDGET_MS.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("flask")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "60"))
+COLD_START_BUDGET_MS = float(os.getenv("COLD_START_BUDGET_MS", "3000"))
+
+FIRST_REQUEST = """
+import json, sys
+before = list(sys.path)
+from ai_app.app import app
+loaded = sorted(m for m in sys.modules if m.startswith("ai_app.response_logic"))
+client = app.test_client()
+health = client.get("/health").status_code
+reply = client.post("/api/message", json={"text": "I have chicken and an instant pot"}).get_json()
+print(json.dumps({"path_changed": sys.path != before, "loaded": loaded, "health": health, "reply": reply["reply"]}))
+"""
+
+
+def _run(args, **kwargs):
+    return subprocess.run(
+        [sys.executable, *args], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True, **kwargs
+    )
+
+
+def _own_import_ms(stderr):
+    """Sum the self time of ai_app modules from `python -X importtime` output."""
+    total_us = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        if name.strip().startswith("ai_app"):
+            total_us += int(self_us)
+    return total_us / 1000
+
+
+def test_app_import_has_no_side_effects():
+    result = _run(["-c", FIRST_REQUEST])
+    out = json.loads(result.stdout)
+    assert result.stdout.count("\n") == 1  # nothing printed besides the report
+    assert not out["path_changed"]
+    assert out["loaded"] == []
+    assert out["health"] == 200
+    assert "Instant Pot" in out["reply"]
+
+
+def test_script_entry_point_imports_the_package():
+    # How the UI suites' conftest and the dev reloader start the server
+    result = _run([str(Path("ai_app") / "app.py"), "--help"])
+    assert "--mode {dev,test}" in result.stdout
+
+
+def test_import_time_budget():
+    # Best of a few runs: a single cold import is easily skewed by the machine
+    best = min(_own_import_ms(_run(["-X", "importtime", "-c", "import ai_app.app"]).stderr) for _ in range(3))
+    assert best < IMPORT_BUDGET_MS, f"ai_app import took {best:.1f}ms (budget {IMPORT_BUDGET_MS}ms)"
+
+
+def test_cold_start_to_first_request_budget():
+    timings = []
+    for _ in range(2):
+        start = time.perf_counter()
+        _run(["-c", FIRST_REQUEST])
+        timings.append((time.perf_counter() - start) * 1000)
+    best = min(timings)
+    assert best < COLD_START_BUDGET_MS, f"cold start took {best:.0f}ms (budget {COLD_START_BUDGET_MS}ms)"
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+pytest.importorskip("flask")
+
+from ai_app import app as app_module  # noqa: E402
+from ai_app.conversation_log import ConversationLog  # noqa: E402
+
+
+def _events(body: str):
+    events = []
+    for block in body.split("\n\n"):
+        if not block:
+            continue
+        fields = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_stream_matches_buffered_reply(client):
+    prompt = "Instant Pot recipe with chicken, no dairy"
+    buffered = client.post("/api/response", json={"input": prompt}).get_json()["response"]
+
+    resp = client.post("/api/response/stream", json={"input": prompt})
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/event-stream"
+    events = _events(resp.get_data(as_text=True))
+
+    assert [e for e, _ in events] == ["chunk", "chunk", "chunk", "done"]
+    assert [d["part"] for _, d in events[:-1]] == ["reply", "plan", "suggestion"]
+    assert "".join(d["text"] for _, d in events[:-1]) == buffered
+
+
+def test_basic_response_is_the_first_chunk_and_context_renders_once(client, monkeypatch):
+    calls = []
+    original = app_module._suggest_dish_from_state
+
+    def tracking(*args):
+        calls.append(args)
+        return original(*args)
+
+    monkeypatch.setattr(app_module, "_suggest_dish_from_state", tracking)
+    resp = client.post("/api/response/stream", json={"input": "I have chicken and rice"}, buffered=False)
+    chunks = iter(resp.response)
+    first = next(chunks)
+    first = first.decode() if isinstance(first, bytes) else first
+    assert '"part": "reply"' in first
+    list(chunks)
+    assert len(calls) == 1
+
+
+def test_stream_records_turns_in_session(client):
+    client.post("/api/response/stream", json={"input": "No pork, suggest a healthy dinner"})
+    with client.session_transaction() as sess:
+        messages = ConversationLog.load(sess["messages"]).messages()
+        assert [m["role"] for m in messages] == ["user", "assistant"]
+        assert messages[0]["content"] == "No pork, suggest a healthy dinner"
+
+
+def test_stream_and_buffered_turns_record_the_same_history():
+    histories = []
+    for path in ("/api/response", "/api/response/stream"):
+        client = app_module.app.test_client()
+        for prompt in ("I have chicken and an oven", "No dairy please", "No dairy please"):
+            client.post(path, json={"input": prompt}).get_data()
+        with client.session_transaction() as sess:
+            histories.append(ConversationLog.load(sess["messages"]).messages())
+    assert histories[0] == histories[1]
+    assert "Suggested dish:" in histories[1][1]["content"]
+
+
+def test_stream_rejects_empty_input(client):
+    resp = client.post("/api/response/stream", json={"input": "  "})
+    assert resp.status_code == 400
+    assert resp.get_json() == {"error": "No input provided"}
@@ -0,0 +1,43 @@
+import re
+
+from ai_app.response_logic import tokenizer
+from ai_app.response_logic.response_logic import _detect_ingredients, extract_ingredients, parse_input_list
+from ai_app.response_logic.scanner import analyze_prompt
+
+PROMPTS = [
+    "i have chicken, rice and beans",
+    "can i cook salmon in the wok?",
+    "no dairy please... something with eggs!",
+    "  leftover_rice  and   tomatoes\n",
+    "",
+]
+
+
+def test_spans_match_word_regex():
+    for text in PROMPTS:
+        spans = tokenizer.token_spans(text)
+        assert [w for _, _, w in spans] == re.findall(r"\b\w+\b", text)
+        assert all(text[start:end] == word for start, end, word in spans)
+
+
+def test_spans_are_cached_per_prompt():
+    text = "i have chicken and rice"
+    assert tokenizer.token_spans(text) is tokenizer.token_spans(text)
+    assert tokenizer.words(text) == ("i", "have", "chicken", "and", "rice")
+
+
+def test_is_bare():
+    text = "chicken, rice beans"
+    spans = {w: (s, e) for s, e, w in tokenizer.token_spans(text)}
+    assert not tokenizer.is_bare(text, *spans["chicken"])
+    assert tokenizer.is_bare(text, *spans["rice"])
+    assert tokenizer.is_bare(text, *spans["beans"])
+
+
+def test_extractors_share_the_tokenizer():
+    assert analyze_prompt("I have Chicken and rice").tokens == ["i", "have", "chicken", "and", "rice"]
+    assert set(extract_ingredients("I have chickens and rice")) >= {"chicken", "rice"}
+    # Whole words only: "rice," is not a bare word, the trailing "?" is ignored
+    assert _detect_ingredients("chicken? or rice, tofu") == ["chicken"]
+    assert parse_input_list("I have chicken, rice and beans") == ["chicken", "rice", "beans"]
+    assert parse_input_list("tofu,and spinach\nI have eggs") == ["eggs"]
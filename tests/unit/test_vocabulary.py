@@ -0,0 +1,117 @@
+import json
+import shutil
+
+import pytest
+from ai_app.response_logic import detect_ingredients, generate_response
+from ai_app.response_logic import response_hub, vocabulary
+from ai_app.response_logic.response_logic import AMBIGUITY_CUES, EQUIPMENT_REPLIES, RESTRICTION_REPLIES
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    target = tmp_path / "data"
+    shutil.copytree(vocabulary.DATA_DIR, target, ignore=shutil.ignore_patterns("__pycache__"))
+    return target
+
+
+def _add_ingredient(data_dir, word):
+    path = data_dir / "ingredients.json"
+    data = json.loads(path.read_text())
+    data["common_ingredients"].append(word)
+    path.write_text(json.dumps(data))
+
+
+def test_index_is_written_and_reused(data_dir, tmp_path, monkeypatch):
+    index_path = tmp_path / "vocab.idx"
+    first = vocabulary.load_vocabulary(data_dir, index_path)
+    assert index_path.exists()
+
+    def fail(*args):
+        raise AssertionError("index should have been loaded from disk")
+
+    monkeypatch.setattr(vocabulary, "compile_index", fail)
+    second = vocabulary.load_vocabulary(data_dir, index_path)
+    assert second.fingerprint == first.fingerprint
+    assert second.automaton("common_ingredients").find_all("chicken and rice") == ["chicken", "rice"]
+
+
+def test_data_change_rebuilds_index(data_dir, tmp_path):
+    index_path = tmp_path / "vocab.idx"
+    before = vocabulary.load_vocabulary(data_dir, index_path)
+    _add_ingredient(data_dir, "quinoa")
+    after = vocabulary.load_vocabulary(data_dir, index_path)
+    assert after.fingerprint != before.fingerprint
+    assert after.automaton("common_ingredients").find_all("quinoa bowl") == ["quinoa"]
+
+
+def test_compiler_source_change_rebuilds_index(data_dir, tmp_path, monkeypatch):
+    index_path = tmp_path / "vocab.idx"
+    before = vocabulary.load_vocabulary(data_dir, index_path)
+    assert "ai_app.response_logic.keyword_automaton" in vocabulary.COMPILER_MODULES
+    monkeypatch.setattr(vocabulary, "_code_digest", b"edited keyword_automaton.py")
+    compiled = []
+    real_compile = vocabulary.compile_index
+    monkeypatch.setattr(vocabulary, "compile_index", lambda *a: compiled.append(1) or real_compile(*a))
+    after = vocabulary.load_vocabulary(data_dir, index_path)
+    assert compiled and after.fingerprint != before.fingerprint
+
+
+def test_corrupt_index_is_ignored(data_dir, tmp_path):
+    index_path = tmp_path / "vocab.idx"
+    index_path.write_bytes(b"not a pickle")
+    vocab = vocabulary.load_vocabulary(data_dir, index_path)
+    assert "chicken" in vocab.lists["common_ingredients"]
+
+
+def test_duplicate_vocabulary_name_is_rejected():
+    with pytest.raises(ValueError):
+        vocabulary.compile_index({"a.json": {"x": ["1"]}, "b.json": {"x": ["2"]}}, "fp")
+
+
+def test_duplicate_response_cue_is_rejected():
+    sources = {p.name: json.loads(p.read_text()) for p in vocabulary.DATA_DIR.glob("*.json")}
+    sources["markers.json"]["response_cues"].append("oven")
+    with pytest.raises(ValueError, match="response_cues.*oven"):
+        vocabulary.compile_index(sources, "fp")
+
+
+def test_term_ids_are_stable_and_unique():
+    vocab = vocabulary.get_vocabulary()
+    ids = vocab.term_ids
+    assert len(set(ids.values())) == len(ids)
+    assert vocab.term_id("chicken") == ids["chicken"]
+    assert vocab.term_id("unobtainium") is None
+
+
+def test_reply_keys_are_scanner_cues():
+    cues = set(vocabulary.get_vocabulary().lists["response_cues"])
+    assert set(RESTRICTION_REPLIES) <= cues
+    assert set(EQUIPMENT_REPLIES) <= cues
+    assert set(AMBIGUITY_CUES) <= cues
+
+
+def test_reload_reaches_detectors_and_clears_cache(data_dir, tmp_path):
+    _add_ingredient(data_dir, "quinoa")
+    generate_response("What can I cook tonight?")
+    assert len(response_hub.RESPONSE_CACHE) > 0 or not response_hub.RESPONSE_CACHE.enabled
+    try:
+        vocabulary.reload_vocabulary(data_dir, tmp_path / "vocab.idx")
+        assert len(response_hub.RESPONSE_CACHE) == 0
+        assert detect_ingredients("quinoa salad") == ["quinoa"]
+        assert "quinoa" in generate_response("I have quinoa").lower()
+    finally:
+        vocabulary.reload_vocabulary()
+    assert detect_ingredients("quinoa salad") == []
+
+
+@pytest.mark.parametrize("pattern, anchor", [
+    (r"\bno\s*dairy\b", "dairy"),
+    (r"\bno\s*nuts?\b", "nut"),
+    (r"dairy[- ]?free", "dairy"),
+    (r"peanut\.butter", "peanut.butter"),
+    (r"(no)?\s*eggs{1,2}", "egg"),
+    (r"[]x]yz", "yz"),
+    (r"soy|tofu", ""),
+])
+def test_regex_restrictions_are_anchored_on_a_required_literal(pattern, anchor):
+    assert vocabulary._literal_anchor(pattern) == anchor